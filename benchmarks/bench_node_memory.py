@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# bench_node_memory.py
+# Bytes of tree bookkeeping per populated child (node metadata + path-index
+# entry), comparing the previous NodeMeta layout with the current one.
+# Textual's own TreeNode objects are the same either way and are not counted.
+#
+#   python benchmarks/bench_node_memory.py [--children N] [--depth D ...]
+from __future__ import annotations
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from json_navigator import NodeKind, NodeMeta  # noqa: E402
+
+
+@dataclass
+class LegacyNodeMeta:
+  """NodeMeta as it was before it became slotted and parent-linked."""
+  path: Tuple[Any, ...]
+  kind: str
+  loaded: bool
+  span: Tuple[int, int] | None = None
+  parent: Any = None
+  gen: int = -1
+
+
+def build_legacy(container: Dict[str, int], base: Tuple[Any, ...]) -> List[Any]:
+  index: Dict[Any, Any] = {}
+  metas = []
+  for k in container:
+    path = (*base, k)
+    meta = LegacyNodeMeta(path, "leaf", True, parent=container, gen=0)
+    index[path] = meta
+    metas.append(meta)
+  return [index, metas]
+
+
+def build_current(container: Dict[str, int], base: Tuple[Any, ...]) -> List[Any]:
+  owner = NodeMeta(NodeKind.DICT, True, base[-1] if base else None)
+  index: Dict[Any, Any] = {}
+  metas = []
+  for k in container:
+    meta = NodeMeta(NodeKind.LEAF, True, k, owner, parent=container, gen=0)
+    index[(base, k)] = meta
+    metas.append(meta)
+  return [index, metas]
+
+
+def measure(build: Callable[[Dict[str, int], Tuple[Any, ...]], List[Any]], container: Dict[str, int],
+            base: Tuple[Any, ...]) -> float:
+  gc.collect()
+  tracemalloc.start()
+  before = tracemalloc.get_traced_memory()[0]
+  keep = build(container, base)
+  after = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  del keep
+  return (after - before) / len(container)
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--children", type=int, default=200_000)
+  parser.add_argument("--depth", type=int, nargs="+", default=[1, 5, 20, 50])
+  args = parser.parse_args()
+
+  container = {f"key{i}": i for i in range(args.children)}
+  print(f"{args.children} leaf children per container")
+  print(f"{'depth':>6} {'before B/node':>14} {'after B/node':>13} {'saved':>7}")
+  for depth in args.depth:
+    base = tuple(f"k{i}" for i in range(depth - 1))
+    old = measure(build_legacy, container, base)
+    new = measure(build_current, container, base)
+    print(f"{depth:>6} {old:>14.1f} {new:>13.1f} {1 - new / old:>7.0%}")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# bench_parsers.py
+# Load time and peak memory of each installed JSON parser backend, as used by
+# read_json_from_args_or_stdin. Every (backend, corpus) pair runs in a fresh
+# subprocess so peak RSS isn't polluted by earlier runs; the figure reported is
+# the growth of ru_maxrss over the process's footprint just before parsing.
+# ru_maxrss survives fork+exec on Linux, so the driver itself stays small:
+# corpora are generated and backends listed in subprocesses too.
+#
+#   python benchmarks/bench_parsers.py [--size MIB] [--repeat N] [FILE ...]
+#
+# Without FILE arguments, synthetic corpora of about --size MiB are generated
+# in a temporary directory: small records, numbers, long strings and deep nesting.
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+
+
+def maxrss_mib() -> float:
+  rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024   # bytes on macOS, KiB elsewhere
+
+
+def child(backend: str, path: str, repeat: int) -> None:
+  """Runs in the subprocess: parse ``path`` ``repeat`` times, report the best time."""
+  import json_navigator as jn
+
+  jn.get_parser(backend)   # import the backend before taking the baseline
+  base = maxrss_mib()
+  best = float("inf")
+  for _ in range(repeat):
+    started = time.perf_counter()
+    data = jn.read_json_from_args_or_stdin(path, backend)
+    best = min(best, time.perf_counter() - started)
+    del data
+  print(json.dumps({"seconds": best, "peak_mib": maxrss_mib() - base}))
+
+
+def records(rng: random.Random, n: int) -> Any:
+  return [{"id": i, "name": f"user{i}", "active": i % 3 == 0, "score": rng.random() * 100,
+           "tags": ["a", "b", "c"][: i % 4], "address": {"city": "Zürich", "zip": f"{i % 10000:05d}"}}
+          for i in range(n)]
+
+
+def numbers(rng: random.Random, n: int) -> Any:
+  return {"ints": [rng.randrange(-10**12, 10**12) for _ in range(n * 3)],
+          "floats": [rng.uniform(-1e6, 1e6) for _ in range(n * 3)]}
+
+
+def strings(rng: random.Random, n: int) -> Any:
+  words = ["lorem", "ipsum", "dolor", "sit", "amet", "naïve", "日本語", "emoji 🎉", 'quote "x"', "tab\tnew\nline"]
+  return {f"k{i}": " ".join(rng.choice(words) for _ in range(40)) for i in range(n // 2)}
+
+
+def deep(rng: random.Random, n: int) -> Any:
+  def branch(depth: int) -> Any:
+    if depth == 0:
+      return rng.randrange(1000)
+    return {"v": depth, "children": [branch(depth - 1) for _ in range(2)]}
+  return [branch(10) for _ in range(max(1, n // 400))]
+
+
+CORPORA: Dict[str, Callable[[random.Random, int], Any]] = {
+  "records": records, "numbers": numbers, "strings": strings, "deep": deep,
+}
+
+
+def generate(directory: str, size_mib: float) -> List[str]:
+  paths = []
+  for name, build in CORPORA.items():
+    rng = random.Random(0)
+    n = 1000
+    text = json.dumps(build(rng, n), ensure_ascii=False)
+    # Scale from a small sample to the requested size.
+    n = max(1, int(n * size_mib * (1 << 20) / len(text.encode("utf-8"))))
+    text = json.dumps(build(random.Random(0), n), ensure_ascii=False)
+    path = os.path.join(directory, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+      f.write(text)
+    paths.append(path)
+  return paths
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("files", nargs="*", help="JSON files to load (default: generated corpora)")
+  parser.add_argument("--size", type=float, default=50, help="Size of each generated corpus in MiB (default: 50)")
+  parser.add_argument("--repeat", type=int, default=3, help="Loads per measurement; the best time is kept")
+  parser.add_argument("--child", nargs=2, metavar=("BACKEND", "FILE"), help=argparse.SUPPRESS)
+  parser.add_argument("--generate", metavar="DIR", help=argparse.SUPPRESS)
+  parser.add_argument("--list", action="store_true", help=argparse.SUPPRESS)
+  args = parser.parse_args()
+
+  if args.child:
+    child(args.child[0], args.child[1], args.repeat)
+    return
+  if args.generate:
+    print("\n".join(generate(args.generate, args.size)))
+    return
+  if args.list:
+    import json_navigator as jn
+    print(" ".join(jn.available_parsers()))
+    return
+
+  def run(*extra: str) -> str:
+    return subprocess.run([sys.executable, os.path.abspath(__file__), *extra],
+                          check=True, capture_output=True, text=True).stdout
+
+  backends = run("--list").split()
+  with tempfile.TemporaryDirectory() as tmp:
+    files = args.files or run("--generate", tmp, "--size", str(args.size)).split("\n")
+    files = [f for f in files if f]
+    print(f"backends: {', '.join(backends)}   (best of {args.repeat}; peak = RSS growth while parsing)")
+    print(f"{'corpus':<16} {'MiB':>7} {'backend':<10} {'seconds':>8} {'MiB/s':>8} {'peak MiB':>9}")
+    for path in files:
+      mib = os.path.getsize(path) / (1 << 20)
+      name = os.path.basename(path)
+      for backend in backends:
+        out = subprocess.run(
+          [sys.executable, os.path.abspath(__file__), "--repeat", str(args.repeat), "--child", backend, path],
+          capture_output=True, text=True,
+        )
+        if out.returncode:
+          print(f"{name:<16} {mib:>7.1f} {backend:<10} failed: {out.stderr.strip().splitlines()[-1]}")
+          continue
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{name:<16} {mib:>7.1f} {backend:<10} {r['seconds']:>8.3f} {mib / r['seconds']:>8.1f} {r['peak_mib']:>9.1f}")
+
+
+if __name__ == "__main__":
+  main()
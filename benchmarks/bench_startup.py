@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# bench_startup.py
+# Startup cost of the navigator's import graph. Every measurement runs in a
+# fresh interpreter (best of --repeat): the time to import each module, whether
+# Textual got loaded along the way, and the wall time of a parse-only run that
+# never starts the UI.
+#
+#   python benchmarks/bench_startup.py [--repeat N]
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# (label, setup run before the clock starts, code timed)
+CASES: List[Tuple[str, str, str]] = [
+  ("import json_navigator", "", "import json_navigator"),
+  ("parse a small file", "import json_navigator", "json_navigator.read_json_from_args_or_stdin(PATH)"),
+  ("import json_navigator_tui", "import json_navigator", "import json_navigator_tui"),
+  ("first screen (json_navigator_screens)", "import json_navigator_tui", "import json_navigator_screens"),
+]
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+PATH = {path!r}
+{setup}
+started = time.perf_counter()
+{code}
+print(json.dumps({{"seconds": time.perf_counter() - started, "textual": "textual" in sys.modules}}))
+"""
+
+
+def run_case(setup: str, code: str, path: str) -> Dict[str, object]:
+  script = CHILD.format(src=SRC, path=path, setup=setup, code=code)
+  out = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)
+  return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def wall(argv: List[str]) -> float:
+  started = time.perf_counter()
+  subprocess.run(argv, check=True, capture_output=True)
+  return time.perf_counter() - started
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best is kept")
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, "small.json")
+    with open(path, "w", encoding="utf-8") as f:
+      json.dump({"items": [{"id": i, "name": f"n{i}"} for i in range(100)]}, f)
+
+    print(f"best of {args.repeat}, each in a fresh interpreter")
+    print(f"{'step':<40} {'ms':>8}  textual loaded")
+    for label, setup, code in CASES:
+      runs = [run_case(setup, code, path) for _ in range(args.repeat)]
+      best = min(r["seconds"] for r in runs)
+      print(f"{label:<40} {best * 1000:>8.1f}  {'yes' if runs[0]['textual'] else 'no'}")
+
+    interpreter = min(wall([sys.executable, "-c", "pass"]) for _ in range(args.repeat))
+    helptext = min(wall([sys.executable, os.path.join(SRC, "json_navigator.py"), "--help"])
+                   for _ in range(args.repeat))
+    print(f"{'interpreter startup (python -c pass)':<40} {interpreter * 1000:>8.1f}")
+    print(f"{'json_navigator.py --help, wall':<40} {helptext * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+  main()
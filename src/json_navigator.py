@@ -4,54 +4,42 @@
 # - Collapsed key tree with "(...)" for leaves
 # - Enter toggles branches; on leaves opens ops menu (Display / Base64 decode / Edit)
 # - Edit uses $EDITOR and updates in-memory JSON
-# - Reads from --in PATH or stdin
+# - Reads from --in PATH or stdin; large inputs can be streamed in the background
+# - The UI (json_navigator_tui.py, json_navigator_screens.py) is imported only
+#   when the app starts, so parsing and scripted use never load Textual
 from __future__ import annotations
 
 import argparse
 import base64
+import binascii
+import bisect
+import bz2
+import codecs
+import functools
+import gc
+import gzip
+import heapq
+import importlib
+import io
+import itertools
 import json
+import lzma
+import mmap
 import os
-import subprocess
+import re
 import sys
 import tempfile
-from dataclasses import dataclass
-from typing import Any, List, Tuple, Union
-
-from rich.pretty import pretty_repr
-from textual.app import App, ComposeResult
-from textual.screen import ModalScreen
-from textual.binding import Binding
-from textual.containers import Container, Horizontal
-from textual.widgets import Header, Footer, Label, Tree, OptionList, Button
-from textual.widgets.option_list import Option
-
-# ---------- Log/TextLog/RichLog compatibility shim ----------
-
-try:
-  # Newer Textual
-  from textual.widgets import Log as _LogWidget  # type: ignore
-except Exception:
-  try:
-    # Older Textual
-    from textual.widgets import TextLog as _LogWidget  # type: ignore
-  except Exception:
-    # Fallback (mid versions)
-    from textual.widgets import RichLog as _LogWidget  # type: ignore
-
-def _log_write_lines(w: Any, text: str) -> None:
-  """Write lines to any of Log/TextLog/RichLog across versions."""
-  for line in text.splitlines():
-    if hasattr(w, "write"):
-      w.write(line)
-    elif hasattr(w, "write_line"):
-      w.write_line(line)
-    elif hasattr(w, "log"):
-      w.log(line)
-    else:
-      try:
-        w.lines.append(line)  # type: ignore[attr-defined]
-      except Exception:
-        pass
+import threading
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping, Sequence
+from dataclasses import dataclass, field
+from enum import Enum, IntFlag
+from typing import IO, Any, Callable, Dict, Iterator, List, NoReturn, Protocol, TextIO, Tuple, Union
+
 
 # ---------- Types ----------
 
@@ -62,17 +50,157 @@ Path = Tuple[Union[str, int], ...]
 
 # ---------- Utilities ----------
 
-def read_json_from_args_or_stdin(path: str | None) -> JSONType:
-  if path:
-    with open(path, "r", encoding="utf-8") as f:
-      return json.load(f)
-  if sys.stdin.isatty():
+# Leading bytes of each supported compressed format.
+_MAGIC = ((b"\x1f\x8b", "gzip"), (b"BZh", "bz2"), (b"\xfd7zXZ\x00", "xz"), (b"\x28\xb5\x2f\xfd", "zstd"))
+
+def sniff_compression(head: bytes) -> str | None:
+  """Name of the compression format ``head`` starts with, or None for plain data."""
+  for magic, name in _MAGIC:
+    if head.startswith(magic):
+      return name
+  return None
+
+def file_compression(path: str) -> str | None:
+  with open(path, "rb") as f:
+    return sniff_compression(f.read(6))
+
+def open_decompressed(fmt: str, target: str | IO[bytes]) -> IO[bytes]:
+  """A binary stream inflating ``target`` (a path or binary file) as it is read.
+
+  Raises ValueError for zstd on Pythons without compression.zstd (3.14+).
+  """
+  if fmt == "gzip":
+    return gzip.open(target, "rb")
+  if fmt == "bz2":
+    return bz2.open(target, "rb")
+  if fmt == "xz":
+    return lzma.open(target, "rb")
+  try:
+    from compression import zstd   # standard library from Python 3.14
+  except ImportError:
+    raise ValueError("zstd-compressed input needs Python 3.14 or newer") from None
+  return zstd.open(target, "rb")
+
+def open_binary_input(path: str | None) -> IO[bytes]:
+  """Byte stream over --in or stdin, decompressed on the fly if it is compressed."""
+  if not path and sys.stdin.isatty():
     print("Error: no --in provided and stdin is TTY. Pipe JSON or use --in PATH.", file=sys.stderr)
     sys.exit(2)
-  return json.load(sys.stdin)
+  fmt = file_compression(path) if path else sniff_compression(sys.stdin.buffer.peek(6)[:6])
+  if fmt is None:
+    return open(path, "rb") if path else sys.stdin.buffer
+  try:
+    return open_decompressed(fmt, path or sys.stdin.buffer)
+  except ValueError as e:
+    print(f"Error: {e}", file=sys.stderr)
+    sys.exit(2)
+
+def open_input(path: str | None) -> TextIO:
+  """Text stream over --in or stdin, decompressed on the fly if it is compressed."""
+  raw = open_binary_input(path)
+  return sys.stdin if raw is sys.stdin.buffer else io.TextIOWrapper(raw, encoding="utf-8")
+
+def read_json_from_args_or_stdin(path: str | None, parser: str = "auto") -> JSONType:
+  """Parse --in or stdin whole with the ``parser`` backend (see get_parser)."""
+  f = open_binary_input(path)
+  try:
+    data = f.read()
+  finally:
+    if f is not sys.stdin.buffer:
+      f.close()
+  return get_parser(parser).loads_whole(data)
 
 def is_leaf(value: Any) -> bool:
-  return not isinstance(value, (dict, list))
+  return not isinstance(value, (dict, list, Pending, LazyObject, LazyArray))
+
+class NodeKind(Enum):
+  DICT = "dict"
+  LIST = "list"
+  LEAF = "leaf"
+  PENDING = "pending"   # value not parsed yet (streaming)
+  LOADING = "loading"   # placeholder child under a pending node
+  RANGE = "range"       # group of positions of a paged container
+
+BRANCH_KINDS = frozenset((NodeKind.DICT, NodeKind.LIST))
+
+def kind_of(value: Any) -> NodeKind:
+  if isinstance(value, (dict, LazyObject)):
+    return NodeKind.DICT
+  if isinstance(value, (list, LazyArray)):
+    return NodeKind.LIST
+  if isinstance(value, Pending):
+    return NodeKind.PENDING
+  return NodeKind.LEAF
+
+def sorted_in_runs(items: List[Any], key: Callable[[Any], Any], run: int = 50_000) -> List[Any]:
+  """sorted() that yields the GIL between runs, for use on worker threads.
+
+  A single sorted() call over millions of items holds the GIL until it
+  finishes; sorting fixed-size runs and merging them in Python keeps the UI
+  thread responsive.
+  """
+  if len(items) <= run:
+    return sorted(items, key=key)
+  runs = [sorted(items[i:i + run], key=key) for i in range(0, len(items), run)]
+  return list(heapq.merge(*runs, key=key))
+
+_DIGITS_RE = re.compile(r"(\d+)")
+
+def natural_key(key: Any) -> List[Any]:
+  """Sort key that orders "item2" before "item10"."""
+  parts: List[Any] = _DIGITS_RE.split(str(key))
+  for i in range(1, len(parts), 2):
+    parts[i] = int(parts[i])
+  for i in range(0, len(parts), 2):
+    parts[i] = parts[i].casefold()
+  return parts
+
+class KeyOrder:
+  """Display order of dict keys, cached per container until its key set changes.
+
+  Small dicts are sorted on every call; larger ones keep their ordered key
+  list in a bounded LRU keyed by container identity. Callers invalidate a
+  container when they add or remove keys; a length mismatch is treated as a
+  miss as a safety net.
+  """
+  MODES = ("lexicographic", "natural", "insertion")
+
+  def __init__(self, mode: str = "lexicographic", min_size: int = 256, max_entries: int = 64) -> None:
+    if mode not in self.MODES:
+      raise ValueError(f"Unknown key order {mode!r}")
+    self.mode = mode
+    self._min_size = min_size
+    self._max_entries = max_entries
+    self._cache: OrderedDict[int, Tuple[Any, List[Any]]] = OrderedDict()
+    self._lock = threading.Lock()
+
+  def _sort(self, container: Any, background: bool) -> List[Any]:
+    keys = list(container.keys())
+    if self.mode == "insertion":
+      return keys
+    key = str if self.mode == "lexicographic" else natural_key
+    return sorted_in_runs(keys, key=key) if background else sorted(keys, key=key)
+
+  def keys(self, container: Any, background: bool = False) -> List[Any]:
+    if len(container) < self._min_size:
+      return self._sort(container, background)
+    ident = id(container)
+    with self._lock:
+      hit = self._cache.get(ident)
+      if hit is not None and hit[0] is container and len(hit[1]) == len(container):
+        self._cache.move_to_end(ident)
+        return hit[1]
+    keys = self._sort(container, background)
+    with self._lock:
+      self._cache[ident] = (container, keys)
+      self._cache.move_to_end(ident)
+      while len(self._cache) > self._max_entries:
+        self._cache.popitem(last=False)
+    return keys
+
+  def invalidate(self, container: Any) -> None:
+    with self._lock:
+      self._cache.pop(id(container), None)
 
 def path_to_str(path: Path) -> str:
   parts: List[str] = []
@@ -92,19 +220,87 @@ def set_by_path(data: JSONType, path: Path, new_value: JSONType) -> None:
   parent = get_by_path(data, path[:-1])
   parent[path[-1]] = new_value
 
+# bytes.translate table for the text column: printable ASCII as is, the rest as "."
+_HEX_PRINTABLE = bytes(c if 32 <= c < 127 else 0x2E for c in range(256))
+
+def hex_rows(data: bytes | Base64Bytes, start: int, stop: int, width: int = 16) -> List[str]:
+  """Hex dump rows [start, stop) of ``data``, ``width`` bytes per row.
+
+  The whole window is converted with one bytes.hex() and one translate()
+  call; rows are then just slices of those strings.
+  """
+  lo = max(0, start) * width
+  hi = min(len(data), stop * width)
+  if hi <= lo:
+    return []
+  chunk = bytes(data[lo:hi])
+  hexs = chunk.hex(" ")
+  text = chunk.translate(_HEX_PRINTABLE).decode("ascii")
+  span = width * 3
+  return [f"{lo + r:08x}  {hexs[r * 3:r * 3 + span - 1]:<{span}}  {text[r:r + width]}"
+          for r in range(0, hi - lo, width)]
+
+_URLSAFE_TO_STD = str.maketrans("-_", "+/")
+
+def iter_b64decode(src: str, chunk_size: int = 4 << 20, urlsafe: bool = False) -> Iterator[Tuple[bytes, int]]:
+  """Decode base64 in pieces of about ``chunk_size`` characters.
+
+  Yields (decoded bytes, characters consumed so far). Pieces are cut on
+  4-character boundaries, so the result and errors match
+  base64.b64decode(src, validate=True). With ``urlsafe`` the -_ alphabet is
+  read instead and missing padding is tolerated.
+  """
+  step = max(4, chunk_size - chunk_size % 4)
+  for i in range(0, len(src), step):
+    piece = src[i:i + step]
+    end = i + len(piece)
+    if end < len(src) and "=" in piece:
+      raise binascii.Error("Excess data after padding")
+    if urlsafe:
+      piece = piece.translate(_URLSAFE_TO_STD) + "=" * (-len(piece) % 4)
+    yield base64.b64decode(piece, validate=True), end
+
+class Base64Bytes:
+  """The bytes a base64 string encodes, decoded one slice at a time.
+
+  Every 4 characters encode 3 bytes, so ``view[lo:hi]`` decodes only the
+  characters covering that range and nothing is kept between reads. The
+  string must already have been checked, e.g. by running iter_b64decode
+  over it.
+  """
+
+  def __init__(self, src: str, urlsafe: bool = False) -> None:
+    self.src = src
+    self.urlsafe = urlsafe
+    chars = len(src) - (2 if src.endswith("==") else 1 if src.endswith("=") else 0)
+    self._len = chars * 3 // 4
+
+  def __len__(self) -> int:
+    return self._len
+
+  def __getitem__(self, key: slice) -> bytes:
+    lo, hi, step = key.indices(self._len)
+    if step != 1:
+      raise ValueError("Base64Bytes only supports contiguous slices")
+    if hi <= lo:
+      return b""
+    first = lo // 3
+    piece = self.src[first * 4:-(-hi // 3) * 4]
+    if self.urlsafe:
+      piece = piece.translate(_URLSAFE_TO_STD) + "=" * (-len(piece) % 4)
+    skip = lo - first * 3
+    return binascii.a2b_base64(piece)[skip:skip + hi - lo]
+
 def hexdump(b: bytes, width: int = 16, limit: int = 8192) -> str:
   b = b[:limit]
-  lines = []
-  for i in range(0, len(b), width):
-    chunk = b[i:i+width]
-    hexs = " ".join(f"{c:02x}" for c in chunk)
-    text = "".join(chr(c) if 32 <= c < 127 else "." for c in chunk)
-    lines.append(f"{i:08x}  {hexs:<{width*3}}  {text}")
+  lines = hex_rows(b, 0, -(-len(b) // width), width)
   if len(b) == limit:
     lines.append("… (truncated)")
   return "\n".join(lines)
 
 def open_in_editor(initial_text: str) -> str | None:
+  import subprocess   # only the interactive Edit needs it; kept out of startup
+
   editor = os.environ.get("EDITOR") or os.environ.get("VISUAL")
   if not editor:
     editor = "nano" if os.name != "nt" else "notepad"
@@ -127,415 +323,2690 @@ def open_in_editor(initial_text: str) -> str | None:
       pass
 
 
-# ---------- Small modal-like helper apps ----------
-
-class ValueViewer(ModalScreen[None]):
-  """Minimal modal-like screen for showing text content."""
-  CSS = """
-  Screen { align: center middle; }
-  .modal {
-    width: 90%;
-    height: 80%;
-    border: round $accent;
-    padding: 1 2;
-    background: $panel;
-  }
-  .title { padding: 0 1; text-style: bold; }
-  .viewer { height: 1fr; margin-top: 1; border: round $surface; }
-  .buttons { height: auto; padding-top: 1; }
-  .ml2 { margin-left: 2; }
-  """
-
-  def __init__(self, title: str, content: str) -> None:
-    super().__init__()
-    self._title = title
-    self._content = content
-
-  def compose(self) -> ComposeResult:
-    yield Container(
-      Label(self._title, classes="title"),
-      _LogWidget(classes="viewer"),
-      Horizontal(
-        Button("Close (Esc)", id="close", variant="primary"),
-        classes="buttons",
-      ),
-      classes="modal",
-    )
-
-  def on_mount(self) -> None:
-    log = self.query_one(_LogWidget)
-    _log_write_lines(log, self._content)
-    self.set_focus(log)
-
-  def on_button_pressed(self, event: Button.Pressed) -> None:
-    if event.button.id == "close":
-      self.dismiss(None)
-
-  BINDINGS = [Binding("escape", "close", "Close")]
-
-  def action_close(self) -> None:
-    self.dismiss(None)
-
-
-@dataclass
-class Base64Result:
-  decoded_text: str | None
-  decoded_bytes_preview: str | None
-  replacement_value: str | None
-
-
-class Base64DecodeScreen(ModalScreen[Base64Result | None]):
-  """Modal-like screen to preview Base64 decode and optionally replace leaf."""
-  CSS = ValueViewer.CSS
-
-  def __init__(self, title: str, src_value: str) -> None:
-    super().__init__()
-    self._title = title
-    self._src = src_value
-    self._result: Base64Result | None = None
-
-  def compose(self) -> ComposeResult:
-    yield Container(
-      Label(self._title, classes="title"),
-      _LogWidget(classes="viewer"),
-      Horizontal(
-        Button("Replace leaf with decoded", id="replace", variant="success"),
-        Button("Close (Esc)", id="close", variant="primary", classes="ml2"),
-        classes="buttons",
-      ),
-      classes="modal",
-    )
-
-  def on_mount(self) -> None:
-    log = self.query_one(_LogWidget)
+# ---------- Parser backends ----------
+
+# bytes.translate table: digits as "0", everything else as " "
+_DIGIT_MASK = bytes(0x30 if 0x30 <= c <= 0x39 else 0x20 for c in range(256))
+
+def _may_hold_wide_int(data: bytes) -> bool:
+  """True if ``data`` may contain an integer outside the 64-bit range.
+
+  Looks for runs of 19 or more digits that aren't the fraction or mantissa
+  of a float, with one translate() and find() over the whole input. A long
+  digit run inside a string counts too; that only costs a slower parse.
+  """
+  digits = data.translate(_DIGIT_MASK)
+  run = b"0" * 19
+  at = digits.find(run)
+  while at >= 0:
+    start = digits.rfind(b" ", 0, at) + 1
+    end = digits.find(b" ", at)
+    if end < 0:
+      end = len(digits)
+    if data[start - 1:start] != b"." and data[end:end + 1] not in (b".", b"e", b"E"):
+      return True
+    at = digits.find(run, end)
+  return False
+
+@dataclass(frozen=True)
+class ParserBackend:
+  """A whole-document JSON parser taking UTF-8 bytes.
+
+  ``wide_ints`` is False for a parser that silently turns integers beyond
+  64 bits into floats instead of rejecting them (orjson); input that may
+  hold one goes to the stdlib instead.
+  """
+  name: str
+  raw_loads: Callable[[bytes], Any]
+  wide_ints: bool = True
+
+  def loads(self, data: bytes) -> JSONType:
+    """Parse ``data``; input the backend rejects is retried with the stdlib.
+
+    The fast parsers refuse a few things json.loads accepts (NaN, integers
+    beyond 64 bits, ...) or, like orjson with wide integers, read them
+    differently; the stdlib's error messages are the ones users know. So
+    results and errors never depend on the backend.
+    """
+    if self.raw_loads is json.loads or (not self.wide_ints and _may_hold_wide_int(data)):
+      return json.loads(data)
     try:
-      raw = base64.b64decode(self._src, validate=True)
-      try:
-        text = raw.decode("utf-8")
-        preview = None
-        repl = text
-        _log_write_lines(log, "✅ Base64 decoded as UTF-8 text:\n" + text)
-      except UnicodeDecodeError:
-        text = None
-        preview = hexdump(raw)
-        repl = raw.decode("latin-1", errors="ignore")
-        _log_write_lines(log, "✅ Base64 decoded as bytes (hex):\n" + preview)
-      self._result = Base64Result(text, preview, repl)
+      return self.raw_loads(data)
+    except Exception:
+      return json.loads(data)
+
+  def loads_whole(self, data: bytes) -> JSONType:
+    """loads() for a whole document, with the cyclic garbage collector paused.
+
+    A parse allocates millions of containers, and every allocation burst
+    triggers a collection that traverses the ones built so far; on large
+    files that costs more than the parse itself. Parsed JSON holds no
+    reference cycles, so the skipped collections would have found nothing.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+      return self.loads(data)
+    finally:
+      if enabled:
+        gc.enable()
+
+PARSERS = ("orjson", "simdjson", "ujson", "stdlib")   # "auto" picks the first one installed
+
+@functools.lru_cache(maxsize=None)
+def _load_backend(name: str) -> ParserBackend | None:
+  try:
+    if name == "orjson":
+      import orjson
+      return ParserBackend(name, orjson.loads, wide_ints=False)
+    if name == "simdjson":   # pysimdjson
+      import simdjson
+      return ParserBackend(name, simdjson.loads)
+    if name == "ujson":
+      import ujson
+      return ParserBackend(name, ujson.loads)
+  except ImportError:
+    return None
+  return ParserBackend("stdlib", json.loads) if name == "stdlib" else None
+
+def available_parsers() -> List[str]:
+  return [name for name in PARSERS if _load_backend(name) is not None]
+
+def get_parser(name: str = "auto") -> ParserBackend:
+  """The named backend, or the fastest installed one for "auto".
+
+  Raises ValueError if the named backend isn't installed.
+  """
+  if name == "auto":
+    name = available_parsers()[0]
+  backend = _load_backend(name)
+  if backend is None:
+    raise ValueError(f"JSON parser {name!r} is not available (choose from {', '.join(available_parsers())})")
+  return backend
+
+
+# ---------- Streaming loader ----------
+
+class Pending:
+  """Placeholder for a value the streaming loader has not parsed yet."""
+  __slots__ = ()
+
+  def __repr__(self) -> str:
+    return "(loading…)"
+
+PENDING = Pending()
+
+# A load op is one of:
+#   ("open", parent_path, key, container)  container streamed member by member
+#   ("set", parent_path, key, value)       complete value (or PENDING)
+#   ("done", path)                         streamed container is complete
+#   ("error", message)
+LoadOp = Tuple[Any, ...]
+
+_WS_RE = re.compile(r"[ \t\n\r]*")
+# Strings are matched whole so brackets inside them are skipped; a lone quote
+# means the string continues past the end of the buffer.
+_SCAN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[\[\]{}]|"')
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"')
+_SCALAR_END_RE = re.compile(r"[,\]}\s]")
+
+class _LoadCancelled(Exception):
+  pass
+
+def apply_load_op(data: JSONType, op: LoadOp) -> None:
+  if op[0] not in ("open", "set"):
+    return
+  _, parent_path, key, value = op
+  parent = get_by_path(data, parent_path)
+  if isinstance(parent, list) and key == len(parent):
+    parent.append(value)
+  else:
+    parent[key] = value
+
+class StreamingLoader:
+  """Parses a JSON document from a text stream, top levels first.
+
+  Containers shallower than ``eager_depth`` are streamed member by member;
+  anything deeper is parsed whole with ``json.loads`` once its end is found.
+  Values that need more input before they can be parsed are announced as
+  ``PENDING`` first. Ops are handed to the sink in batches from a background
+  thread; the loader never touches containers after emitting them.
+  """
+
+  def __init__(self, stream: TextIO, eager_depth: int = 2, chunk_size: int = 1 << 20,
+               flush_interval: float = 0.1) -> None:
+    self._stream = stream
+    self._eager_depth = max(1, eager_depth)
+    self._chunk_size = chunk_size
+    self._flush_interval = flush_interval
+    self._buf = ""
+    self._pos = 0
+    self._base = 0
+    self._eof = False
+    self._ops: List[LoadOp] = []
+    self._last_flush = 0.0
+    self._sink: Callable[[List[LoadOp]], None] | None = None
+    self._cancel = threading.Event()
+    self._thread: threading.Thread | None = None
+    self._root_kind: str | None = None
+    self.done = False
+
+  # --- public API ---
+  def read_root(self) -> JSONType:
+    """Read just enough input to create the root value.
+
+    Returns an empty dict/list that ``start()`` will fill, or the complete
+    value when the root is a scalar.
+    """
+    c = self._peek()
+    if c == "{" or c == "[":
+      self._pos += 1
+      self._root_kind = c
+      return {} if c == "{" else []
+    value = self._read_value(None, None)
+    self._expect_end()
+    self.done = True
+    return value
+
+  def start(self, sink: Callable[[List[LoadOp]], None]) -> None:
+    self._sink = sink
+    if self.done:
+      return
+    self._thread = threading.Thread(target=self._run, name="json-stream-loader", daemon=True)
+    self._thread.start()
+
+  def load_into(self, root: JSONType) -> None:
+    """Finish loading synchronously, applying ops directly to ``root``."""
+    def sink(ops: List[LoadOp]) -> None:
+      for op in ops:
+        if op[0] == "error":
+          raise ValueError(op[1])
+        apply_load_op(root, op)
+    self._sink = sink
+    if not self.done:
+      self._run(raise_errors=True)
+
+  def cancel(self) -> None:
+    self._cancel.set()
+
+  # --- driver ---
+  def _run(self, raise_errors: bool = False) -> None:
+    try:
+      self._stream_container((), self._root_kind == "{", 0)
+      self._expect_end()
+      self._flush()
+    except _LoadCancelled:
+      pass
     except Exception as e:
-      _log_write_lines(log, f"❌ Decode failed: {e!r}")
-      self.query_one("#replace", Button).display = False
+      if raise_errors:
+        raise
+      self._ops.append(("error", f"{type(e).__name__}: {e}"))
+      try:
+        self._flush()
+      except Exception:
+        pass
+    finally:
+      self.done = True
+
+  def _emit(self, op: LoadOp, force: bool = False) -> None:
+    self._ops.append(op)
+    if force or time.monotonic() - self._last_flush >= self._flush_interval:
+      self._flush()
+
+  def _flush(self) -> None:
+    self._last_flush = time.monotonic()
+    if self._ops and self._sink is not None:
+      ops, self._ops = self._ops, []
+      self._sink(ops)
+
+  # --- parsing ---
+  def _stream_container(self, path: Path, is_dict: bool, depth: int) -> None:
+    close = "}" if is_dict else "]"
+    if self._peek() == close:
+      self._pos += 1
+      self._emit(("done", path))
+      return
+    index = 0
+    while True:
+      if self._cancel.is_set():
+        raise _LoadCancelled()
+      self._compact()
+      key: Union[str, int] = self._read_key() if is_dict else index
+      c = self._peek()
+      if depth + 1 < self._eager_depth and (c == "{" or c == "["):
+        self._pos += 1
+        self._emit(("open", path, key, {} if c == "{" else []))
+        self._stream_container((*path, key), c == "{", depth + 1)
+      else:
+        self._emit(("set", path, key, self._read_value(path, key)))
+      index += 1
+      c = self._peek()
+      if c == "," or c == close:
+        self._pos += 1
+        if c == close:
+          break
+        continue
+      raise ValueError(f"Expecting ',' or '{close}' at offset {self._offset()}")
+    self._emit(("done", path))
+
+  def _read_key(self) -> str:
+    if self._peek() != '"':
+      raise ValueError(f"Expecting property name at offset {self._offset()}")
+    end = self._scan_end(self._pos, None)
+    key = json.loads(self._buf[self._pos:end])
+    self._pos = end
+    if self._peek() != ":":
+      raise ValueError(f"Expecting ':' at offset {self._offset()}")
+    self._pos += 1
+    return key
+
+  def _read_value(self, parent_path: Path | None, key: Any) -> JSONType:
+    self._peek()
+    start = self._pos
+
+    def announce() -> None:
+      if parent_path is not None:
+        self._emit(("set", parent_path, key, PENDING), force=True)
+
+    end = self._scan_end(start, announce)
+    value = json.loads(self._buf[start:end])
+    self._pos = end
+    return value
+
+  def _scan_end(self, start: int, on_wait: Callable[[], None] | None) -> int:
+    """Return the buffer index just past the value starting at ``start``."""
+    waited = False
+
+    def more() -> None:
+      nonlocal waited
+      if not waited and on_wait is not None:
+        on_wait()
+      waited = True
+      if not self._fill(grow=True):
+        raise ValueError(f"Unexpected end of input at offset {self._offset(len(self._buf))}")
+
+    c = self._buf[start]
+    if c == "{" or c == "[":
+      depth = 0
+      p = start
+      while True:
+        m = _SCAN_RE.search(self._buf, p)
+        if m is None or m.end() - m.start() == 1 and self._buf[m.start()] == '"':
+          p = len(self._buf) if m is None else m.start()
+          more()
+          continue
+        tok = m.group()
+        p = m.end()
+        if tok == "{" or tok == "[":
+          depth += 1
+        elif tok == "}" or tok == "]":
+          depth -= 1
+          if depth == 0:
+            return p
+          if self._cancel.is_set():
+            raise _LoadCancelled()
+    if c == '"':
+      while True:
+        m = _STRING_RE.match(self._buf, start)
+        if m is not None:
+          return m.end()
+        more()
+    while True:
+      m = _SCALAR_END_RE.search(self._buf, start)
+      if m is not None:
+        return m.start()
+      if self._eof or not self._fill(grow=True):
+        return len(self._buf)
+
+  # --- buffer ---
+  def _fill(self, grow: bool = False) -> bool:
+    if self._eof:
+      return False
+    size = max(self._chunk_size, len(self._buf)) if grow else self._chunk_size
+    chunk = self._stream.read(size)
+    if not chunk:
+      self._eof = True
+      return False
+    self._buf += chunk
+    return True
+
+  def _compact(self) -> None:
+    if self._pos >= self._chunk_size:
+      self._base = self._offset()
+      self._buf = self._buf[self._pos:]
+      self._pos = 0
+
+  def _peek(self) -> str:
+    while True:
+      self._pos = _WS_RE.match(self._buf, self._pos).end()
+      if self._pos < len(self._buf):
+        return self._buf[self._pos]
+      if not self._fill():
+        raise ValueError(f"Unexpected end of input at offset {self._offset()}")
+
+  def _expect_end(self) -> None:
+    while True:
+      self._pos = _WS_RE.match(self._buf, self._pos).end()
+      if self._pos < len(self._buf):
+        raise ValueError(f"Extra data at offset {self._offset()}")
+      if not self._fill():
+        return
+
+  def _offset(self, pos: int | None = None) -> int:
+    return self._base + (self._pos if pos is None else pos)
+
+
+# ---------- Lazy (memory-mapped) documents ----------
+
+# One match per structural byte: complete strings and everything else that is
+# not structural are swallowed by the prefix. A lone quote in group 1 is a
+# string that continues into the next chunk.
+_B_STRING = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_B_TOKEN_RE = re.compile(rb'[^"\[\]{},:]*(?:' + _B_STRING + rb'[^"\[\]{},:]*)*([\[\]{},:]|")')
+_B_STR_BODY_RE = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*')
+_B_WS = b" \t\n\r"
+
+def _nested_container_re(depth: int) -> re.Pattern[bytes]:
+  """Regex matching a whole container nested at most ``depth`` levels deep."""
+  body = rb'[^"\[\]{}]*(?:' + _B_STRING + rb'[^"\[\]{}]*)*'
+  for _ in range(depth):
+    body = rb'[^"\[\]{}]*(?:(?:' + _B_STRING + rb'|[\[{]' + body + rb'[\]}])[^"\[\]{}]*)*'
+  return re.compile(rb'[\[{]' + body + rb'[\]}]')
+
+# Lets the indexer step over small records in one C-level match instead of
+# visiting every comma and colon inside them.
+_B_SMALL_CONTAINER_RE = _nested_container_re(3)
+
+class MmapSource:
+  """Read-only random access to a file through mmap.
+
+  ``file`` maps an already open file instead of opening ``path``.
+  """
+
+  def __init__(self, path: str, file: IO[bytes] | None = None) -> None:
+    self.path = path
+    self._file = file if file is not None else open(path, "rb")
+    self.size = os.fstat(self._file.fileno()).st_size
+    self.stored_size = self.size
+    self.consumed = 0   # bytes of the file read by chunks()
+    self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
 
-  def on_button_pressed(self, event: Button.Pressed) -> None:
-    if event.button.id == "replace":
-      self.dismiss(self._result if self._result else None)
-    elif event.button.id == "close":
-      self.dismiss(None)
+  def read(self, start: int, end: int) -> bytes:
+    return self._mm[start:end] if self._mm is not None else b""
 
-  BINDINGS = [Binding("escape", "close", "Close")]
+  def chunks(self, size: int) -> Iterator[bytes]:
+    for off in range(0, self.size, size):
+      self.consumed = min(self.size, off + size)
+      yield self.read(off, off + size)
 
-  def action_close(self) -> None:
-    self.dismiss(None)
+  def close(self) -> None:
+    if self._mm is not None:
+      self._mm.close()
+    self._file.close()
 
 
-class OpsMenuScreen(ModalScreen[str | None]):
-  """Operations menu for a leaf: dismisses with 'display' | 'b64' | 'edit' | None."""
-  CSS = """
-  Screen { align: center middle; }
-  .modal { width: 60%; border: round $accent; padding: 1 2; background: $panel; }
-  .title { padding: 0 1; text-style: bold; }
+class GzipSource:
+  """Random access to a gzip file through a seek-point index.
+
+  The first pass over the data (``chunks``, made once by LazyDocument)
+  records a checkpoint about every ``spacing`` bytes of output: the input
+  offset and a copy of the zlib decompressor there, about 45 KB each.
+  ``read`` inflates from the nearest checkpoint instead of from the start and
+  keeps the last few inflated blocks.
   """
 
-  def __init__(self, for_path: Path) -> None:
-    super().__init__()
-    self._path = for_path
+  IN_CHUNK = 1 << 16
+  MAX_OUT = 1 << 20   # output per decompress() call, bounding memory on highly compressed input
+  CACHE_BLOCKS = 4
+
+  def __init__(self, path: str, spacing: int = 8 << 20) -> None:
+    self.path = path
+    self._file = open(path, "rb")
+    self.stored_size = os.fstat(self._file.fileno()).st_size
+    self.consumed = 0   # compressed bytes read by chunks()
+    self.size = 0       # uncompressed size, known after chunks()
+    self._spacing = spacing
+    self._offsets: List[int] = []   # output offset of each checkpoint
+    self._points: List[Tuple[int, Any]] = []   # (input offset, decompressor) per checkpoint
+    self._blocks: OrderedDict[int, bytes] = OrderedDict()
+    self._lock = threading.Lock()   # reads also come from worker threads
+
+  def _inflate(self, in_off: int, d: Any) -> Iterator[Tuple[bytes, int, Any]]:
+    """Inflate from ``in_off`` with decompressor ``d``, across gzip members.
+
+    Yields (output, input offset consumed up to, current decompressor).
+    """
+    f = self._file
+    f.seek(in_off)
+    pos, data, fresh = in_off, b"", False
+    try:
+      while True:
+        if fresh:
+          data = data.lstrip(b"\0")   # gzip allows zero padding after a member
+        if not data:
+          data = f.read(self.IN_CHUNK)
+          pos += len(data)
+          if not data:
+            if not fresh:
+              raise ValueError("Compressed input is truncated")
+            return
+          continue
+        out = d.decompress(data, self.MAX_OUT)
+        data, fresh = d.unconsumed_tail, False
+        if d.eof:
+          data, d, fresh = d.unused_data, zlib.decompressobj(31), True
+        yield out, pos - len(data), d
+    except zlib.error as e:
+      raise ValueError(f"Corrupt gzip data: {e}") from None
+
+  def chunks(self, size: int) -> Iterator[bytes]:
+    """Inflate the whole file once, recording checkpoints on the way."""
+    d = zlib.decompressobj(31)
+    self._offsets, self._points = [0], [(0, d.copy())]
+    out_pos, buf, n = 0, [], 0
+    for out, in_off, d in self._inflate(0, d):
+      out_pos += len(out)
+      if out_pos - self._offsets[-1] >= self._spacing:
+        self._offsets.append(out_pos)
+        self._points.append((in_off, d.copy()))
+      buf.append(out)
+      n += len(out)
+      self.consumed = in_off
+      if n >= size:
+        yield b"".join(buf)
+        buf, n = [], 0
+    self.size = out_pos
+    if buf:
+      yield b"".join(buf)
+
+  def _block(self, i: int) -> bytes:
+    block = self._blocks.get(i)
+    if block is not None:
+      self._blocks.move_to_end(i)
+      return block
+    in_off, d = self._points[i]
+    want = (self._offsets[i + 1] if i + 1 < len(self._offsets) else self.size) - self._offsets[i]
+    parts, n = [], 0
+    for out, _, _ in self._inflate(in_off, d.copy()):
+      parts.append(out)
+      n += len(out)
+      if n >= want:
+        break
+    block = b"".join(parts)[:want]
+    self._blocks[i] = block
+    if len(self._blocks) > self.CACHE_BLOCKS:
+      self._blocks.popitem(last=False)
+    return block
+
+  def read(self, start: int, end: int) -> bytes:
+    end = min(end, self.size)
+    if start >= end:
+      return b""
+    with self._lock:
+      i = bisect.bisect_right(self._offsets, start) - 1
+      parts = []
+      while start < end:
+        lo = self._offsets[i]
+        block = self._block(i)
+        parts.append(block[start - lo:end - lo])
+        start = lo + len(block)
+        i += 1
+      return b"".join(parts)
+
+  def close(self) -> None:
+    self._blocks.clear()
+    self._file.close()
+
+
+ByteSource = Union[MmapSource, GzipSource]
+
+def open_source(path: str) -> ByteSource:
+  """Random-access source for --lazy.
+
+  Gzip files get a seek-point index; other compressed formats are inflated
+  once into an anonymous temporary file that is then memory-mapped.
+  """
+  fmt = file_compression(path)
+  if fmt is None:
+    return MmapSource(path)
+  if fmt == "gzip":
+    return GzipSource(path)
+  with open_decompressed(fmt, path) as src:
+    return MmapSource(path, spool_to_tempfile(src))
+
+def spool_to_tempfile(src: IO[bytes]) -> IO[bytes]:
+  """Copy a stream into an anonymous temporary file, for sources that can't seek."""
+  spool = tempfile.TemporaryFile()
+  try:
+    while True:
+      chunk = src.read(1 << 20)
+      if not chunk:
+        break
+      spool.write(chunk)
+    spool.flush()
+  except BaseException:
+    spool.close()
+    raise
+  return spool
+
+def stdin_source() -> MmapSource:
+  """stdin (decompressed if need be) spooled to a temporary file and mapped."""
+  if sys.stdin.isatty():
+    raise ValueError("no --in provided and stdin is a TTY")
+  raw: IO[bytes] = sys.stdin.buffer
+  fmt = sniff_compression(raw.peek(6)[:6])
+  return MmapSource("<stdin>", spool_to_tempfile(open_decompressed(fmt, raw) if fmt else raw))
 
-  def compose(self) -> ComposeResult:
-    opts = OptionList(
-      Option("Display", id="display"),
-      Option("Base64 decode", id="b64"),
-      Option("Edit (in $EDITOR)", id="edit"),
-      Option("Cancel", id="cancel"),
-    )
-    yield Container(
-      Label(f"Operations for {path_to_str(self._path)}", classes="title"),
-      opts,
-      classes="modal",
-    )
 
-  def on_mount(self) -> None:
-    self.set_focus(self.query_one(OptionList))
+class _StructureIndexer:
+  """Single pass over JSON bytes recording container spans and child offsets.
 
-  def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
-    opt = event.option.id or ""
-    self.dismiss(None if opt == "cancel" else opt)
+  Only containers spanning at least ``min_span`` bytes are kept; smaller ones
+  are decoded whole with ``json.loads`` when their parent is expanded.
+  """
 
-  BINDINGS = [Binding("escape", "cancel", "Cancel")]
+  def __init__(self, min_span: int) -> None:
+    self.min_span = min_span
+    self.containers: Dict[int, Tuple[int, int, int, bool]] = {}   # start -> (end, lo, count, is_dict)
+    self.key_offsets = array("q")   # dict member: offset just after '{' or ','
+    self.val_offsets = array("q")   # member value: offset just after '[', ',' or ':'
+    self.root_start = -1
+    # open containers: [start, is_dict, keys, vals, pending, saw]
+    self._stack: List[List[Any]] = []
+    self._in_string = False
+    self._escape = False
+    self._base = 0
+
+  def feed(self, buf: bytes) -> None:
+    base = self._base
+    self._base += len(buf)
+    pos = 0
+    if self._in_string:
+      pos = self._string_tail(buf, 0)
+      if pos < 0:
+        return
+    stack = self._stack
+    search, skip = _B_TOKEN_RE.search, _B_SMALL_CONTAINER_RE.match
+    while True:
+      m = search(buf, pos)
+      if m is None:
+        break
+      c = m.group(1)
+      o = m.start(1)
+      pos = o + 1
+      if c == b",":
+        top = stack[-1]
+        if not top[1]:
+          top[3].append(top[4])
+        top[4] = base + pos
+      elif c == b":":
+        top = stack[-1]
+        top[2].append(top[4])
+        top[3].append(base + pos)
+      elif c == b"{" or c == b"[":
+        if stack:
+          small = skip(buf, o, o + self.min_span)
+          if small is not None:
+            stack[-1][5] = True
+            pos = small.end()
+            continue
+        elif self.root_start < 0:
+          self.root_start = base + o
+        stack.append([base + o, c == b"{", array("q"), array("q"), base + pos, False])
+      elif c == b"}" or c == b"]":
+        top = stack.pop()
+        if not top[1] and (top[3] or top[5] or buf[max(top[4] - base, 0):o].strip(_B_WS)):
+          top[3].append(top[4])
+        self._close(top, base + o)
+        if stack:
+          stack[-1][5] = True
+      else:
+        pos = self._string_tail(buf, pos)
+        if pos < 0:
+          return
+    if stack and not stack[-1][5]:
+      top = stack[-1]
+      if buf[max(top[4] - base, 0):].strip(_B_WS):
+        top[5] = True
+
+  def _string_tail(self, buf: bytes, pos: int) -> int:
+    """Skip the rest of an open string; return the index after it or -1."""
+    if self._escape:
+      pos += 1
+      self._escape = False
+    e = _B_STR_BODY_RE.match(buf, pos).end()
+    if e < len(buf) and buf[e] == 0x22:
+      self._in_string = False
+      if self._stack:
+        self._stack[-1][5] = True
+      return e + 1
+    self._in_string = True
+    self._escape = e < len(buf)   # stopped on a trailing backslash
+    if self._stack:
+      self._stack[-1][5] = True
+    return -1
+
+  def _close(self, entry: List[Any], end: int) -> None:
+    start, is_dict, keys, vals = entry[0], entry[1], entry[2], entry[3]
+    if end + 1 - start < self.min_span and self._stack:
+      return
+    lo = len(self.val_offsets)
+    self.val_offsets.extend(vals)
+    self.key_offsets.extend(keys if is_dict else array("q", [-1]) * len(vals))
+    self.containers[start] = (end, lo, len(vals), is_dict)
 
-  def action_cancel(self) -> None:
-    self.dismiss(None)
+  def finish(self) -> None:
+    if self._stack or self._in_string:
+      raise ValueError("Unexpected end of input while indexing")
+    if self.root_start < 0:
+      raise ValueError("Document root is not an object or array")
 
 
-# ---------- Main App ----------
+class LazyDocument:
+  """JSON document backed by a byte source and a structural index.
 
-@dataclass
-class NodeMeta:
-  path: Path
-  kind: str        # 'dict' | 'list' | 'leaf'
-  loaded: bool     # children populated
+  ``root`` is a LazyObject/LazyArray whose members are decoded only when
+  accessed, so opening a file costs one index pass instead of building the
+  whole object graph.
+  """
 
-class JSONTreeApp(App):
-  CSS = """
-  Screen { align: center middle; }
-  .title { padding: 0 1; text-style: bold; }
-  .modal {
-    width: 90%;
-    height: 80%;
-    border: round $accent;
-    padding: 1 2;
-    background: $panel;
-  }
-  .viewer { height: 1fr; margin-top: 1; border: round $surface; }
-  .buttons { height: auto; padding-top: 1; }
-  .ml2 { margin-left: 2; }
-  #body { width: 100%; height: 100%; padding: 0 1; }
-  """
-
-  BINDINGS = [
-    Binding("q", "quit", "Quit"),
-    Binding("e", "edit_selected", "Edit leaf"),
-    Binding("o", "ops_selected", "Leaf ops"),
-    Binding("d", "display_selected", "Display leaf"),
-  ]
-
-  def __init__(self, data: JSONType, root_label: str = "JSON") -> None:
-    super().__init__()
-    self.data: JSONType = data
-    self.root_label = root_label
-
-  def compose(self) -> ComposeResult:
-    yield Header()
-    with Container(id="body"):
-      yield Tree(self.root_label, id="tree")
-    yield Footer()
-
-  def on_mount(self) -> None:
-    tree = self.query_one(Tree)
-    tree.show_root = True
-    root_meta = NodeMeta((), "dict" if isinstance(self.data, dict) else "list" if isinstance(self.data, list) else "leaf", False)
-    tree.root.data = root_meta
-    tree.root.allow_expand = root_meta.kind in ("dict", "list")
-    tree.root.collapse()
-    self.set_focus(tree)
-
-  # --- lazy children population ---
-  def _populate_children(self, node: Tree.Node) -> None:
-    meta: NodeMeta = node.data
-    value = get_by_path(self.data, meta.path) if meta.path else self.data
-    node.remove_children()
-    if isinstance(value, dict):
-      for k in sorted(value.keys(), key=str):
-        v = value[k]
-        child_path = (*meta.path, k)
-        if is_leaf(v):
-          label = f"{k}: (...)"
-          child = node.add(label, data=NodeMeta(child_path, "leaf", True))
-          child.allow_expand = False
-        else:
-          label = f"{k}:"
-          child = node.add(label, data=NodeMeta(child_path, "dict" if isinstance(v, dict) else "list", False))
-          child.allow_expand = True
-    elif isinstance(value, list):
-      for i, v in enumerate(value):
-        child_path = (*meta.path, i)
-        if is_leaf(v):
-          label = f"[{i}]: (...)"
-          child = node.add(label, data=NodeMeta(child_path, "leaf", True))
-          child.allow_expand = False
-        else:
-          label = f"[{i}]:"
-          child = node.add(label, data=NodeMeta(child_path, "dict" if isinstance(v, dict) else "list", False))
-          child.allow_expand = True
-    meta.loaded = True
-
-  # --- events ---
-  def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
-    node = event.node
-    meta: NodeMeta = node.data
-    if meta.kind in ("dict", "list") and not meta.loaded:
-      self._populate_children(node)
-
-  def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
-    node = event.node
-    meta: NodeMeta = node.data
-    if meta.kind == "leaf":
-      self.call_after_refresh(self._open_ops_for_node, node)
-      event.stop()
+  def __init__(self, source: ByteSource, min_span: int = 64 * 1024, chunk_size: int = 16 << 20,
+               progress: Callable[[int, int], None] | None = None, parser: str = "auto") -> None:
+    self.source = source
+    self._loads = get_parser(parser).loads
+    indexer = _StructureIndexer(min_span)
+    for chunk in source.chunks(chunk_size):
+      indexer.feed(chunk)
+      if progress is not None:
+        progress(source.consumed, source.stored_size)
+    indexer.finish()
+    self._containers = indexer.containers
+    self._keys = indexer.key_offsets
+    self._vals = indexer.val_offsets
+    self._check_trailing(indexer.root_start)
+    self.root: JSONType = self._decode(indexer.root_start, source.size)
+
+  @classmethod
+  def open(cls, path: str, **kwargs: Any) -> "LazyDocument":
+    source = open_source(path)
+    try:
+      return cls(source, **kwargs)
+    except Exception:
+      source.close()
+      raise
+
+  def close(self) -> None:
+    self.source.close()
+
+  def _check_trailing(self, root_start: int) -> None:
+    end = self._containers[root_start][0] + 1
+    if self.source.read(end, self.source.size).strip(_B_WS):
+      raise ValueError(f"Extra data at offset {end}")
+
+  # --- decoding ---
+  def _decode(self, start: int, end: int) -> JSONType:
+    raw = self.source.read(start, end)
+    stripped = raw.lstrip(_B_WS)
+    at = start + len(raw) - len(stripped)
+    if at in self._containers:
+      return LazyObject(self, at) if self._containers[at][3] else LazyArray(self, at)
+    return self._loads(raw)
+
+  def child_count(self, start: int) -> int:
+    return self._containers[start][2]
+
+  def _member_bounds(self, start: int, i: int) -> Tuple[int, int]:
+    end, lo, count, is_dict = self._containers[start]
+    if i + 1 < count:
+      nxt = (self._keys if is_dict else self._vals)[lo + i + 1] - 1   # the ',' before the next member
     else:
-      node.toggle()
-
-  # --- actions ---
-  def _value_as_text(self, node: Tree.Node) -> str:
-    meta: NodeMeta = node.data
-    value = get_by_path(self.data, meta.path)
-    return pretty_repr(value)
-
-  def _open_ops_for_node(self, node: Tree.Node) -> None:
-    meta: NodeMeta = node.data
-    screen = OpsMenuScreen(meta.path)
-
-    def handle_choice(choice: str | None) -> None:
-      if choice == "display":
-        self._display_leaf(node)
-      elif choice == "b64":
-        self._b64_leaf(node)
-      elif choice == "edit":
-        self._edit_leaf(node)
-
-    self.push_screen(screen, callback=handle_choice)
-
-  def _display_leaf(self, node: Tree.Node) -> None:
-    meta: NodeMeta = node.data
-    val_text = self._value_as_text(node)
-    self.push_screen(ValueViewer(f"Display {path_to_str(meta.path)}", val_text))
-
-  def _b64_leaf(self, node: Tree.Node) -> None:
-    meta: NodeMeta = node.data
-    val = get_by_path(self.data, meta.path)
-    if not isinstance(val, str):
-      self.push_screen(ValueViewer("Base64 decode", "Leaf value is not a string."))
+      nxt = end
+    return self._vals[lo + i], nxt
+
+  def child_value(self, start: int, i: int) -> JSONType:
+    return self._decode(*self._member_bounds(start, i))
+
+  def child_span(self, start: int, i: int) -> Tuple[int, int]:
+    """Byte span of a member's value text, without surrounding whitespace."""
+    s, e = self._member_bounds(start, i)
+    if e - s <= 4096:
+      raw = self.source.read(s, e)
+      stripped = raw.lstrip(_B_WS)
+      s += len(raw) - len(stripped)
+      return s, s + len(stripped.rstrip(_B_WS))
+    head = self.source.read(s, min(e, s + 64))
+    s += len(head) - len(head.lstrip(_B_WS))
+    tail = self.source.read(max(s, e - 64), e)
+    return s, e - (len(tail) - len(tail.rstrip(_B_WS)))
+
+  def raw_member(self, start: int, i: int) -> Any:
+    """A member for writing out without caching it: an indexed container as a
+    fresh LazyObject/LazyArray, anything else as a RawSpan.
+
+    The indexer checks structure only, not scalar tokens, so spans are
+    validated when they are written.
+    """
+    s, e = self.child_span(start, i)
+    if s in self._containers:
+      return LazyObject(self, s) if self._containers[s][3] else LazyArray(self, s)
+    return RawSpan(self.source, s, e)
+
+  def child_keys(self, start: int) -> List[str]:
+    _, lo, count, _ = self._containers[start]
+    keys, vals, read = self._keys, self._vals, self.source.read
+    return [json.loads(read(keys[j], vals[j] - 1)) for j in range(lo, lo + count)]
+
+
+class LazyObject(MutableMapping):
+  """Dict-like view of an indexed JSON object; members decode on first access."""
+
+  def __init__(self, doc: LazyDocument, start: int) -> None:
+    self._doc = doc
+    self._start = start
+    self._slots: Dict[str, int] | None = None   # key -> member number (-1 once assigned)
+    self._values: Dict[str, Any] = {}
+
+  def _index(self) -> Dict[str, int]:
+    if self._slots is None:
+      # Duplicate keys keep the first position and the last value, like json.loads.
+      self._slots = {k: i for i, k in enumerate(self._doc.child_keys(self._start))}
+    return self._slots
+
+  def __getitem__(self, key: str) -> Any:
+    if key in self._values:
+      return self._values[key]
+    value = self._doc.child_value(self._start, self._index()[key])
+    self._values[key] = value
+    return value
+
+  def __setitem__(self, key: str, value: Any) -> None:
+    slots = self._index()
+    if key not in slots:
+      slots[key] = -1
+    self._values[key] = value
+
+  def __delitem__(self, key: str) -> None:
+    del self._index()[key]
+    self._values.pop(key, None)
+
+  def __iter__(self) -> Iterator[str]:
+    return iter(self._index())
+
+  def __len__(self) -> int:
+    return len(self._index())
+
+  def __contains__(self, key: object) -> bool:
+    return key in self._index()
+
+  def __repr__(self) -> str:
+    return f"<LazyObject @{self._start} ({len(self)} keys)>"
+
+  def peek(self, key: str) -> Any:
+    """Like self[key], but a member that wasn't opened yet is decoded without being kept."""
+    if key in self._values:
+      return self._values[key]
+    return self._doc.child_value(self._start, self._index()[key])
+
+  def scan_items(self) -> Iterator[Tuple[str, Any]]:
+    """Members in order, decoded with peek.
+
+    Whole-document walks (search index, find, queries) use this, so a walk
+    doesn't pin the document in memory: ``_values`` only holds members that
+    were opened or edited.
+    """
+    doc = self._doc
+    for key, slot in self._index().items():
+      yield key, self._values[key] if key in self._values else doc.child_value(self._start, slot)
+
+  def raw_items(self) -> Iterator[Tuple[str, Any]]:
+    """Members in order; ones never accessed come from doc.raw_member instead of being decoded."""
+    doc = self._doc
+    for key, slot in self._index().items():
+      yield key, self._values[key] if key in self._values else doc.raw_member(self._start, slot)
+
+
+class LazyArray(Sequence):
+  """List-like view of an indexed JSON array; elements decode on first access."""
+
+  def __init__(self, doc: LazyDocument | NdjsonDocument, start: int) -> None:
+    self._doc = doc
+    self._start = start
+    self._len = doc.child_count(start)
+    self._values: Dict[int, Any] = {}
+
+  def _norm(self, i: int) -> int:
+    if i < 0:
+      i += self._len
+    if not 0 <= i < self._len:
+      raise IndexError("list index out of range")
+    return i
+
+  def __getitem__(self, i: Any) -> Any:
+    if isinstance(i, slice):
+      return [self[j] for j in range(*i.indices(self._len))]
+    i = self._norm(i)
+    if i in self._values:
+      return self._values[i]
+    value = self._doc.child_value(self._start, i)
+    self._values[i] = value
+    return value
+
+  def __setitem__(self, i: int, value: Any) -> None:
+    self._values[self._norm(i)] = value
+
+  def __len__(self) -> int:
+    return self._len
+
+  def __repr__(self) -> str:
+    return f"<LazyArray @{self._start} ({self._len} items)>"
+
+  def peek(self, i: int) -> Any:
+    """Like self[i], but an element that wasn't opened yet is decoded without being kept."""
+    i = self._norm(i)
+    return self._values[i] if i in self._values else self._doc.child_value(self._start, i)
+
+  def scan_items(self) -> Iterator[Tuple[int, Any]]:
+    """Elements in order, decoded with peek (see LazyObject.scan_items)."""
+    for i in range(self._len):
+      yield i, self.peek(i)
+
+  def raw_items(self) -> Iterator[Tuple[int, Any]]:
+    """Elements in order; ones never accessed come from doc.raw_member instead of being decoded."""
+    doc = self._doc
+    for i in range(self._len):
+      yield i, self._values[i] if i in self._values else doc.raw_member(self._start, i)
+
+
+class InvalidLine(str):
+  """Text of a JSON Lines record that isn't valid JSON; saved back verbatim."""
+  __slots__ = ()
+
+# A non-blank line; its match starts at the line's first byte.
+_NDJSON_LINE_RE = re.compile(rb"[^\S\n]*\S[^\n]*")
+_NDJSON_NAME_RE = re.compile(r"\.(ndjson|jsonl)(\.(gz|bz2|xz|zst))?$", re.IGNORECASE)
+
+class NdjsonDocument:
+  """JSON Lines input as a virtual array of records.
+
+  One scan records where each non-blank line starts (8 bytes per record);
+  ``root`` is a LazyArray whose records are parsed on first access, so
+  memory follows the records opened rather than the file size.
+  Lines that aren't valid JSON come back as InvalidLine strings.
+  """
+
+  def __init__(self, source: ByteSource, chunk_size: int = 16 << 20,
+               progress: Callable[[int, int], None] | None = None, parser: str = "auto") -> None:
+    self.source = source
+    self._loads = get_parser(parser).loads
+    starts = array("q")
+    base, carry = 0, b""
+    for chunk in source.chunks(chunk_size):
+      buf = carry + chunk if carry else chunk
+      cut = buf.rfind(b"\n") + 1   # complete lines only; the rest waits for the next chunk
+      starts.extend([base + m.start() for m in _NDJSON_LINE_RE.finditer(buf, 0, cut)])
+      base, carry = base + cut, buf[cut:]
+      if progress is not None:
+        progress(source.consumed, source.stored_size)
+    starts.extend([base + m.start() for m in _NDJSON_LINE_RE.finditer(carry)])
+    self._starts = starts
+    self.root: JSONType = LazyArray(self, 0)
+
+  @classmethod
+  def open(cls, path: str, **kwargs: Any) -> "NdjsonDocument":
+    source = open_source(path)
+    try:
+      return cls(source, **kwargs)
+    except Exception:
+      source.close()
+      raise
+
+  def close(self) -> None:
+    self.source.close()
+
+  def child_count(self, start: int) -> int:
+    return len(self._starts)
+
+  def _line(self, i: int) -> bytes:
+    end = self._starts[i + 1] if i + 1 < len(self._starts) else self.source.size
+    return self.source.read(self._starts[i], end)
+
+  def child_value(self, start: int, i: int) -> JSONType:
+    raw = self._line(i)
+    try:
+      return self._loads(raw)
+    except ValueError:
+      return InvalidLine(raw.strip().decode("utf-8", errors="replace"))
+
+  def raw_member(self, start: int, i: int) -> RawSpan:
+    """A record's text; lines are only indexed, so it may not be valid JSON."""
+    return RawSpan(self.source, *self.child_span(start, i), record=True)
+
+  def child_span(self, start: int, i: int) -> Tuple[int, int]:
+    """Byte span of a record's text, without surrounding whitespace."""
+    raw = self._line(i)
+    stripped = raw.lstrip(_B_WS)
+    start = self._starts[i] + len(raw) - len(stripped)
+    return start, start + len(stripped.rstrip(_B_WS))
+
+
+# ---------- Search ----------
+
+_WORD_RE = re.compile(r"\w+")
+
+def path_sort_key(path: Path) -> Tuple[Tuple[bool, Any], ...]:
+  """Orders paths by segment, indices before keys, without comparing int to str."""
+  return tuple((isinstance(p, str), p) for p in path)
+
+def _leaf_text(v: Any) -> str:
+  # JSON spelling of a non-string scalar, without a json.dumps call per leaf.
+  return "null" if v is None else "true" if v is True else "false" if v is False else str(v)
+
+class SearchIndex:
+  """Inverted index from lowercased key and leaf-value tokens to paths.
+
+  A member's path is filed under the tokens of its key (object members only)
+  and, for leaves, of its value. Only the first ``max_text`` characters of a
+  string are tokenized and tokens longer than ``max_token`` are skipped, so
+  base64 blobs don't swamp the vocabulary.
+  """
+
+  def __init__(self, max_text: int = 4096, max_token: int = 64) -> None:
+    self.max_text = max_text
+    self.max_token = max_token
+    self._postings: Dict[str, set[Path]] = {}
+    self._vocab: List[str] | None = None   # sorted tokens for prefix lookups; built on first query
+
+  @classmethod
+  def build(cls, data: JSONType, cancelled: threading.Event | None = None, **kwargs: Any) -> "SearchIndex | None":
+    """Index a whole document; returns None if ``cancelled`` gets set. Safe off the UI thread."""
+    index = cls(**kwargs)
+    postings = index._postings
+    for n, (path, tokens) in enumerate(index._walk((), data)):
+      if cancelled is not None and not n & 0xFFF and cancelled.is_set():
+        return None
+      for t in tokens:
+        paths = postings.get(t)
+        if paths is None:
+          postings[t] = paths = set()
+        paths.add(path)
+    return index
+
+  def _split(self, text: str) -> List[str]:
+    return [t for t in _WORD_RE.findall(text[:self.max_text].lower()) if len(t) <= self.max_token]
+
+  def _walk(self, path: Path, value: Any) -> Iterator[Tuple[Path, List[str]]]:
+    # The stack holds member iterators rather than the members themselves, so
+    # lazy containers decode one member at a time, not a whole level at once.
+    stack: List[Tuple[Path, Iterator[Tuple[Union[str, int], Any]]]] = []
+    members: Iterator[Tuple[Union[str, int], Any]] = iter(((None, value),))
+    base = path
+    while True:
+      for key, v in members:
+        break
+      else:
+        if not stack:
+          return
+        base, members = stack.pop()
+        continue
+      p = base if key is None else (*base, key)
+      kind = kind_of(v)
+      tokens = self._split(p[-1]) if p and isinstance(p[-1], str) else []
+      if kind is NodeKind.LEAF:
+        tokens += self._split(v if isinstance(v, str) else _leaf_text(v))
+      elif kind in BRANCH_KINDS:
+        stack.append((base, members))
+        base, members = p, _members(v)
+      if tokens:
+        yield p, tokens
+
+  def add(self, path: Path, value: Any) -> None:
+    for p, tokens in self._walk(path, value):
+      for t in tokens:
+        paths = self._postings.get(t)
+        if paths is None:
+          self._postings[t] = paths = set()
+          if self._vocab is not None:
+            bisect.insort(self._vocab, t)
+        paths.add(p)
+
+  def remove(self, path: Path, value: Any) -> None:
+    for p, tokens in self._walk(path, value):
+      for t in tokens:
+        paths = self._postings.get(t)
+        if paths is None:
+          continue
+        paths.discard(p)
+        if not paths:
+          del self._postings[t]
+          if self._vocab is not None:
+            del self._vocab[bisect.bisect_left(self._vocab, t)]
+
+  def update(self, path: Path, old: Any, new: Any, added: bool = False) -> None:
+    """Re-file the subtree at ``path`` after ``old`` was replaced by ``new``."""
+    if not added:
+      self.remove(path, old)
+    self.add(path, new)
+
+  def query(self, text: str, limit: int = 500) -> Tuple[List[Path], int]:
+    """Paths matching every word of ``text``, the last word as a prefix.
+
+    Returns up to ``limit`` paths in document-like order and the total
+    number of matches.
+    """
+    words = self._split(text)
+    if not words:
+      return [], 0
+    sets: List[set[Path]] = []
+    for w in words[:-1]:
+      paths = self._postings.get(w)
+      if not paths:
+        return [], 0
+      sets.append(paths)
+    if self._vocab is None:
+      self._vocab = sorted(self._postings)
+    last = words[-1]
+    i = bisect.bisect_left(self._vocab, last)
+    prefixed: List[set[Path]] = []
+    while i < len(self._vocab) and self._vocab[i].startswith(last):
+      prefixed.append(self._postings[self._vocab[i]])
+      i += 1
+    if not prefixed:
+      return [], 0
+    sets.append(prefixed[0] if len(prefixed) == 1 else set().union(*prefixed))
+    sets.sort(key=len)
+    matches = sets[0].intersection(*sets[1:]) if len(sets) > 1 else sets[0]
+    return heapq.nsmallest(limit, matches, key=path_sort_key), len(matches)
+
+Span = Tuple[int, int]
+
+def leaf_matcher(query: str) -> Callable[[str], Span | None]:
+  """Case-insensitive substring matcher, or a regex for ``/pattern/``; raises re.error.
+
+  Spans index the text as given. Lowercasing can change the length of
+  non-ASCII text ("İ" becomes two characters), so only ASCII is searched
+  with str.lower; the rest goes through a case-insensitive regex.
+  """
+  if len(query) >= 2 and query.startswith("/") and query.endswith("/"):
+    search = re.compile(query[1:-1]).search
+  else:
+    search = re.compile(re.escape(query), re.IGNORECASE).search
+    if query.isascii():
+      needle = query.lower()
+
+      def match(text: str) -> Span | None:
+        if not text.isascii():
+          m = search(text)
+          return m.span() if m else None
+        i = text.lower().find(needle)
+        return (i, i + len(needle)) if i >= 0 else None
+      return match
+
+  def match(text: str) -> Span | None:
+    m = search(text)
+    return m.span() if m else None
+  return match
+
+def _members(value: Any) -> Iterator[Tuple[Union[str, int], Any]]:
+  """(key, value) pairs of a container; lazy ones don't keep what this decodes."""
+  if type(value) is dict:
+    return iter(value.items())
+  if type(value) is list:
+    return enumerate(value)
+  return value.scan_items()
+
+def _peek(container: Any, key: Union[str, int]) -> Any:
+  """container[key], without making a lazy container keep the decoded member."""
+  return container[key] if type(container) in (dict, list) else container.peek(key)
+
+def walk_leaves(data: JSONType, cancelled: threading.Event | None = None) -> Iterator[Tuple[Path, Any]]:
+  """Leaves in document order as (path, value).
+
+  Walks depth first without building the list of leaves; stops once
+  ``cancelled`` is set.
+  """
+  if kind_of(data) not in BRANCH_KINDS:
+    if kind_of(data) is NodeKind.LEAF:
+      yield (), data
+    return
+  stack: List[Tuple[Path, Iterator[Tuple[Union[str, int], Any]]]] = [((), _members(data))]
+  n = 0
+  while stack:
+    base, members = stack[-1]
+    for key, value in members:
+      break
+    else:
+      stack.pop()
+      continue
+    n += 1
+    if cancelled is not None and not n & 0x3FF and cancelled.is_set():
       return
-    screen = Base64DecodeScreen(f"Base64 decode of {path_to_str(meta.path)}", val)
-
-    def handle_base64(result: Base64Result | None) -> None:
-      if result and result.replacement_value is not None:
-        replacement: Any = result.replacement_value
-        if result.decoded_text is not None:
-          text = result.decoded_text
-          stripped = text.lstrip()
-          if stripped.startswith("{") or stripped.startswith("["):
-            try:
-              parsed = json.loads(text)
-            except json.JSONDecodeError:
-              parsed = None
-            else:
-              replacement = parsed
+    if type(value) in _SCALAR_TYPES:   # most members; skips kind_of
+      yield (*base, key), value
+      continue
+    kind = kind_of(value)
+    if kind in BRANCH_KINDS:
+      stack.append(((*base, key), _members(value)))
+    elif kind is NodeKind.LEAF:
+      yield (*base, key), value
+
+def scan_leaves(data: JSONType, match: Callable[[str], Span | None],
+                cancelled: threading.Event | None = None) -> Iterator[Tuple[Path, str, Span]]:
+  """Leaves in document order whose text ``match``es, as (path, text, span).
+
+  The first hits come out as soon as they're reached; stops once
+  ``cancelled`` is set.
+  """
+  for path, value in walk_leaves(data, cancelled):
+    text = value if isinstance(value, str) else _leaf_text(value)
+    span = match(text)
+    if span:
+      yield path, text, span
+
+
+# ---------- Queries ----------
+#
+# A JSONPath-like subset:
+#   $                root          .name / ['name']   object member
+#   [n] / [-n]       list index    [a:b:c]            list slice
+#   * / [*]          all members   ..sel              sel at any depth
+#   [sel, sel]       union         [?(expr)]          members where expr holds
+# Filter expressions compare @-relative (or $-absolute) paths with literals
+# using == != < <= > >= and =~ (regex search), combined with && || ! and
+# parentheses; a bare path tests for existence.
+
+class QueryError(ValueError):
+  """Malformed query expression."""
+
+_Q_TOKEN_RE = re.compile(r"""
+  \s*(?:
+    (?P<num>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<str>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+  | (?P<op>\.\.|==|!=|<=|>=|=~|&&|\|\||[$@.\[\]():,*?<>!])
+  | (?P<name>[^\W\d][\w-]*)
+  )""", re.X)
+
+_MISSING = object()
+
+QueryStep = Tuple[Any, ...]
+# ("key", name) | ("index", i) | ("slice", start, stop, step) | ("wild",)
+# ("union", (step, ...)) | ("filter", predicate) | ("descend", step)
+
+def _q_tokens(expr: str) -> List[Tuple[str, str]]:
+  tokens: List[Tuple[str, str]] = []
+  pos, end = 0, len(expr.rstrip())
+  while pos < end:
+    m = _Q_TOKEN_RE.match(expr, pos)
+    if m is None or m.end() == pos:
+      raise QueryError(f"unexpected {expr[pos:].strip()[:10]!r} at position {pos}")
+    kind = m.lastgroup or ""
+    tokens.append((kind, m.group(kind)))
+    pos = m.end()
+  return tokens
+
+def _q_string(token: str) -> str:
+  body = token[1:-1]
+  if token[0] == "'":
+    body = body.replace('\\"', '"').replace("\\'", "'").replace('"', '\\"')
+  return json.loads(f'"{body}"')
+
+def _q_literal(kind: str, text: str) -> Any:
+  if kind == "str":
+    return _q_string(text)
+  if kind == "num":
+    return float(text) if any(c in text for c in ".eE") else int(text)
+  return {"true": True, "false": False, "null": None}[text]
+
+class _QueryParser:
+  def __init__(self, expr: str) -> None:
+    self.tokens = _q_tokens(expr)
+    self.pos = 0
+
+  def peek(self) -> Tuple[str, str]:
+    return self.tokens[self.pos] if self.pos < len(self.tokens) else ("end", "")
+
+  def take(self, *texts: str) -> Tuple[str, str]:
+    tok = self.peek()
+    if texts and tok[1] not in texts:
+      raise QueryError(f"expected {' or '.join(map(repr, texts))}, got {tok[1] or 'end of query'!r}")
+    self.pos += 1
+    return tok
+
+  def accept(self, text: str) -> bool:
+    if self.peek() == ("op", text):
+      self.pos += 1
+      return True
+    return False
+
+  def query(self) -> Tuple[QueryStep, ...]:
+    if not self.accept("$") and self.peek()[0] == "name":
+      self.tokens.insert(0, ("op", "."))   # "a.b" is shorthand for "$.a.b"
+    steps: List[QueryStep] = []
+    while self.peek()[0] != "end":
+      if self.accept(".."):
+        steps.append(("descend", self.bracket() if self.peek() == ("op", "[") else self.dot_selector()))
+      elif self.accept("."):
+        steps.append(self.dot_selector())
+      elif self.peek() == ("op", "["):
+        steps.append(self.bracket())
+      else:
+        raise QueryError(f"unexpected {self.peek()[1]!r}")
+    return tuple(steps)
+
+  def dot_selector(self) -> QueryStep:
+    kind, text = self.take()
+    if kind == "name":
+      return ("key", text)
+    if (kind, text) == ("op", "*"):
+      return ("wild",)
+    raise QueryError(f"expected a member name or '*', got {text or 'end of query'!r}")
+
+  def bracket(self) -> QueryStep:
+    self.take("[")
+    if self.accept("?"):
+      self.take("(")
+      pred = self.or_expr()
+      self.take(")")
+      self.take("]")
+      return ("filter", pred)
+    if self.accept("*"):
+      self.take("]")
+      return ("wild",)
+    selectors = [self.selector()]
+    while self.accept(","):
+      selectors.append(self.selector())
+    self.take("]")
+    return selectors[0] if len(selectors) == 1 else ("union", tuple(selectors))
+
+  def int_or_none(self) -> int | None:
+    kind, text = self.peek()
+    if kind != "num":
+      return None
+    if any(c in text for c in ".eE"):
+      raise QueryError(f"list index must be an integer, got {text!r}")
+    self.pos += 1
+    return int(text)
+
+  def selector(self) -> QueryStep:
+    if self.peek()[0] == "str":
+      return ("key", _q_string(self.take()[1]))
+    start = self.int_or_none()
+    if not self.accept(":"):
+      if start is None:
+        raise QueryError(f"expected an index, slice or quoted key, got {self.peek()[1] or 'end of query'!r}")
+      return ("index", start)
+    stop = self.int_or_none()
+    step = self.int_or_none() if self.accept(":") else None
+    if step == 0:
+      raise QueryError("slice step cannot be zero")
+    return ("slice", start, stop, step)
+
+  # filter expressions compile to predicates taking (root, value)
+  def or_expr(self) -> Callable[[Any, Any], bool]:
+    left = self.and_expr()
+    while self.accept("||"):
+      right = self.and_expr()
+      left = (lambda a, b: lambda r, v: a(r, v) or b(r, v))(left, right)
+    return left
+
+  def and_expr(self) -> Callable[[Any, Any], bool]:
+    left = self.not_expr()
+    while self.accept("&&"):
+      right = self.not_expr()
+      left = (lambda a, b: lambda r, v: a(r, v) and b(r, v))(left, right)
+    return left
+
+  def not_expr(self) -> Callable[[Any, Any], bool]:
+    if self.accept("!"):
+      inner = self.not_expr()
+      return lambda r, v: not inner(r, v)
+    if self.accept("("):
+      inner = self.or_expr()
+      self.take(")")
+      return inner
+    left = self.operand()
+    op = self.peek()
+    if op[0] != "op" or op[1] not in ("==", "!=", "<", "<=", ">", ">=", "=~"):
+      return lambda r, v: left(r, v) is not _MISSING
+    self.pos += 1
+    if op[1] == "=~":
+      kind, text = self.take()
+      if kind != "str":
+        raise QueryError("=~ needs a quoted regular expression")
+      try:
+        search = re.compile(_q_string(text)).search
+      except re.error as e:
+        raise QueryError(f"bad regex: {e}") from None
+      return lambda r, v: isinstance(x := left(r, v), str) and search(x) is not None
+    right = self.operand()
+    compare = _Q_COMPARE[op[1]]
+
+    def pred(r: Any, v: Any) -> bool:
+      a, b = left(r, v), right(r, v)
+      if a is _MISSING or b is _MISSING:
+        return False
+      try:
+        return compare(a, b)
+      except TypeError:
+        return False
+    return pred
+
+  def operand(self) -> Callable[[Any, Any], Any]:
+    kind, text = self.take()
+    if (kind, text) in (("op", "@"), ("op", "$")):
+      path: List[Union[str, int]] = []
+      while True:
+        if self.accept("."):
+          k, t = self.take()
+          if k != "name":
+            raise QueryError(f"expected a member name, got {t or 'end of query'!r}")
+          path.append(t)
+        elif self.accept("["):
+          k, t = self.peek()
+          path.append(_q_string(self.take()[1]) if k == "str" else self.int_or_none())
+          if path[-1] is None:
+            raise QueryError(f"expected an index or quoted key, got {t or 'end of query'!r}")
+          self.take("]")
+        else:
+          break
+      rel, from_root = tuple(path), text == "$"
+
+      def get(r: Any, v: Any) -> Any:
+        cur = r if from_root else v
         try:
-          set_by_path(self.data, meta.path, replacement)
-        except Exception as e:
-          self.push_screen(ValueViewer("Error", f"Failed to replace value: {e!r}"))
-          return
-        self._refresh_tree_after_value_change(meta.path)
-
-    self.push_screen(screen, callback=handle_base64)
-
-  def _find_node_by_path(self, path: Path) -> Tree.Node | None:
-    tree = self.query_one(Tree)
-    stack: List[Tree.Node] = [tree.root]
-    while stack:
-      node = stack.pop()
-      node_meta: NodeMeta = node.data
-      if node_meta.path == path:
-        return node
-      stack.extend(node.children)
+          for k in rel:
+            cur = _peek(cur, k)
+        except (KeyError, IndexError, TypeError, AttributeError):   # AttributeError: a scalar has no members
+          return _MISSING
+        return cur
+      return get
+    if kind in ("num", "str") or (kind == "name" and text in ("true", "false", "null")):
+      const = _q_literal(kind, text)
+      return lambda r, v: const
+    raise QueryError(f"expected a value or path, got {text or 'end of query'!r}")
+
+def _q_eq(a: Any, b: Any) -> bool:
+  # JSON equality: true is not 1.
+  return a == b and isinstance(a, bool) == isinstance(b, bool)
+
+def _q_ordered(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+  # Only number with number and string with string are ordered; like ==, a
+  # boolean is never a number, so true > 0 is false.
+  def compare(a: Any, b: Any) -> bool:
+    if isinstance(a, bool) or isinstance(b, bool):
+      return False
+    if isinstance(a, str) != isinstance(b, str):
+      return False
+    return op(a, b)
+  return compare
+
+_Q_COMPARE: Dict[str, Callable[[Any, Any], bool]] = {
+  "==": _q_eq,
+  "!=": lambda a, b: not _q_eq(a, b),
+  "<": _q_ordered(lambda a, b: a < b),
+  "<=": _q_ordered(lambda a, b: a <= b),
+  ">": _q_ordered(lambda a, b: a > b),
+  ">=": _q_ordered(lambda a, b: a >= b),
+}
+
+Match = Tuple[Path, Any]
+
+def _q_select(step: QueryStep, root: Any, path: Path, value: Any) -> Iterator[Match]:
+  """Members of ``value`` picked by one selector, touching no others."""
+  tag = step[0]
+  kind = kind_of(value)
+  if tag == "key":
+    if kind is NodeKind.DICT and step[1] in value:
+      yield (*path, step[1]), _peek(value, step[1])
+  elif tag == "index":
+    if kind is NodeKind.LIST:
+      i = step[1] + len(value) if step[1] < 0 else step[1]
+      if 0 <= i < len(value):
+        yield (*path, i), _peek(value, i)
+  elif tag == "slice":
+    if kind is NodeKind.LIST:
+      for i in range(*slice(*step[1:]).indices(len(value))):
+        yield (*path, i), _peek(value, i)
+  elif tag == "wild":
+    if kind in BRANCH_KINDS:
+      for k, v in _members(value):
+        yield (*path, k), v
+  elif tag == "union":
+    for sub in step[1]:
+      yield from _q_select(sub, root, path, value)
+  elif tag == "filter":
+    if kind in BRANCH_KINDS:
+      pred = step[1]
+      for k, v in _members(value):
+        if pred(root, v):
+          yield (*path, k), v
+
+def _q_descendants(path: Path, value: Any) -> Iterator[Match]:
+  """``value`` and everything below it, in document order."""
+  yield path, value
+  stack: List[Tuple[Path, Iterator[Tuple[Union[str, int], Any]]]] = []
+  if kind_of(value) in BRANCH_KINDS:
+    stack.append((path, _members(value)))
+  while stack:
+    base, members = stack[-1]
+    for key, child in members:
+      break
+    else:
+      stack.pop()
+      continue
+    child_path = (*base, key)
+    yield child_path, child
+    if kind_of(child) in BRANCH_KINDS:
+      stack.append((child_path, _members(child)))
+
+def _q_apply(step: QueryStep, root: Any, matches: Iterator[Match]) -> Iterator[Match]:
+  if step[0] == "descend":
+    sub = step[1]
+    for path, value in matches:
+      for p, v in _q_descendants(path, value):
+        yield from _q_select(sub, root, p, v)
+  else:
+    for path, value in matches:
+      yield from _q_select(step, root, path, value)
+
+@dataclass(frozen=True, slots=True)
+class QueryPlan:
+  expr: str
+  steps: Tuple[QueryStep, ...]
+
+  def run(self, data: JSONType) -> Iterator[Match]:
+    """Lazily yield (path, value) matches; only what is consumed gets evaluated."""
+    matches: Iterator[Match] = iter((((), data),))
+    for step in self.steps:
+      matches = _q_apply(step, data, matches)
+    return matches
+
+@functools.lru_cache(maxsize=256)
+def compile_query(expr: str) -> QueryPlan:
+  """Parse ``expr`` into a reusable plan; repeated expressions come from the cache."""
+  return QueryPlan(expr, _QueryParser(expr).query())
+
+def parse_path(text: str) -> Path:
+  """The single path ``text`` names, in query syntax: ``$.a.b[0]``, ``a['b c'][-1]``.
+
+  path_to_str output (``a.[0].b``) is accepted too. Raises QueryError for
+  anything that could select more than one value (wildcards, slices, ...).
+  """
+  p = _QueryParser(text)
+  toks = p.tokens
+  # path_to_str writes list indices as ".[n]"; the query grammar has no "." before "[".
+  p.tokens = [t for i, t in enumerate(toks) if not (t == ("op", ".") and toks[i + 1:i + 2] == [("op", "[")])]
+  path: List[Union[str, int]] = []
+  for step in p.query():
+    if step[0] not in ("key", "index"):
+      raise QueryError(f"{text!r} is not a single path; use the query command for wildcards, slices and filters")
+    path.append(step[1])
+  return tuple(path)
+
+
+# ---------- Base64 detection and bulk decoding ----------
+class B64(IntFlag):
+  """What a string leaf holds; B64(0) means plain text.
+
+  BASE64 is set on every decodable string, URLSAFE when it uses the -_
+  alphabet, TEXT when the payload is UTF-8 and JSON when that text is a JSON
+  object or array.
+  """
+  BASE64 = 1
+  URLSAFE = 2
+  TEXT = 4
+  JSON = 8
+
+  @property
+  def label(self) -> str:
+    if not self:
+      return "plain"
+    name = "b64url" if self & B64.URLSAFE else "b64"
+    return f"{name} {'json' if self & B64.JSON else 'text' if self & B64.TEXT else 'bytes'}"
+
+_B64_STD_RE = re.compile(r"[A-Za-z0-9+/]*={0,2}")
+_B64_URL_RE = re.compile(r"[A-Za-z0-9_-]*={0,2}")
+_HEX_RE = re.compile(r"[0-9A-Fa-f]*")
+# Identifiers that happen to fit the URL-safe alphabet: UUIDs and ISO dates.
+_ID_SHAPE_RE = re.compile(r"[0-9A-Fa-f]{8}(?:-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}|\d{4}-\d{2}-\d{2}")
+_CONTROL_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]")
+_DIGIT_RE = re.compile(r"[0-9]")
+_LOWER_RE = re.compile(r"[a-z]")
+_UPPER_RE = re.compile(r"[A-Z]")
+_B64_KINDS = tuple(B64(i) for i in range(16))   # B64(i) without the enum call overhead
+B64_MIN_LEN = 8
+B64_PROBE = 4096   # characters trial-decoded per string; a multiple of 4
+
+def classify_base64(s: str) -> B64:
+  """Classify a string as plain or as base64 and what it wraps.
+
+  Strings that are short, stray outside both alphabets, have a length no
+  encoder produces, or look like a hex digest are plain without decoding
+  anything. Otherwise the first B64_PROBE characters are decoded to tell text
+  and JSON payloads from bytes; a longer string is judged by that prefix.
+  Short strings of only letters and digits count only if they decode to
+  text, since most of them are words and identifiers. The same goes for
+  URL-safe strings of any length unless they mix digits with upper and lower
+  case letters: ``created_at``, ``us-east-1a`` and ``my-service-name`` are
+  names, not payloads. UUIDs and ISO dates are always plain.
+  """
+  n = len(s)
+  if n < B64_MIN_LEN:
+    return _B64_KINDS[0]
+  if _B64_STD_RE.fullmatch(s):
+    if n % 4:
+      return _B64_KINDS[0]
+    kind, probe = B64.BASE64, s[:B64_PROBE]
+  elif _B64_URL_RE.fullmatch(s):
+    if n % 4 if s.endswith("=") else n % 4 == 1:
+      return _B64_KINDS[0]
+    kind, probe = B64.BASE64 | B64.URLSAFE, s[:B64_PROBE].translate(_URLSAFE_TO_STD)
+    probe += "=" * (-len(probe) % 4)
+  else:
+    return _B64_KINDS[0]
+  body = s.rstrip("=")
+  if _HEX_RE.fullmatch(body) or (kind & B64.URLSAFE and _ID_SHAPE_RE.fullmatch(body)):
+    return _B64_KINDS[0]
+  # Encoders produce digits and both cases alike; identifiers rarely mix all three.
+  random_looking = bool(_DIGIT_RE.search(body) and _LOWER_RE.search(body) and _UPPER_RE.search(body))
+  complete = n <= B64_PROBE
+  try:
+    # The alphabet and padding are already checked, so the lenient decoder is safe.
+    raw = binascii.a2b_base64(probe)
+    text = raw.decode("utf-8") if complete else codecs.getincrementaldecoder("utf-8")().decode(raw)
+  except (binascii.Error, UnicodeDecodeError):
+    if kind & B64.URLSAFE:
+      return _B64_KINDS[kind] if random_looking else _B64_KINDS[0]
+    return _B64_KINDS[0] if n < 32 and body.isalnum() else _B64_KINDS[kind]
+  if kind & B64.URLSAFE and not random_looking and _CONTROL_RE.search(text):
+    return _B64_KINDS[0]
+  kind |= B64.TEXT
+  if text.lstrip()[:1] in ("{", "["):
+    if not complete:
+      kind |= B64.JSON
+    else:
+      try:
+        json.loads(text)
+      except ValueError:
+        pass
+      else:
+        kind |= B64.JSON
+  return _B64_KINDS[kind]
+
+def scan_base64(data: JSONType, cancelled: threading.Event | None = None,
+                progress: Callable[[int], None] | None = None) -> Tuple[Dict[Path, B64], int] | None:
+  """Classify every string leaf; returns (non-plain kinds by path, strings seen).
+
+  ``progress`` gets the running count of strings every 64k leaves. Returns
+  None if ``cancelled`` was set.
+  """
+  found: Dict[Path, B64] = {}
+  strings = 0
+  for i, (path, value) in enumerate(walk_leaves(data, cancelled), 1):
+    if isinstance(value, str):
+      strings += 1
+      if len(value) >= B64_MIN_LEN:
+        kind = classify_base64(value)
+        if kind:
+          found[path] = kind
+    if progress is not None and not i & 0xFFFF:
+      progress(strings)
+  if cancelled is not None and cancelled.is_set():
     return None
+  return found, strings
+
+def promote_decoded(text: str) -> Any:
+  """What decoded UTF-8 text replaces its leaf with: the parsed value if the
+  text is a JSON object or array, else the text itself."""
+  if text.lstrip()[:1] in ("{", "["):
+    try:
+      return json.loads(text)
+    except json.JSONDecodeError:
+      pass
+  return text
 
-  def _refresh_tree_after_value_change(self, path: Path) -> None:
-    new_value = get_by_path(self.data, path) if path else self.data
-    is_branch = isinstance(new_value, (dict, list))
-    if not path:
-      tree = self.query_one(Tree)
-      node = tree.root
-      meta: NodeMeta = node.data
-      if isinstance(new_value, dict):
-        meta.kind = "dict"
-      elif isinstance(new_value, list):
-        meta.kind = "list"
+def decode_base64_leaf(src: str) -> Any:
+  """The replacement for a base64 leaf, by the decode screen's rules.
+
+  UTF-8 payloads go through promote_decoded; other bytes become a Latin-1
+  string. Raises binascii.Error if ``src`` isn't base64.
+  """
+  raw = b"".join(p for p, _ in iter_b64decode(src, urlsafe="-" in src or "_" in src))
+  try:
+    text = raw.decode("utf-8")
+  except UnicodeDecodeError:
+    return raw.decode("latin-1")
+  return promote_decoded(text)
+
+def _decode_base64_batch(values: List[str]) -> List[Tuple[bool, Any]]:
+  """decode_base64_leaf over ``values`` as (ok, value or error text); runs in pool workers."""
+  out: List[Tuple[bool, Any]] = []
+  for v in values:
+    try:
+      out.append((True, decode_base64_leaf(v)))
+    except ValueError as e:   # binascii.Error is a ValueError
+      out.append((False, str(e)))
+  return out
+
+BULK_BATCH_CHARS = 1 << 20      # base64 characters per batch sent to a worker
+BULK_PROCESS_MIN_CHARS = 8 << 20   # below this, decoding in-process beats starting a pool
+
+def bulk_decode_base64(values: List[str], cancelled: threading.Event | None = None,
+                       progress: Callable[[int], None] | None = None,
+                       workers: int | None = None) -> List[Tuple[bool, Any]] | None:
+  """decode_base64_leaf over many leaves, as (ok, value or error text) in order.
+
+  Small volumes are decoded in this process. From BULK_PROCESS_MIN_CHARS on,
+  batches are spread over a process pool (``workers`` defaults to the CPU
+  count), so large payloads decode in parallel instead of behind the GIL.
+  ``progress`` gets the number of leaves done after each batch. Returns None
+  if ``cancelled`` was set.
+  """
+  batches: List[List[str]] = [[]]
+  size = 0
+  for v in values:
+    if size >= BULK_BATCH_CHARS:
+      batches.append([])
+      size = 0
+    batches[-1].append(v)
+    size += len(v) + 64   # count a per-leaf overhead so tiny leaves still batch sensibly
+  workers = min(workers or os.cpu_count() or 1, len(batches))
+  total_chars = sum(map(len, values))
+  out: List[Tuple[bool, Any]] = []
+  if workers < 2 or total_chars < BULK_PROCESS_MIN_CHARS:
+    for batch in batches:
+      if cancelled is not None and cancelled.is_set():
+        return None
+      out.extend(_decode_base64_batch(batch))
+      if progress is not None:
+        progress(len(out))
+    return out
+  import concurrent.futures   # imported here: they cost startup time and only large batches need them
+  import multiprocessing
+
+  # spawn, not fork: the UI's threads must not be duplicated into the workers.
+  ctx = multiprocessing.get_context("spawn")
+  pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=ctx)
+  try:
+    futures = [pool.submit(_decode_base64_batch, batch) for batch in batches]
+    for future in futures:
+      while True:
+        try:
+          out.extend(future.result(timeout=0.1))
+          break
+        except concurrent.futures.TimeoutError:
+          if cancelled is not None and cancelled.is_set():
+            return None
+      if progress is not None:
+        progress(len(out))
+  finally:
+    # Drops queued batches when cancelled; busy workers exit after their batch.
+    pool.shutdown(wait=False, cancel_futures=True)
+  return out
+
+
+# ---------- Saving ----------
+
+@dataclass(frozen=True, slots=True)
+class RawSpan:
+  """A never-opened member of a lazy document, read from the source only while it is written."""
+  source: ByteSource
+  start: int
+  end: int
+  record: bool = False   # a JSON Lines record, written as a string (InvalidLine) if invalid
+
+_encode_str = json.encoder.encode_basestring   # C implementation when available
+
+def encode_leaf(v: Any) -> str:
+  """JSON text of a scalar, spelled like json.dumps(..., ensure_ascii=False)."""
+  if isinstance(v, str):
+    return _encode_str(v)
+  if v is None:
+    return "null"
+  if v is True:
+    return "true"
+  if v is False:
+    return "false"
+  if isinstance(v, int):
+    return int.__repr__(v)
+  if isinstance(v, float):
+    if v != v:
+      return "NaN"
+    if v in (float("inf"), float("-inf")):
+      return "Infinity" if v > 0 else "-Infinity"
+    return float.__repr__(v)
+  raise ValueError(f"cannot save a {type(v).__name__} value")
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+def _encode_flat(value: Any, nl: str, inner: str, key_sep: str, limit: int = 256) -> str | None:
+  # A small plain container holding only scalars, encoded in one go; None otherwise.
+  if len(value) > limit:
+    return None
+  if type(value) is dict:
+    if not all(type(v) in _SCALAR_TYPES for v in value.values()):
+      return None
+    parts = [_encode_str(k) + key_sep + encode_leaf(v) for k, v in value.items()]
+    return "{" + inner + ("," + inner).join(parts) + nl + "}"
+  if type(value) is list:
+    if not all(type(v) in _SCALAR_TYPES for v in value):
+      return None
+    return "[" + inner + ("," + inner).join(map(encode_leaf, value)) + nl + "]"
+  return None
+
+def _raw_members(value: Any) -> Iterator[Tuple[Union[str, int], Any]]:
+  raw_items = getattr(value, "raw_items", None)
+  return raw_items() if raw_items is not None else _members(value)
+
+def _span_value(span: RawSpan) -> Any:
+  """The value ``span`` holds, decoded for writing and then dropped.
+
+  An invalid JSON Lines record becomes an InvalidLine of its text; invalid
+  bytes anywhere else raise ValueError.
+  """
+  raw = span.source.read(span.start, span.end)
+  try:
+    return json.loads(raw)
+  except ValueError as e:
+    if span.record:
+      return InvalidLine(raw.decode("utf-8", errors="replace"))
+    at = span.start + getattr(e, "pos", 0)   # JSONDecodeError counts from the start of the span
+    raise ValueError(f"{getattr(e, 'msg', e)} at offset {at}") from None
+
+def iter_json_bytes(data: JSONType, indent: int | None = 2, chunk_size: int = 1 << 20,
+                    cancelled: threading.Event | None = None) -> Iterator[bytes]:
+  """Encode ``data`` as UTF-8 JSON in chunks of about ``chunk_size`` bytes.
+
+  The document is walked with an explicit stack, so the full text is never
+  built in memory and deep nesting can't hit the recursion limit. Members of
+  lazy containers that were never opened are decoded one at a time as they
+  are written and not kept, so they are re-indented like everything else.
+  Output matches json.dumps(data, ensure_ascii=False, indent=indent) for a
+  positive ``indent``; None or 0 match separators=(",", ":"). A JSON Lines
+  record that isn't valid JSON (InvalidLine) is written as a JSON string of
+  its text.
+  """
+  key_sep = ": " if indent else ":"
+  pad = " " * (indent or 0)
+  buf: List[str] = []
+  size = 0
+  # frames: [members, is_dict, newline + indentation of the members, count]
+  stack: List[List[Any]] = []
+  value: Any = data
+  prefix = ""
+  while True:
+    if value is not _MISSING:
+      # open a value: scalars and small flat containers are written whole
+      nl = stack[-1][2] if stack else ("\n" if indent else "")
+      if isinstance(value, RawSpan):
+        value = _span_value(value)
+      if type(value) in _SCALAR_TYPES or isinstance(value, (str, int, float)):   # subclasses too (InvalidLine)
+        text = prefix + encode_leaf(value)
       else:
-        meta.kind = "leaf"
-      node.allow_expand = meta.kind in ("dict", "list")
-      node.remove_children()
-      if meta.kind in ("dict", "list"):
-        meta.loaded = False
-        self._populate_children(node)
-        if is_branch:
-          node.expand()
+        kind = kind_of(value)
+        if kind not in BRANCH_KINDS:
+          raise ValueError(f"cannot save a {kind.name.lower()} value")
+        inner = nl + pad if indent else ""
+        if not len(value):
+          text = prefix + ("{}" if kind is NodeKind.DICT else "[]")
+        else:
+          flat = _encode_flat(value, nl, inner, key_sep)
+          if flat is None:
+            text = prefix + ("{" if kind is NodeKind.DICT else "[")
+            stack.append([_raw_members(value), kind is NodeKind.DICT, inner, 0])
+          else:
+            text = prefix + flat
+      buf.append(text)
+      size += len(text)
+      value = _MISSING
+    elif not stack:
+      break
+    else:
+      frame = stack[-1]
+      member = next(frame[0], None)
+      if member is None:
+        stack.pop()
+        closing = (frame[2][:-len(pad)] if indent else "") + ("}" if frame[1] else "]")
+        buf.append(closing)
+        size += len(closing)
       else:
-        meta.loaded = True
-      return
+        prefix = ("," if frame[3] else "") + frame[2]
+        if frame[1]:
+          prefix += _encode_str(member[0]) + key_sep
+        frame[3] += 1
+        value = member[1]
+    if size >= chunk_size:
+      if cancelled is not None and cancelled.is_set():
+        return
+      yield "".join(buf).encode("utf-8")
+      buf, size = [], 0
+  buf.append("\n")
+  yield "".join(buf).encode("utf-8")
+
+class _SaveCancelled(Exception):
+  pass
+
+def iter_ndjson_bytes(records: JSONType, chunk_size: int = 1 << 20,
+                      cancelled: threading.Event | None = None) -> Iterator[bytes]:
+  """Encode an array as JSON Lines, one compact record per line.
+
+  Records of an NDJSON document that were never opened, and lines that were
+  not valid JSON, are copied verbatim. A root that isn't an array is written
+  as a single line.
+  """
+  if kind_of(records) is not NodeKind.LIST:
+    yield from iter_json_bytes(records, None, chunk_size, cancelled)
+    return
+  buf: List[bytes] = []
+  size = 0
+  for _, value in _raw_members(records):
+    if isinstance(value, RawSpan):
+      piece = value.source.read(value.start, value.end) + b"\n"
+    elif isinstance(value, InvalidLine):
+      piece = value.encode("utf-8") + b"\n"
+    elif isinstance(value, (LazyObject, LazyArray)):
+      piece = b"".join(iter_json_bytes(value, None, chunk_size))
+    else:
+      piece = (json.dumps(value, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    buf.append(piece)
+    size += len(piece)
+    if size >= chunk_size:
+      if cancelled is not None and cancelled.is_set():
+        return
+      yield b"".join(buf)
+      buf, size = [], 0
+  yield b"".join(buf)
+
+# Read once at import, while no other thread can observe the temporary change.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def save_json(data: JSONType, path: str, indent: int | None = 2,
+              progress: Callable[[int, float], None] | None = None,
+              cancelled: threading.Event | None = None, lines: bool = False) -> Tuple[int, float]:
+  """Write ``data`` to ``path`` atomically; returns (bytes written, seconds).
+
+  The document is streamed into a temporary file next to ``path`` which then
+  replaces it with os.replace, so readers see either the old or the new file.
+  ``progress`` gets (bytes written, seconds elapsed) about ten times a second.
+  With ``lines`` the document is written as JSON Lines (``indent`` is ignored).
+  A symlinked ``path`` is followed, so the link keeps pointing at the new
+  content; a new file gets the usual umask-based mode, an existing one keeps its mode.
+  """
+  path = os.path.realpath(path)
+  fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path))
+  started = last = time.monotonic()
+  written = 0
+  try:
+    with os.fdopen(fd, "wb") as f:
+      chunks = iter_ndjson_bytes(data, cancelled=cancelled) if lines else iter_json_bytes(data, indent, cancelled=cancelled)
+      for chunk in chunks:
+        f.write(chunk)
+        written += len(chunk)
+        now = time.monotonic()
+        if progress is not None and now - last >= 0.1:
+          progress(written, now - started)
+          last = now
+      if cancelled is not None and cancelled.is_set():
+        raise _SaveCancelled()
+      f.flush()
+      os.fsync(f.fileno())
+    # mkstemp creates the file 0600; give it the mode a plain open() would have.
+    mode = os.stat(path).st_mode & 0o7777 if os.path.exists(path) else 0o666 & ~_UMASK
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+  except BaseException:
+    try:
+      os.unlink(tmp)
+    except OSError:
+      pass
+    raise
+  elapsed = time.monotonic() - started
+  if progress is not None:
+    progress(written, elapsed)
+  return written, elapsed
 
-    parent_path = path[:-1]
-    parent_node = self._find_node_by_path(parent_path)
-    if parent_node is None:
-      return
-    parent_meta: NodeMeta = parent_node.data
-    if parent_meta.kind not in ("dict", "list"):
+def format_throughput(written: int, elapsed: float) -> str:
+  mib = written / (1 << 20)
+  return f"{mib:,.1f} MiB in {elapsed:.1f} s ({mib / max(elapsed, 1e-6):,.1f} MiB/s)"
+
+
+# ---------- Paged text ----------
+
+class RowSource(Protocol):
+  """Display rows a pager shows: LineIndex for text, HexRows for bytes."""
+  width: int
+  complete: bool   # known_rows() is final
+
+  def known_rows(self) -> int: ...
+  def has_row(self, row: int) -> bool: ...
+  def rows(self, start: int, stop: int) -> List[str]: ...
+  def last_row(self) -> int: ...
+  def offset_of(self, row: int) -> int: ...
+  def row_of(self, offset: int) -> int: ...
+
+def _char_cells(c: str) -> int:
+  """Terminal cells of one character: 2 for wide and fullwidth, 0 for combining marks."""
+  return 0 if unicodedata.combining(c) else 2 if unicodedata.east_asian_width(c) in "WF" else 1
+
+def _next_row(text: str, pos: int, width: int, cells: Callable[[str], int]) -> int:
+  """Start of the display row after the one starting at ``pos``.
+
+  A row ends after a newline, or before the character that would take it
+  past ``width`` cells; a newline right after a full row ends that row.
+  """
+  nl = text.find("\n", pos, pos + width + 1)
+  end = nl if nl >= 0 else pos + width
+  if text[pos:end].isascii():   # the usual case: one cell per character
+    return nl + 1 if nl >= 0 else end
+  used = 0
+  for i in range(pos, len(text)):
+    c = text[i]
+    if c == "\n":
+      return i + 1
+    w = cells(c)
+    if used + w > width and i > pos:
+      return i
+    used += w
+  return len(text)
+
+class LineIndex:
+  """Start offsets of the display rows of a string, computed lazily.
+
+  Rows break after newlines and every ``width`` terminal cells, so a single
+  50 MB line still pages. ``cells`` measures one character; the UI passes
+  rich's so rows match what the terminal draws. The text is only scanned up
+  to the furthest row or offset asked for, and is never copied.
+  """
+
+  STEP = 4096   # rows indexed per extension
+
+  def __init__(self, text: str, width: int, cells: Callable[[str], int] = _char_cells) -> None:
+    self.text = text
+    self.width = max(1, width)
+    self.cells = cells
+    self._starts = array("q", [0])
+    self.complete = len(text) == 0
+
+  def _extend(self, rows: int = STEP) -> None:
+    text, width, cells, starts = self.text, self.width, self.cells, self._starts
+    n = len(text)
+    pos = starts[-1]
+    for _ in range(rows):
+      nxt = _next_row(text, pos, width, cells)
+      if nxt >= n:
+        self.complete = True
+        return
+      starts.append(nxt)
+      pos = nxt
+
+  def known_rows(self) -> int:
+    return len(self._starts)
+
+  def has_row(self, row: int) -> bool:
+    while row >= len(self._starts) and not self.complete:
+      self._extend()
+    return 0 <= row < len(self._starts)
+
+  def rows(self, start: int, stop: int) -> List[str]:
+    """Text of display rows [start, stop), trailing newlines stripped."""
+    self.has_row(stop)
+    starts, text = self._starts, self.text
+    out: List[str] = []
+    for i in range(max(0, start), min(stop, len(starts))):
+      end = starts[i + 1] if i + 1 < len(starts) else len(text)
+      out.append(text[starts[i]:end].rstrip("\n"))
+    return out
+
+  def last_row(self) -> int:
+    while not self.complete:
+      self._extend(1 << 16)
+    return len(self._starts) - 1
+
+  def offset_of(self, row: int) -> int:
+    self.has_row(row)
+    return self._starts[min(max(0, row), len(self._starts) - 1)]
+
+  def row_of(self, offset: int) -> int:
+    """Display row containing character ``offset``."""
+    while self._starts[-1] <= offset and not self.complete:
+      self._extend()
+    return max(0, bisect.bisect_right(self._starts, offset) - 1)
+
+  def line_offset(self, line: int) -> int:
+    """Offset where logical (newline-separated) line ``line`` (1-based) starts."""
+    pos = 0
+    for _ in range(max(0, line - 1)):
+      nl = self.text.find("\n", pos)
+      if nl < 0:
+        break
+      pos = nl + 1
+    return pos
+
+
+class Utf8Rows(LineIndex):
+  """LineIndex over UTF-8 text held as bytes, such as a Base64Bytes view.
+
+  Offsets are byte offsets. The text is decoded a block at a time while
+  indexing and a screenful at a time while showing, so only that window is
+  ever materialized.
+  """
+
+  BLOCK = 1 << 16   # bytes decoded per indexing step
+
+  def __init__(self, data: bytes | Base64Bytes, width: int, cells: Callable[[str], int] = _char_cells) -> None:
+    super().__init__("", width, cells)
+    self.data = data
+    self.complete = len(data) == 0
+
+  def _extend(self, rows: int = LineIndex.STEP) -> None:
+    data, width, cells, starts = self.data, self.width, self.cells, self._starts
+    n = len(data)
+    added = 0
+    while added < rows:
+      pos = starts[-1]
+      end = min(n, pos + max(self.BLOCK, 8 * width))
+      # surrogateescape keeps a byte count exact even across invalid sequences;
+      # a character split at ``end`` is held back until the next block.
+      text = codecs.getincrementaldecoder("utf-8")("surrogateescape").decode(data[pos:end], final=end >= n)
+      i = 0
+      while added < rows:
+        nxt = _next_row(text, i, width, cells)
+        if nxt >= len(text):
+          if end >= n:
+            self.complete = True
+            return
+          if i:
+            break   # the row may go on past this block; index it from the next one
+          nxt = len(text)   # one row longer than a block, e.g. combining marks: cut it here
+        pos += len(text[i:nxt].encode("utf-8", "surrogateescape"))
+        starts.append(pos)
+        i = nxt
+        added += 1
+
+  def rows(self, start: int, stop: int) -> List[str]:
+    """Text of display rows [start, stop), trailing newlines stripped."""
+    self.has_row(stop)
+    starts, n = self._starts, len(self.data)
+    lo, hi = max(0, start), min(stop, len(starts))
+    if lo >= hi:
+      return []
+    base = starts[lo]
+    window = self.data[base:starts[hi] if hi < len(starts) else n]
+    return [window[starts[i] - base:(starts[i + 1] if i + 1 < len(starts) else n) - base]
+            .decode("utf-8", errors="replace").rstrip("\n") for i in range(lo, hi)]
+
+  def line_offset(self, line: int) -> int:
+    """Byte offset where logical line ``line`` (1-based) starts."""
+    data, n = self.data, len(self.data)
+    pos, left = 0, max(0, line - 1)
+    while left and pos < n:
+      block = data[pos:pos + self.BLOCK]
+      at = -1
+      while left:
+        at = block.find(b"\n", at + 1)
+        if at < 0:
+          break
+        left -= 1
+      if not left:
+        return pos + at + 1
+      pos += len(block)
+    return min(pos, n)
+
+
+class HexRows:
+  """RowSource for a hex dump of ``data``; every row is known up front."""
+
+  complete: bool = True
+
+  def __init__(self, data: bytes | Base64Bytes, width: int = 16) -> None:
+    self.data = data
+    self.width = width
+
+  def known_rows(self) -> int:
+    return max(1, -(-len(self.data) // self.width))
+
+  def has_row(self, row: int) -> bool:
+    return 0 <= row < self.known_rows()
+
+  def rows(self, start: int, stop: int) -> List[str]:
+    return hex_rows(self.data, start, stop, self.width)
+
+  def last_row(self) -> int:
+    return self.known_rows() - 1
+
+  def offset_of(self, row: int) -> int:
+    return min(max(0, row), self.last_row()) * self.width
+
+  def row_of(self, offset: int) -> int:
+    return min(max(0, offset) // self.width, self.last_row())
+
+
+# Pretty rendering in the style of rich.pretty.pretty_repr, produced as a
+# stream of text fragments so a viewer can show the start of a huge value
+# before the rest has been formatted.
+
+_PRETTY_CHUNK = 1 << 16   # long strings are escaped this many characters at a time
+
+class _TooWide(Exception):
+  pass
+
+def _cell_len(text: str) -> int:
+  """Terminal cells ``text`` takes up, counted the way rich does for reprs.
+
+  Wide and fullwidth characters (CJK, most emoji) take two cells and
+  combining marks none; repr has already escaped control characters.
+  """
+  if text.isascii():
+    return len(text)
+  return sum(0 if unicodedata.combining(c) else 2 if unicodedata.east_asian_width(c) in "WF" else 1
+             for c in text)
+
+def _inline_repr(value: Any, budget: int) -> str | None:
+  """One-line repr of ``value`` if it fits in ``budget`` cells, else None.
+
+  Gives up as soon as the budget is exceeded, so the work is bounded by the
+  budget rather than by the size of the value.
+  """
+  parts: List[str] = []
+  used = 0
+
+  def add(text: str) -> None:
+    nonlocal used
+    used += _cell_len(text)
+    if used > budget:
+      raise _TooWide()
+    parts.append(text)
+
+  def walk(v: Any) -> None:
+    kind = kind_of(v)
+    if kind not in BRANCH_KINDS:
+      # A prefix is enough to rule out most long strings without measuring them whole.
+      if isinstance(v, str) and len(v) > budget and _cell_len(v[:2 * budget + 2]) > budget:
+        raise _TooWide()
+      add(repr(v))
       return
-    parent_meta.loaded = False
-    self._populate_children(parent_node)
-    if is_branch:
-      parent_node.expand()
-      new_node = self._find_node_by_path(path)
-      if new_node is not None:
-        new_meta: NodeMeta = new_node.data
-        new_meta.loaded = False
-        self._populate_children(new_node)
-        new_node.expand()
-
-  def _edit_leaf(self, node: Tree.Node) -> None:
-    meta: NodeMeta = node.data
-    old = get_by_path(self.data, meta.path)
-    initial = old if isinstance(old, str) else json.dumps(old, indent=2, ensure_ascii=False)
-    edited = open_in_editor(initial)
-    if edited is None:
+    is_dict = kind is NodeKind.DICT
+    add("{" if is_dict else "[")
+    for i, (k, c) in enumerate(_members(v)):
+      if i:
+        add(", ")
+      if is_dict:
+        add(repr(k) + ": ")
+      walk(c)
+    add("}" if is_dict else "]")
+
+  try:
+    walk(value)
+  except _TooWide:
+    return None
+  return "".join(parts)
+
+def _repr_str_chunks(s: str) -> Iterator[str]:
+  if len(s) <= _PRETTY_CHUNK:
+    yield repr(s)
+    return
+  # Escape piecewise under single quotes; repr picks double quotes for a
+  # piece that holds ' but no ", and then leaves the ' unescaped.
+  yield "'"
+  for i in range(0, len(s), _PRETTY_CHUNK):
+    r = repr(s[i:i + _PRETTY_CHUNK])
+    yield r[1:-1] if r[0] == "'" else r[1:-1].replace("'", "\\'")
+  yield "'"
+
+def iter_pretty(value: Any, width: int = 80, indent: int = 4) -> Iterator[str]:
+  """Pretty-print ``value`` as a stream of text fragments.
+
+  Containers that fit on the rest of the line are written inline; others are
+  expanded one member per line, like rich.pretty.pretty_repr. Nothing past
+  the fragments consumed so far is formatted.
+  """
+  pad = " " * indent
+  stack: List[List[Any]] = []   # [members, is_dict, count] per expanded container
+  pending: Tuple[str, Any] | None = ("", value)   # (line head, value) to write next
+  while True:
+    if pending is not None:
+      head, v = pending
+      pending = None
+      kind = kind_of(v)
+      if kind in BRANCH_KINDS and len(v):
+        # Like rich, leave room for a ", " separator on member lines.
+        inline = _inline_repr(v, width - _cell_len(head) - (2 if stack else 0))
+        if inline is None:
+          yield head + ("{" if kind is NodeKind.DICT else "[")
+          stack.append([_members(v), kind is NodeKind.DICT, 0])
+        else:
+          yield head + inline
+      elif isinstance(v, str):
+        yield head
+        yield from _repr_str_chunks(v)
+      else:
+        yield head + ("{}" if kind is NodeKind.DICT else "[]" if kind is NodeKind.LIST else repr(v))
+    elif not stack:
       return
-    if isinstance(old, str):
-      new_value: Any = edited
     else:
-      try:
-        new_value = json.loads(edited)
-      except json.JSONDecodeError:
-        new_value = edited
-    try:
-      set_by_path(self.data, meta.path, new_value)
-    except Exception as e:
-      self.push_screen(ValueViewer("Error", f"Failed to set value: {e!r}"))
-
-  # shortcuts
-  def action_edit_selected(self) -> None:
-    tree = self.query_one(Tree)
-    node = tree.cursor_node or tree.root
-    meta: NodeMeta = node.data
-    if meta.kind == "leaf":
-      self._edit_leaf(node)
-
-  def action_display_selected(self) -> None:
-    tree = self.query_one(Tree)
-    node = tree.cursor_node or tree.root
-    meta: NodeMeta = node.data
-    if meta.kind == "leaf":
-      self._display_leaf(node)
-
-  def action_ops_selected(self) -> None:
-    tree = self.query_one(Tree)
-    node = tree.cursor_node or tree.root
-    meta: NodeMeta = node.data
-    if meta.kind == "leaf":
-      self._open_ops_for_node(node)
+      frame = stack[-1]
+      member = next(frame[0], None)
+      if member is None:
+        stack.pop()
+        yield "\n" + pad * len(stack) + ("}" if frame[1] else "]")
+        continue
+      key, child = member
+      lead = ",\n" if frame[2] else "\n"
+      frame[2] += 1
+      head = pad * len(stack) + (repr(key) + ": " if frame[1] else "")
+      yield lead
+      pending = (head, child)
+
+
+# ---------- Edit history and tree metadata ----------
+
+@dataclass(slots=True)
+class Edit:
+  path: Path
+  old: Any   # _MISSING when the edit added the key
+  new: Any
+
+@dataclass(slots=True)
+class EditBatch:
+  """Edits made by one command, undone and redone together."""
+  edits: List[Edit]   # each replaces an existing value; none adds a key
+
+class EditHistory:
+  """Bounded undo/redo stacks of edits.
+
+  Entries hold references to the replaced and replacing values rather than
+  copies, so history costs what the edited subtrees cost, not the document.
+  """
+
+  def __init__(self, limit: int = 1000) -> None:
+    self._undo: deque[Edit | EditBatch] = deque(maxlen=limit)
+    self._redo: List[Edit | EditBatch] = []
+
+  def record(self, edit: Edit | EditBatch) -> None:
+    self._undo.append(edit)
+    self._redo.clear()
+
+  def undo(self) -> Edit | EditBatch | None:
+    if not self._undo:
+      return None
+    edit = self._undo.pop()
+    self._redo.append(edit)
+    return edit
+
+  def redo(self) -> Edit | EditBatch | None:
+    if not self._redo:
+      return None
+    edit = self._redo.pop()
+    self._undo.append(edit)
+    return edit
+
+
+@dataclass(slots=True)
+class NodeMeta:
+  kind: NodeKind
+  loaded: bool     # children populated
+  key: Union[str, int, None] = None   # last path segment; None for the root
+  # Value nodes: meta of the enclosing container (None for the root).
+  # RANGE/LOADING nodes: meta of the container they belong to.
+  up: NodeMeta | None = field(default=None, repr=False)
+  span: Tuple[int, int] | None = None   # RANGE nodes: child positions [start, stop)
+  parent: Any = field(default=None, repr=False)   # container holding the value, valid while gen matches the app's
+  gen: int = -1
+
+  @property
+  def owner(self) -> NodeMeta:
+    """The value node this meta stands for (itself unless RANGE/LOADING)."""
+    return self.up if self.kind is NodeKind.RANGE or self.kind is NodeKind.LOADING else self
+
+  @property
+  def path(self) -> Path:
+    # Rebuilt from parent links so nodes don't each hold a copy of their prefix.
+    m = self.owner
+    parts: List[Union[str, int]] = []
+    while m.up is not None:
+      parts.append(m.key)
+      m = m.up
+    parts.reverse()
+    return tuple(parts)
+
+
+# ---------- UI (imported on demand) ----------
+
+# Public names of the UI modules, so ``from json_navigator import JSONTreeApp``
+# keeps working without this module importing Textual itself.
+_UI_EXPORTS = {
+  "JSONTreeApp": "json_navigator_tui",
+  **dict.fromkeys((
+    "TextPager", "HexPager", "ValueViewer", "SaveScreen", "Base64ScanScreen", "BulkDecodeScreen",
+    "Base64DecodeScreen", "Base64Result", "OpsMenuScreen", "SearchScreen", "ScanScreen", "QueryScreen",
+    "match_snippet",
+  ), "json_navigator_screens"),
+}
+
+def __getattr__(name: str) -> Any:
+  module = _UI_EXPORTS.get(name)
+  if module is None:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  return getattr(importlib.import_module(module), name)
 
 
 # ---------- CLI ----------
 
+STREAM_THRESHOLD = 64 * 1024 * 1024  # --stream defaults on for files at least this big
+
+def _index_progress(done: int, total: int) -> None:
+  end = "\n" if done >= total else ""
+  print(f"\rIndexing… {done * 100 // max(total, 1)}%", end=end, file=sys.stderr, flush=True)
+
+def _fail(message: str) -> NoReturn:
+  print(f"Error: {message}", file=sys.stderr)
+  sys.exit(1)
+
+def _input_options(subcommand: bool = False) -> argparse.ArgumentParser:
+  """Parent parser of the options shared by the UI and the subcommands.
+
+  The subcommands' copies default to SUPPRESS, so they don't overwrite a
+  value given before the subcommand name (``--in x.json get a.b``).
+  """
+  def default(value: Any) -> Any:
+    return argparse.SUPPRESS if subcommand else value
+
+  parser = argparse.ArgumentParser(add_help=False)
+  parser.add_argument(
+    "--in", dest="inpath", default=default(None),
+    help="Path to JSON file, optionally gzip/bz2/xz/zstd-compressed. If omitted, reads JSON from stdin.",
+  )
+  parser.add_argument(
+    "--lazy", action="store_true", default=default(False),
+    help="Memory-map --in and index container offsets; values are decoded only when expanded. "
+         "Gzip input is read through a seek-point index; other compressed input is inflated to a temp file.",
+  )
+  parser.add_argument(
+    "--parser", choices=("auto", *PARSERS), default=default("auto"),
+    help="JSON parser backend; auto uses the fastest installed of " + ", ".join(PARSERS) + " (default: auto).",
+  )
+  parser.add_argument(
+    "--ndjson", action=argparse.BooleanOptionalAction, default=default(None),
+    help="Read the input as JSON Lines: the root is a virtual array of records, each parsed when first "
+         "opened, and saving writes JSON Lines (default: on for .ndjson/.jsonl files).",
+  )
+  parser.add_argument(
+    "--indent", type=int, default=default(2),
+    help="Indentation of saved and printed JSON, including values --lazy never opened; "
+         "0 writes compact output (default: 2). JSON Lines output is always one record per line.",
+  )
+  return parser
+
+def _open_lazy(args: argparse.Namespace, parser: argparse.ArgumentParser, ndjson: bool,
+               progress: Callable[[int, int], None] | None) -> LazyDocument | NdjsonDocument:
+  """The --lazy or JSON Lines document for ``args``; exits on unusable input."""
+  if args.lazy and not ndjson and (not args.inpath or not os.path.isfile(args.inpath)):
+    parser.error("--lazy needs --in pointing to a regular file")
+  try:
+    if not ndjson:
+      return LazyDocument.open(args.inpath, progress=progress, parser=args.parser)
+    if args.inpath:
+      return NdjsonDocument.open(args.inpath, progress=progress, parser=args.parser)
+    return NdjsonDocument(stdin_source(), parser=args.parser)
+  except ValueError as e:
+    _fail(f"invalid JSON: {e}")
+  except OSError as e:
+    _fail(f"cannot read input: {e}")
+
+def _read_whole(args: argparse.Namespace) -> JSONType:
+  try:
+    return read_json_from_args_or_stdin(args.inpath, args.parser)
+  except ValueError as e:
+    _fail(f"invalid JSON: {e}")
+  except OSError as e:
+    _fail(f"cannot read input: {e}")
+
+# Subcommands run without the UI: one parse (or a lazy index), output streamed to stdout.
+
+def _parse_path_arg(text: str) -> Path:
+  try:
+    return parse_path(text)
+  except QueryError as e:
+    _fail(f"bad path: {e}")
+
+def _lookup(data: JSONType, path: Path) -> Any:
+  """The value at ``path``; exits if there is none.
+
+  Unlike get_by_path this never indexes into strings and never reads a
+  dict key from an index, so ``a[0]`` on an object is reported as missing.
+  """
+  cur: Any = data
+  for i, key in enumerate(path):
+    kind = kind_of(cur)
+    if kind is NodeKind.DICT and isinstance(key, str) and key in cur:
+      cur = cur[key]
+    elif kind is NodeKind.LIST and isinstance(key, int) and -len(cur) <= key < len(cur):
+      cur = cur[key]
+    else:
+      _fail(f"no value at {path_to_str(path[:i + 1])}")
+  return cur
+
+def _write_json(out: IO[bytes], value: Any, indent: int | None) -> None:
+  """Stream ``value`` to ``out`` as JSON; iter_json_bytes ends it with a newline."""
+  for chunk in iter_json_bytes(value, indent):
+    out.write(chunk)
+
+def _cmd_get(data: JSONType, args: argparse.Namespace, out: IO[bytes]) -> None:
+  value = _lookup(data, _parse_path_arg(args.path))
+  if args.raw and isinstance(value, str):
+    out.write(value.encode("utf-8") + b"\n")
+  else:
+    _write_json(out, value, args.indent or None)
+
+def _cmd_keys(data: JSONType, args: argparse.Namespace, out: IO[bytes]) -> None:
+  path = _parse_path_arg(args.path)
+  value = _lookup(data, path)
+  kind = kind_of(value)
+  if kind is NodeKind.DICT:
+    keys: Any = KeyOrder(getattr(args, "key_order", args.sort)).keys(value)
+  elif kind is NodeKind.LIST:
+    keys = range(len(value))
+  else:
+    _fail(f"{path_to_str(path)} is not an object or array")
+  for key in keys:
+    out.write(f"{key}\n".encode("utf-8"))
+
+def _cmd_set(data: JSONType, args: argparse.Namespace, out: IO[bytes]) -> None:
+  path = _parse_path_arg(args.path)
+  if not path:
+    _fail("refusing to overwrite the root; give a path below $")
+  if args.string:
+    value: Any = args.value
+  else:
+    try:
+      value = json.loads(args.value)
+    except ValueError as e:
+      _fail(f"VALUE is not JSON ({e}); pass --string to set it as a plain string")
+  # Objects may gain a member; array elements and anything else must exist already.
+  if not (kind_of(_lookup(data, path[:-1])) is NodeKind.DICT and isinstance(path[-1], str)):
+    _lookup(data, path)
+  set_by_path(data, path, value)
+  indent = args.indent or None
+  if getattr(args, "out", None):
+    try:
+      save_json(data, args.out, indent, lines=args.ndjson)
+    except OSError as e:
+      _fail(f"cannot write {args.out}: {e}")
+  elif args.ndjson:
+    for chunk in iter_ndjson_bytes(data):
+      out.write(chunk)
+  else:
+    _write_json(out, data, indent)
+
+def _cmd_query(data: JSONType, args: argparse.Namespace, out: IO[bytes]) -> None:
+  try:
+    plan = compile_query(args.expr)
+  except QueryError as e:
+    _fail(f"bad query: {e}")
+  for path, value in itertools.islice(plan.run(data), args.limit):
+    if args.paths:
+      out.write(f"{path_to_str(path)}\t".encode("utf-8"))
+    _write_json(out, value, None)
+
+def _add_commands(parser: argparse.ArgumentParser) -> None:
+  commands = parser.add_subparsers(
+    dest="command", metavar="COMMAND",
+    help="Run one command without the UI and exit (default: open the navigator).",
+  )
+  shared = [_input_options(subcommand=True)]
+  path_help = "Path such as $.items[0].name, items.[0].name or $['odd key'] (default: $, the root)."
+
+  get = commands.add_parser("get", parents=shared, help="Print the value at a path as JSON.")
+  get.add_argument("path", nargs="?", default="$", help=path_help)
+  get.add_argument("--raw", action="store_true", help="Print a string value as is, without JSON quoting.")
+  get.set_defaults(run=_cmd_get)
+
+  keys = commands.add_parser("keys", parents=shared, help="List the keys of an object (or indices of an array).")
+  keys.add_argument("path", nargs="?", default="$", help=path_help)
+  keys.add_argument(
+    "--sort", dest="key_order", choices=KeyOrder.MODES, default=argparse.SUPPRESS,
+    help="Order of object keys (default: lexicographic, like the tree).",
+  )
+  keys.set_defaults(run=_cmd_keys)
+
+  set_ = commands.add_parser(
+    "set", parents=shared,
+    help="Replace or add the value at a path and write the document to stdout, or to --out.",
+  )
+  set_.add_argument("path", help="Path of the value to replace, or of a new object member.")
+  set_.add_argument("value", help="New value as JSON, e.g. 42, '\"text\"' or '{\"a\": 1}'.")
+  set_.add_argument("--string", action="store_true", help="Take VALUE as a plain string instead of JSON.")
+  set_.add_argument(
+    "--out", metavar="PATH", default=argparse.SUPPRESS,
+    help="Write the result to PATH atomically (may be the --in file) instead of stdout.",
+  )
+  set_.set_defaults(run=_cmd_set)
+
+  query = commands.add_parser(
+    "query", parents=shared,
+    help="Print every match of a query (same syntax as the p command), one compact JSON value per line.",
+  )
+  query.add_argument("expr", help="Query such as $.items[*].id or $..name.")
+  query.add_argument("--paths", action="store_true", help="Prefix each match with its path and a tab.")
+  query.add_argument("--limit", type=int, default=None, metavar="N", help="Stop after N matches.")
+  query.set_defaults(run=_cmd_query)
+
+def _run_command(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+  progress = _index_progress if sys.stderr.isatty() else None
+  doc = _open_lazy(args, parser, args.ndjson, progress) if args.ndjson or args.lazy else None
+  data = doc.root if doc is not None else _read_whole(args)
+  out = sys.stdout.buffer
+  try:
+    args.run(data, args, out)
+    out.flush()
+  except ValueError as e:   # a lazy document's unopened value turned out malformed
+    _fail(f"invalid JSON: {e}")
+  except BrokenPipeError:
+    # The reader went away (``| head``): stop quietly, and keep the interpreter
+    # from reporting the pipe again while flushing stdout at exit.
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(0)
+  finally:
+    if doc is not None:
+      doc.close()
+
 def main() -> None:
   parser = argparse.ArgumentParser(
-    description="Interactive JSON explorer/editor (Textual). Shows key tree with '(...)' leaves."
+    description="Interactive JSON explorer/editor (Textual). Shows key tree with '(...)' leaves. "
+                "The get, keys, set and query commands work on the same paths without the UI.",
+    parents=[_input_options()],
   )
-  parser.add_argument("--in", dest="inpath", help="Path to JSON file. If omitted, reads JSON from stdin.")
   parser.add_argument("--title", default="JSON", help="Root label/title for the tree.")
+  parser.add_argument(
+    "--stream", action=argparse.BooleanOptionalAction, default=None,
+    help="Show the top levels immediately and parse deeper parts in the background "
+         f"(default: on for files of {STREAM_THRESHOLD >> 20} MiB or more).",
+  )
+  parser.add_argument("--stream-depth", type=int, default=2, help="Container levels streamed member by member.")
+  parser.add_argument(
+    "--page-size", type=int, default=1000,
+    help="Children shown per expanded node; the rest are grouped into expandable ranges.",
+  )
+  parser.add_argument(
+    "--sort", choices=KeyOrder.MODES, default="lexicographic",
+    help="Order of object keys in the tree (default: lexicographic).",
+  )
+  parser.add_argument(
+    "--out", metavar="PATH",
+    help="File written by the save command (w). Defaults to the --in file.",
+  )
+  parser.add_argument(
+    "--display-budget", type=int, default=1 << 20, metavar="CHARS",
+    help="Characters of a value rendered at a time by Display; press m for more (default: 1 MiB).",
+  )
+  parser.add_argument(
+    "--display-lines", type=int, default=20_000, metavar="LINES",
+    help="Lines of a value rendered at a time by Display (default: 20000).",
+  )
+  parser.add_argument(
+    "--index", action="store_true",
+    help="Build the search index in the background at startup instead of on the first search.",
+  )
+  _add_commands(parser)
   args = parser.parse_args()
+  try:
+    get_parser(args.parser)
+  except ValueError as e:
+    parser.error(str(e))
+  if args.ndjson is None:
+    args.ndjson = bool(args.inpath and _NDJSON_NAME_RE.search(args.inpath))
+  if args.inpath:
+    # Report a missing or unreadable --in once, before anything stats or sniffs it.
+    try:
+      with open(args.inpath, "rb"):
+        pass
+    except OSError as e:
+      _fail(f"cannot read input: {e}")
+  if args.command:
+    _run_command(args, parser)
+    return
+
+  # Saving writes plain JSON, so it must not land on a compressed input by default.
+  compressed = bool(args.inpath) and os.path.isfile(args.inpath) and file_compression(args.inpath) is not None
+  save_path = args.out or (None if compressed else args.inpath)
+
+  options: Dict[str, Any] = dict(
+    root_label=args.title, page_size=args.page_size, key_order=args.sort, build_index=args.index,
+    save_path=save_path, indent=args.indent or None,
+    display_budget=(max(1, args.display_budget), max(1, args.display_lines)),
+  )
+  progress = _index_progress if sys.stderr.isatty() else None
+
+  doc: LazyDocument | NdjsonDocument | None = None
+  loader: StreamingLoader | None = None
+  if args.ndjson or args.lazy:
+    doc = _open_lazy(args, parser, args.ndjson, progress)
+    data = doc.root
+  else:
+    stream = args.stream
+    if stream is None:
+      stream = bool(args.inpath) and os.path.getsize(args.inpath) >= STREAM_THRESHOLD
+    if stream:
+      try:
+        loader = StreamingLoader(open_input(args.inpath), eager_depth=args.stream_depth)
+        data = loader.read_root()
+      except ValueError as e:
+        _fail(f"invalid JSON: {e}")
+      except OSError as e:
+        _fail(f"cannot read input: {e}")
+    else:
+      data = _read_whole(args)
 
-  data = read_json_from_args_or_stdin(args.inpath)
-  app = JSONTreeApp(data, root_label=args.title)
-  app.run()
+  # Textual loads only now: bad input fails before any UI setup.
+  from json_navigator_tui import JSONTreeApp
+  app = JSONTreeApp(data, loader=loader, ndjson=args.ndjson, **options)
+  try:
+    app.run()
+  finally:
+    if doc is not None:
+      doc.close()
 
 if __name__ == "__main__":
+  # The UI modules import this one by name; make that the running script, not a second copy.
+  sys.modules.setdefault("json_navigator", sys.modules[__name__])
   main()
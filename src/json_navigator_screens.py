@@ -0,0 +1,1068 @@
+# json_navigator_screens.py
+# Modal screens and pager widgets of the JSON navigator. JSONTreeApp imports
+# this module the first time it opens a screen, so startup doesn't pay for it.
+from __future__ import annotations
+
+import codecs
+import itertools
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from rich.cells import cell_len
+from rich.text import Text
+from textual.app import ComposeResult
+from textual.screen import ModalScreen
+from textual.binding import Binding
+from textual.containers import Container, Horizontal
+from textual.message import Message
+from textual.widgets import Label, Tree, OptionList, Button, Input, Static
+from textual.widgets.option_list import Option
+
+from json_navigator import (
+  B64, BRANCH_KINDS, Base64Bytes, HexRows, JSONType, LineIndex, Match, NodeKind, Path, QueryError, RowSource,
+  Span, Utf8Rows,
+  _SaveCancelled, _members, bulk_decode_base64, compile_query, format_throughput, get_by_path,
+  hexdump, iter_b64decode, kind_of, leaf_matcher, path_sort_key, path_to_str, save_json,
+  scan_base64, scan_leaves,
+)
+
+# ---------- Small modal-like helper apps ----------
+
+def match_snippet(text: str, span: Span, before: int = 20, width: int = 60) -> Text:
+  """One-line excerpt of ``text`` around ``span`` with the match highlighted."""
+  a, b = span
+  lo = max(0, a - before)
+  hi = max(b, min(len(text), lo + width))
+  excerpt = Text("…" if lo else "")
+  excerpt.append(text[lo:a].replace("\n", " "))
+  excerpt.append(text[a:b].replace("\n", " "), style="reverse")
+  excerpt.append(text[b:hi].replace("\n", " ") + ("…" if hi < len(text) else ""))
+  return excerpt
+
+
+class TextPager(Static):
+  """Shows one screenful of a long text, formatting only the visible rows."""
+  can_focus = True
+
+  BINDINGS = [
+    Binding("up", "rows(-1)", "Up", show=False),
+    Binding("down", "rows(1)", "Down", show=False),
+    Binding("pageup", "pages(-1)", "Page up", show=False),
+    Binding("pagedown", "pages(1)", "Page down", show=False),
+    Binding("home", "seek_row(0)", "Top", show=False),
+    Binding("end", "end", "End", show=False),
+  ]
+
+  GOTO_HINT = "go to: line number, @offset or NN%  (g)"
+  UNIT = "chars"   # what offsets count
+
+  class Moved(Message):
+    """Posted whenever the visible window changes."""
+
+  def __init__(self, text: str, **kwargs: Any) -> None:
+    super().__init__("", **kwargs)
+    self.text = text
+    self.index: RowSource | None = None
+    self.top = 0   # first visible display row
+
+  def _page(self) -> int:
+    return max(1, self.size.height)
+
+  def _length(self) -> int:
+    return len(self.text)
+
+  def _new_index(self, width: int) -> RowSource:
+    return LineIndex(self.text, width, cell_len)   # width is in cells, not characters
+
+  def _ensure_index(self) -> RowSource:
+    width = max(1, self.size.width)
+    if self.index is None or self.index.width != width:
+      offset = self.index.offset_of(self.top) if self.index is not None else 0
+      self.index = self._new_index(width)
+      self.top = self.index.row_of(offset)
+    return self.index
+
+  def show(self) -> None:
+    index = self._ensure_index()
+    rows = index.rows(self.top, self.top + self._page())
+    self.update(Text("\n".join(rows), no_wrap=True, overflow="crop"))
+    self.post_message(self.Moved())
+
+  def seek_row(self, row: int) -> None:
+    index = self._ensure_index()
+    row = max(0, row)
+    if not index.has_row(row):
+      row = index.known_rows() - 1
+    self.top = row
+    self.show()
+
+  def seek_offset(self, offset: int) -> None:
+    self.seek_row(self._ensure_index().row_of(max(0, offset)))
+
+  def append(self, text: str) -> None:
+    """Extend the text, keeping the current position."""
+    self.text += text
+    if isinstance(self.index, LineIndex):
+      self.index.text = self.text
+      self.index.complete = False
+    self.show()
+
+  def goto(self, target: str) -> None:
+    """Seek to "N" (line), "@N" (offset) or "N%"; raises ValueError otherwise."""
+    target = target.strip().replace(",", "").replace("_", "")
+    if target.startswith("@"):
+      self.seek_offset(int(target[1:]))
+    elif target.endswith("%"):
+      self.seek_offset(int(self._length() * float(target[:-1]) / 100))
+    else:
+      index = self._ensure_index()
+      assert isinstance(index, LineIndex)
+      self.seek_offset(index.line_offset(int(target)))
+
+  def describe(self) -> str:
+    index = self._ensure_index()
+    bottom = min(self.top + self._page(), index.known_rows())
+    total = f"{index.known_rows():,}" if index.complete else f"{index.known_rows():,}+"
+    return (f"rows {self.top + 1:,}–{bottom:,} of {total}  ·  "
+            f"offset {index.offset_of(self.top):,} of {self._length():,} {self.UNIT}")
+
+  def action_rows(self, n: int) -> None:
+    self.seek_row(self.top + n)
+
+  def action_pages(self, n: int) -> None:
+    self.seek_row(self.top + n * self._page())
+
+  def action_seek_row(self, row: int) -> None:
+    self.seek_row(row)
+
+  def action_end(self) -> None:
+    self.seek_row(self._ensure_index().last_row() - self._page() + 1)
+
+  def on_mouse_scroll_down(self, event: Any) -> None:
+    self.seek_row(self.top + 3)
+
+  def on_mouse_scroll_up(self, event: Any) -> None:
+    self.seek_row(self.top - 3)
+
+  def on_mount(self) -> None:
+    self.call_after_refresh(self.show)
+
+  def on_resize(self, event: Any) -> None:
+    self.show()
+
+
+class Utf8Pager(TextPager):
+  """TextPager for UTF-8 text held as bytes (e.g. a Base64Bytes view); offsets are in bytes."""
+
+  GOTO_HINT = "go to: line number, @byte offset or NN%  (g)"
+  UNIT = "bytes"
+
+  def __init__(self, data: bytes | Base64Bytes, **kwargs: Any) -> None:
+    super().__init__("", **kwargs)
+    self.data = data
+
+  def _length(self) -> int:
+    return len(self.data)
+
+  def _new_index(self, width: int) -> RowSource:
+    return Utf8Rows(self.data, width, cell_len)
+
+
+class HexPager(TextPager):
+  """Hex dump of a bytes buffer; only the visible rows are ever formatted."""
+
+  GOTO_HINT = "go to: offset (0x… or decimal) or NN%  (g)"
+
+  def __init__(self, data: bytes | Base64Bytes, **kwargs: Any) -> None:
+    super().__init__("", **kwargs)
+    self.data = data
+
+  def _ensure_index(self) -> RowSource:
+    if self.index is None:
+      self.index = HexRows(self.data)
+    return self.index
+
+  def goto(self, target: str) -> None:
+    """Seek to a byte offset ("0x1f0", "496", "@496") or "N%"; raises ValueError otherwise."""
+    target = target.strip().replace(",", "").replace("_", "").lstrip("@")
+    if target.endswith("%"):
+      self.seek_offset(int(len(self.data) * float(target[:-1]) / 100))
+    else:
+      self.seek_offset(int(target, 0))
+
+  def describe(self) -> str:
+    index = self._ensure_index()
+    offset = index.offset_of(self.top)
+    return f"offset 0x{offset:08x} ({offset:,}) of {len(self.data):,} bytes"
+
+
+class ValueViewer(ModalScreen[None]):
+  """Modal screen for showing text content, paged so that huge values open instantly.
+
+  ``content`` may also be an iterator of text fragments (see iter_pretty):
+  only ``budget_chars`` characters / ``budget_lines`` lines of it are drawn
+  at first, and "More" (m) pulls in the next batch.
+  """
+  CSS = """
+  Screen { align: center middle; }
+  .modal {
+    width: 90%;
+    height: 80%;
+    border: round $accent;
+    padding: 1 2;
+    background: $panel;
+  }
+  .title { padding: 0 1; text-style: bold; }
+  .viewer { height: 1fr; margin-top: 1; border: round $surface; }
+  .buttons { height: auto; padding-top: 1; }
+  .ml2 { margin-left: 2; }
+  #goto { width: 1fr; }
+  """
+
+  def __init__(self, title: str, content: str | Iterator[str], budget_chars: int = 1 << 20,
+               budget_lines: int = 20_000) -> None:
+    super().__init__()
+    self._title = title
+    self._budget = (budget_chars, budget_lines)
+    self._rest: Iterator[str] | None = None   # unrendered fragments
+    if isinstance(content, str):
+      self._content = content
+    else:
+      self._rest = iter(content)
+      self._content = self._take()
+
+  def _take(self) -> str:
+    """Next budget's worth of fragments; clears ``_rest`` once it runs dry."""
+    max_chars, max_lines = self._budget
+    parts: List[str] = []
+    chars = lines = 0
+    for fragment in self._rest or ():
+      parts.append(fragment)
+      chars += len(fragment)
+      lines += fragment.count("\n")
+      if chars >= max_chars or lines >= max_lines:
+        break
+    else:
+      self._rest = None
+    if self._rest is not None:
+      peek = next(self._rest, None)
+      self._rest = None if peek is None else itertools.chain((peek,), self._rest)
+    return "".join(parts)
+
+  def compose(self) -> ComposeResult:
+    more = Button("More (m)", id="more", classes="ml2")
+    more.display = self._rest is not None
+    yield Container(
+      Label(self._title, classes="title"),
+      TextPager(self._content, classes="viewer"),
+      Label("", id="position"),
+      Horizontal(
+        Input(placeholder=TextPager.GOTO_HINT, id="goto"),
+        more,
+        Button("Close (Esc)", id="close", variant="primary", classes="ml2"),
+        classes="buttons",
+      ),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    self.set_focus(self.query_one(TextPager))
+
+  def on_text_pager_moved(self, event: TextPager.Moved) -> None:
+    text = self.query_one(TextPager).describe()
+    if self._rest is not None:
+      text += "  ·  more not rendered yet (m)"
+    self.query_one("#position", Label).update(text)
+
+  def action_more(self) -> None:
+    if self._rest is None:
+      return
+    pager = self.query_one(TextPager)
+    pager.append(self._take())
+    self._content = pager.text
+    if self._rest is None:
+      self.query_one("#more", Button).display = False
+      pager.post_message(TextPager.Moved())
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    pager = self.query_one(TextPager)
+    try:
+      pager.goto(event.value)
+    except ValueError:
+      self.query_one("#position", Label).update(f"Can't go to {event.value!r}")
+      return
+    self.set_focus(pager)
+
+  def on_button_pressed(self, event: Button.Pressed) -> None:
+    if event.button.id == "close":
+      self.dismiss(None)
+    elif event.button.id == "more":
+      self.action_more()
+
+  def action_goto(self) -> None:
+    self.set_focus(self.query_one("#goto", Input))
+
+  BINDINGS = [Binding("escape", "close", "Close"), Binding("g", "goto", "Go to"), Binding("m", "more", "More")]
+
+  def action_close(self) -> None:
+    self.dismiss(None)
+
+
+class SaveScreen(ModalScreen[bool]):
+  """Saves the document on a worker thread, showing progress; dismisses with True on success.
+
+  Being modal keeps the document from being edited mid-save. Escape cancels
+  a save in progress, leaving the target untouched.
+  """
+  CSS = """
+  Screen { align: center middle; }
+  .modal { width: 70%; height: auto; border: round $accent; padding: 1 2; background: $panel; }
+  .title { padding: 0 1; text-style: bold; }
+  .buttons { height: auto; padding-top: 1; }
+  """
+
+  def __init__(self, data: JSONType, path: str, indent: int | None, lines: bool = False) -> None:
+    super().__init__()
+    self._data = data
+    self._path = path
+    self._indent = indent
+    self._lines = lines
+    self._cancelled = threading.Event()
+    self._ok = False
+    self._done = False
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label(f"Saving to {self._path}", classes="title"),
+      Label("Starting…", id="status"),
+      Horizontal(
+        Button("Cancel (Esc)", id="close", variant="primary"),
+        classes="buttons",
+      ),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    app = self.app
+
+    def progress(written: int, elapsed: float) -> None:
+      app.call_from_thread(self._status, f"Written {format_throughput(written, elapsed)}")
+
+    def work() -> None:
+      try:
+        written, elapsed = save_json(self._data, self._path, self._indent, progress, self._cancelled,
+                                    self._lines)
+      except _SaveCancelled:
+        result = "Cancelled; the file was not changed."
+        ok = False
+      except Exception as e:
+        result = f"❌ Save failed: {e!r}"
+        ok = False
+      else:
+        result = f"✅ Saved {format_throughput(written, elapsed)}"
+        ok = True
+      app.call_from_thread(self._finish, result, ok)
+
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name="save", group="save", thread=True)
+
+  def _status(self, text: str) -> None:
+    if not self._done:
+      self.query_one("#status", Label).update(text)
+
+  def _finish(self, text: str, ok: bool) -> None:
+    self._done, self._ok = True, ok
+    self.query_one("#status", Label).update(text)
+    self.query_one("#close", Button).label = "Close (Esc)"
+
+  def on_button_pressed(self, event: Button.Pressed) -> None:
+    if event.button.id == "close":
+      self.action_close()
+
+  BINDINGS = [Binding("escape", "close", "Close")]
+
+  def action_close(self) -> None:
+    if self._done:
+      self.dismiss(self._ok)
+    else:
+      self._cancelled.set()
+      self._status("Cancelling…")
+
+
+class Base64ScanScreen(ModalScreen[Dict[Path, B64] | None]):
+  """Classifies every string leaf on a worker thread; dismisses with the non-plain kinds.
+
+  Being modal keeps the document from changing under the scan. Escape
+  cancels a running scan and dismisses with None.
+  """
+  CSS = SaveScreen.CSS
+
+  def __init__(self, data: JSONType) -> None:
+    super().__init__()
+    self._data = data
+    self._cancelled = threading.Event()
+    self._found: Dict[Path, B64] | None = None
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label("Find base64 strings", classes="title"),
+      Label("Scanning…", id="status"),
+      Horizontal(
+        Button("Cancel (Esc)", id="close", variant="primary"),
+        classes="buttons",
+      ),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    app, cancelled = self.app, self._cancelled
+    started = time.monotonic()
+
+    def progress(strings: int) -> None:
+      app.call_from_thread(self._status, f"Scanning… {strings:,} strings")
+
+    def work() -> None:
+      try:
+        result = scan_base64(self._data, cancelled, progress)
+      except Exception as e:
+        app.call_from_thread(self._status, f"❌ Scan failed: {e!r}")
+        return
+      if result is not None:
+        app.call_from_thread(self._finish, *result, time.monotonic() - started)
+
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name="base64-scan", group="base64-scan", thread=True)
+
+  def _status(self, text: str) -> None:
+    if self._found is None:
+      self.query_one("#status", Label).update(text)
+
+  def _finish(self, found: Dict[Path, B64], strings: int, elapsed: float) -> None:
+    counts: Dict[str, int] = {}
+    for kind in found.values():
+      counts[kind.label] = counts.get(kind.label, 0) + 1
+    detail = ", ".join(f"{n:,} {label}" for label, n in sorted(counts.items()))
+    self.query_one("#status", Label).update(
+      f"✅ {len(found):,} of {strings:,} strings are base64 ({elapsed:.1f}s)" + (f": {detail}" if detail else "")
+    )
+    self.query_one("#close", Button).label = "Close (Esc)"
+    self._found = found
+
+  def on_button_pressed(self, event: Button.Pressed) -> None:
+    if event.button.id == "close":
+      self.action_close()
+
+  BINDINGS = [Binding("escape", "close", "Close")]
+
+  def action_close(self) -> None:
+    self._cancelled.set()
+    self.dismiss(self._found)
+
+
+BulkDecodeResult = Tuple[List[Tuple[Path, Any]], List[Tuple[Path, str]]]   # (replacements, skipped with reason)
+
+class BulkDecodeScreen(ModalScreen[BulkDecodeResult | None]):
+  """Decodes every base64 leaf a query selects; dismisses with the replacements.
+
+  Matching and decoding run on a worker thread (decoding in a process pool
+  for large volumes, see bulk_decode_base64). Escape cancels and dismisses
+  with None; nothing is changed until the result is applied by the app.
+  """
+  CSS = SaveScreen.CSS
+
+  def __init__(self, data: JSONType) -> None:
+    super().__init__()
+    self._data = data
+    self._cancelled: threading.Event | None = None
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label("Decode and replace base64 leaves matching a query", classes="title"),
+      Input(placeholder="$.events[*].payload", id="query"),
+      Label("Enter runs; leaves that aren't base64 strings are skipped.", id="status"),
+      Horizontal(
+        Button("Cancel (Esc)", id="close", variant="primary"),
+        classes="buttons",
+      ),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    self.set_focus(self.query_one(Input))
+
+  def _status(self, text: str) -> None:
+    self.query_one("#status", Label).update(text)
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    if self._cancelled is not None:
+      return
+    try:
+      plan = compile_query(event.value.strip() or "$")
+    except QueryError as e:
+      self._status(f"Bad query: {e}")
+      return
+    event.input.disabled = True
+    self._status("Matching…")
+    cancelled = self._cancelled = threading.Event()
+    app, data = self.app, self._data
+
+    def work() -> None:
+      try:
+        targets: List[Tuple[Path, str]] = []
+        skipped: List[Tuple[Path, str]] = []
+        for path, value in plan.run(data):
+          if cancelled.is_set():
+            return
+          if isinstance(value, str):
+            targets.append((path, value))
+          else:
+            skipped.append((path, "not a string"))
+        total = len(targets)
+        app.call_from_thread(self._status, f"Decoding {total:,} leaves…")
+
+        def progress(done: int) -> None:
+          app.call_from_thread(self._status, f"Decoding… {done:,}/{total:,} leaves")
+
+        decoded = bulk_decode_base64([v for _, v in targets], cancelled, progress)
+      except Exception as e:
+        app.call_from_thread(self._status, f"❌ Failed: {e!r}")
+        return
+      if decoded is None:
+        return
+      replacements = []
+      for (path, _), (ok, value) in zip(targets, decoded):
+        if ok:
+          replacements.append((path, value))
+        else:
+          skipped.append((path, value))
+      skipped.sort(key=lambda item: path_sort_key(item[0]))
+      app.call_from_thread(self._finish, cancelled, (replacements, skipped))
+
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name="bulk-decode", group="bulk-decode", thread=True)
+
+  def _finish(self, cancelled: threading.Event, result: BulkDecodeResult) -> None:
+    if not cancelled.is_set():
+      self.dismiss(result)
+
+  def on_button_pressed(self, event: Button.Pressed) -> None:
+    if event.button.id == "close":
+      self.action_close()
+
+  BINDINGS = [Binding("escape", "close", "Close")]
+
+  def action_close(self) -> None:
+    if self._cancelled is not None:
+      self._cancelled.set()
+    self.dismiss(None)
+
+
+@dataclass
+class Base64Result:
+  decoded_text: str | None
+  decoded_bytes_preview: str | None
+  replacement_value: str | None
+
+
+class Base64DecodeScreen(ModalScreen[Base64Result | None]):
+  """Modal-like screen to preview Base64 decode and optionally replace leaf.
+
+  A first pass on a worker thread checks the whole value in chunks, with a
+  progress line (Esc cancels it), and measures the output. The pagers then
+  read the payload through a Base64Bytes view, so only the rows on screen
+  are ever decoded; the full value is decoded again only if the leaf is
+  replaced.
+  """
+  CSS = ValueViewer.CSS
+
+  def __init__(self, title: str, src_value: str) -> None:
+    super().__init__()
+    self._title = title
+    self._src = src_value
+    # A standard-alphabet string can't contain either; this spares a full classification.
+    self._urlsafe = "-" in src_value or "_" in src_value
+    self._cancelled = threading.Event()
+    self._is_text = False
+
+  def compose(self) -> ComposeResult:
+    replace = Button("Replace leaf with decoded", id="replace", variant="success", classes="ml2")
+    replace.display = False
+    goto = Input(placeholder="go to  (g)", id="goto")
+    goto.display = False
+    yield Container(
+      Label(self._title, classes="title"),
+      Label("Decoding…", id="outcome"),
+      Label("", id="position"),
+      Horizontal(
+        goto,
+        replace,
+        Button("Close (Esc)", id="close", variant="primary", classes="ml2"),
+        classes="buttons",
+      ),
+      classes="modal",
+    )
+
+  def _run(self, work: Callable[[], None], name: str) -> None:
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name=name, group="base64", thread=True)
+
+  def _progress(self, verb: str) -> Callable[[int], None]:
+    app, total = self.app, max(1, len(self._src))
+    last = [0.0]
+
+    def report(done: int) -> None:
+      now = time.monotonic()
+      if now - last[0] >= 0.1:
+        last[0] = now
+        app.call_from_thread(self._status, f"{verb}… {done * 100 // total}%")
+    return report
+
+  def _status(self, text: str) -> None:
+    if not self._cancelled.is_set():
+      self.query_one("#outcome", Label).update(text)
+
+  def on_mount(self) -> None:
+    src, urlsafe, cancelled = self._src, self._urlsafe, self._cancelled
+    report = self._progress("Decoding")
+
+    def work() -> None:
+      size = 0
+      utf8 = codecs.getincrementaldecoder("utf-8")()
+      is_text = True
+      try:
+        for piece, done in iter_b64decode(src, urlsafe=urlsafe):
+          if cancelled.is_set():
+            return
+          if is_text:
+            try:
+              utf8.decode(piece)
+            except UnicodeDecodeError:
+              is_text = False
+          size += len(piece)
+          report(done)
+        if is_text:
+          try:
+            utf8.decode(b"", final=True)
+          except UnicodeDecodeError:
+            is_text = False
+      except Exception as e:
+        self.app.call_from_thread(self._show_error, e)
+        return
+      self.app.call_from_thread(self._show_preview, size, is_text)
+
+    self._run(work, "base64-preview")
+
+  def _show_error(self, e: Exception) -> None:
+    self.query_one("#outcome", Label).update(f"❌ Decode failed: {e!r}")
+
+  def _show_preview(self, size: int, is_text: bool) -> None:
+    if self._cancelled.is_set():
+      return
+    self._is_text = is_text
+    payload = Base64Bytes(self._src, self._urlsafe)
+    outcome = self.query_one("#outcome", Label)
+    goto = self.query_one("#goto", Input)
+    if is_text:
+      outcome.update(f"✅ Base64 decoded as UTF-8 text ({size:,} bytes):")
+      pager: TextPager = Utf8Pager(payload, classes="viewer")
+      goto.placeholder = Utf8Pager.GOTO_HINT
+    else:
+      outcome.update(f"✅ Base64 decoded as {size:,} bytes (hex):")
+      pager = HexPager(payload, classes="viewer")
+      goto.placeholder = HexPager.GOTO_HINT
+    goto.display = True
+    self.query_one("#replace", Button).display = True
+    self.query_one(".modal").mount(pager, before=self.query_one("#position"))
+    self.set_focus(pager)
+
+  def _replace(self) -> None:
+    """Decode the whole value off-thread, then dismiss with the replacement."""
+    self.query_one("#replace", Button).display = False
+    src, urlsafe, cancelled, is_text = self._src, self._urlsafe, self._cancelled, self._is_text
+    report = self._progress("Decoding for replacement")
+
+    def work() -> None:
+      out = bytearray()
+      try:
+        for piece, done in iter_b64decode(src, urlsafe=urlsafe):
+          if cancelled.is_set():
+            return
+          out += piece
+          report(done)
+        text = out.decode("utf-8") if is_text else None
+        repl = text if text is not None else out.decode("latin-1", errors="ignore")
+      except Exception as e:
+        self.app.call_from_thread(self._show_error, e)
+        return
+      preview = None if is_text else hexdump(bytes(out[:8192]))
+      del out
+      self.app.call_from_thread(self._finish_replace, Base64Result(text, preview, repl))
+
+    self._run(work, "base64-replace")
+
+  def _finish_replace(self, result: Base64Result) -> None:
+    if not self._cancelled.is_set():
+      self.dismiss(result)
+
+  def on_text_pager_moved(self, event: TextPager.Moved) -> None:
+    self.query_one("#position", Label).update(self.query_one(TextPager).describe())
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    pager = self.query_one(TextPager)
+    try:
+      pager.goto(event.value)
+    except ValueError:
+      self.query_one("#position", Label).update(f"Can't go to {event.value!r}")
+      return
+    self.set_focus(pager)
+
+  def action_goto(self) -> None:
+    goto = self.query_one("#goto", Input)
+    if goto.display:
+      self.set_focus(goto)
+
+  def on_button_pressed(self, event: Button.Pressed) -> None:
+    if event.button.id == "replace":
+      self._replace()
+    elif event.button.id == "close":
+      self.action_close()
+
+  BINDINGS = [Binding("escape", "close", "Close"), Binding("g", "goto", "Go to")]
+
+  def action_close(self) -> None:
+    self._cancelled.set()
+    self.dismiss(None)
+
+
+class OpsMenuScreen(ModalScreen[str | None]):
+  """Operations menu for a leaf: dismisses with 'display' | 'b64' | 'edit' | None."""
+  CSS = """
+  Screen { align: center middle; }
+  .modal { width: 60%; border: round $accent; padding: 1 2; background: $panel; }
+  .title { padding: 0 1; text-style: bold; }
+  """
+
+  def __init__(self, for_path: Path) -> None:
+    super().__init__()
+    self._path = for_path
+
+  def compose(self) -> ComposeResult:
+    opts = OptionList(
+      Option("Display", id="display"),
+      Option("Base64 decode", id="b64"),
+      Option("Edit (in $EDITOR)", id="edit"),
+      Option("Cancel", id="cancel"),
+    )
+    yield Container(
+      Label(f"Operations for {path_to_str(self._path)}", classes="title"),
+      opts,
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    self.set_focus(self.query_one(OptionList))
+
+  def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+    opt = event.option.id or ""
+    self.dismiss(None if opt == "cancel" else opt)
+
+  BINDINGS = [Binding("escape", "cancel", "Cancel")]
+
+  def action_cancel(self) -> None:
+    self.dismiss(None)
+
+
+class SearchScreen(ModalScreen[Path | None]):
+  """Search keys and leaf values as you type; dismisses with the chosen path or None."""
+  CSS = """
+  Screen { align: center middle; }
+  .modal { width: 80%; height: 80%; border: round $accent; padding: 1 2; background: $panel; }
+  .title { padding: 0 1; text-style: bold; }
+  #results { height: 1fr; margin-top: 1; }
+  """
+
+  MAX_RESULTS = 500
+
+  def __init__(self, search: Callable[[str, int], Tuple[List[Path], int] | None]) -> None:
+    super().__init__()
+    self._search = search   # returns None while the index is still being built
+    self._paths: List[Path] = []
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label("Search keys and values", classes="title"),
+      Input(placeholder="words…  (last word matches as a prefix)", id="query"),
+      Label("", id="status"),
+      OptionList(id="results"),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    self.set_focus(self.query_one(Input))
+
+  def run_query(self) -> None:
+    status = self.query_one("#status", Label)
+    results = self.query_one(OptionList)
+    found = self._search(self.query_one(Input).value, self.MAX_RESULTS)
+    if found is None:
+      status.update("Indexing…")
+      return
+    self._paths, total = found
+    results.clear_options()
+    results.add_options([Option(Text(path_to_str(p)), id=str(i)) for i, p in enumerate(self._paths)])
+    shown = f" (showing first {len(self._paths)})" if total > len(self._paths) else ""
+    status.update(f"{total} match{'es' if total != 1 else ''}{shown}")
+
+  def on_input_changed(self, event: Input.Changed) -> None:
+    self.run_query()
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    if self._paths:
+      results = self.query_one(OptionList)
+      results.highlighted = 0
+      self.set_focus(results)
+
+  def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+    self.dismiss(self._paths[int(event.option.id or 0)])
+
+  BINDINGS = [Binding("escape", "cancel", "Cancel")]
+
+  def action_cancel(self) -> None:
+    self.dismiss(None)
+
+
+class ScanScreen(ModalScreen[Path | None]):
+  """Scan leaf values for a substring or /regex/, streaming matches in as they are found.
+
+  Dismisses with the chosen path or None. Changing the query cancels the
+  running scan and starts a new one.
+  """
+  CSS = """
+  Screen { align: center middle; }
+  .modal { width: 90%; height: 80%; border: round $accent; padding: 1 2; background: $panel; }
+  .title { padding: 0 1; text-style: bold; }
+  #results { height: 1fr; margin-top: 1; }
+  """
+
+  MAX_RESULTS = 1000
+  FLUSH_INTERVAL = 0.05   # seconds between result batches sent to the UI
+
+  def __init__(self, data: JSONType) -> None:
+    super().__init__()
+    self._data = data
+    self._paths: List[Path] = []
+    self._scan: threading.Event | None = None   # cancel flag of the running scan
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label("Find in values", classes="title"),
+      Input(placeholder="substring, or /regex/", id="query"),
+      Label("", id="status"),
+      OptionList(id="results"),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    self.set_focus(self.query_one(Input))
+
+  def on_unmount(self) -> None:
+    self._cancel_scan()
+
+  def _cancel_scan(self) -> None:
+    if self._scan is not None:
+      self._scan.set()
+      self._scan = None
+
+  def _start_scan(self, query: str) -> None:
+    self._cancel_scan()
+    self._paths = []
+    self.query_one(OptionList).clear_options()
+    status = self.query_one("#status", Label)
+    if not query:
+      status.update("")
+      return
+    try:
+      match = leaf_matcher(query)
+    except re.error as e:
+      status.update(f"Bad regex: {e}")
+      return
+    status.update("Scanning…")
+    cancelled = threading.Event()
+    self._scan = cancelled
+    data, limit, app = self._data, self.MAX_RESULTS, self.app
+
+    def work() -> None:
+      batch: List[Tuple[Path, Text]] = []
+      last = time.monotonic()
+      found, error = 0, None
+      try:
+        for path, text, span in scan_leaves(data, match, cancelled):
+          batch.append((path, match_snippet(text, span)))
+          found += 1
+          now = time.monotonic()
+          if found >= limit or now - last >= self.FLUSH_INTERVAL:
+            app.call_from_thread(self._add_hits, cancelled, batch, False, None)
+            batch, last = [], now
+            if found >= limit:
+              break
+      except Exception as e:   # e.g. the document changed under the walk
+        error = e
+      if not cancelled.is_set():
+        app.call_from_thread(self._add_hits, cancelled, batch, True, error)
+
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name="scan", group="scan", thread=True)
+
+  def _add_hits(self, cancelled: threading.Event, hits: List[Tuple[Path, Text]], done: bool,
+                error: Exception | None) -> None:
+    if cancelled is not self._scan:
+      return
+    results = self.query_one(OptionList)
+    base = len(self._paths)
+    results.add_options([
+      Option(Text(path_to_str(p) + "  ").append_text(snippet), id=str(base + i))
+      for i, (p, snippet) in enumerate(hits)
+    ])
+    self._paths.extend(p for p, _ in hits)
+    n = len(self._paths)
+    if error is not None:
+      text = f"Scan failed: {error!r}"
+    elif not done:
+      text = f"Scanning… {n} match{'es' if n != 1 else ''}"
+    elif n >= self.MAX_RESULTS:
+      text = f"First {n} matches"
+    else:
+      text = f"{n} match{'es' if n != 1 else ''}"
+    self.query_one("#status", Label).update(text)
+    if done:
+      self._scan = None
+
+  def on_input_changed(self, event: Input.Changed) -> None:
+    self._start_scan(event.value)
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    if self._paths:
+      results = self.query_one(OptionList)
+      results.highlighted = 0
+      self.set_focus(results)
+
+  def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
+    self.dismiss(self._paths[int(event.option.id or 0)])
+
+  BINDINGS = [Binding("escape", "cancel", "Cancel")]
+
+  def action_cancel(self) -> None:
+    self.dismiss(None)
+
+
+class QueryScreen(ModalScreen[Path | None]):
+  """Evaluate a JSONPath-like query into a virtual result tree; dismisses with a chosen path.
+
+  Nothing is copied: nodes hold paths, results are pulled from the lazy plan a
+  page at a time, and expanding a result lists its members on demand.
+  """
+  CSS = """
+  Screen { align: center middle; }
+  .modal { width: 90%; height: 80%; border: round $accent; padding: 1 2; background: $panel; }
+  .title { padding: 0 1; text-style: bold; }
+  #results { height: 1fr; margin-top: 1; }
+  """
+
+  PAGE = 500
+
+  def __init__(self, data: JSONType) -> None:
+    super().__init__()
+    self._data = data
+    self._count = 0
+
+  def compose(self) -> ComposeResult:
+    yield Container(
+      Label("Query (Enter to run; Enter on a result jumps, Space expands)", classes="title"),
+      Input(placeholder="$.items[*].id   $..name   $.a[?(@.n > 3)]   $.big[0:10]", id="query"),
+      Label("", id="status"),
+      Tree("results", id="results"),
+      classes="modal",
+    )
+
+  def on_mount(self) -> None:
+    tree = self.query_one(Tree)
+    tree.show_root = False
+    if hasattr(tree, "auto_expand"):
+      tree.auto_expand = False
+    self.set_focus(self.query_one(Input))
+
+  def on_input_submitted(self, event: Input.Submitted) -> None:
+    status = self.query_one("#status", Label)
+    tree = self.query_one(Tree)
+    tree.root.remove_children()
+    self._count = 0
+    try:
+      plan = compile_query(event.value.strip() or "$")
+    except QueryError as e:
+      status.update(f"Bad query: {e}")
+      return
+    self._add_page(tree.root, plan.run(self._data), True)
+    tree.root.expand()
+    if self._count:
+      self.set_focus(tree)
+
+  def _add_page(self, parent: Tree.Node, matches: Iterator[Match], top: bool) -> None:
+    """Add the next PAGE of ``matches`` under ``parent``, plus a "more" node if any remain."""
+    status = self.query_one("#status", Label)
+    try:
+      page = list(itertools.islice(matches, self.PAGE + 1))
+    except Exception as e:
+      status.update(f"Query failed: {e!r}")
+      return
+    for path, value in page[:self.PAGE]:
+      name = path_to_str(path) if top else (f"[{path[-1]}]" if isinstance(path[-1], int) else str(path[-1]))
+      leaf = kind_of(value) is NodeKind.LEAF
+      node = parent.add(Text(f"{name}: (...)" if leaf else f"{name}:"), data=("path", path, False))
+      node.allow_expand = not leaf
+    if len(page) > self.PAGE:
+      rest = itertools.chain(page[self.PAGE:], matches)
+      more = parent.add(Text("… more"), data=("more", rest, top))
+      more.allow_expand = False
+    if top:
+      self._count += min(len(page), self.PAGE)
+      suffix = "+" if len(page) > self.PAGE else ""
+      status.update(f"{self._count}{suffix} result{'s' if self._count != 1 or suffix else ''}")
+
+  # Tree messages bubble to the app, whose handlers expect NodeMeta data.
+  def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+    event.stop()
+    node = event.node
+    if node.data is None or node.data[0] != "path" or node.data[2]:
+      return
+    path = node.data[1]
+    node.data = ("path", path, True)
+    try:
+      value = get_by_path(self._data, path)
+    except (KeyError, IndexError, TypeError):
+      return
+    if kind_of(value) in BRANCH_KINDS:
+      self._add_page(node, (((*path, k), v) for k, v in _members(value)), False)
+
+  def on_tree_node_collapsed(self, event: Tree.NodeCollapsed) -> None:
+    event.stop()
+
+  def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+    node = event.node
+    event.stop()
+    if node.data is None:
+      return
+    if node.data[0] == "more":
+      _, rest, top = node.data
+      parent = node.parent
+      node.remove()
+      self._add_page(parent, rest, top)
+    else:
+      self.dismiss(node.data[1])
+
+  BINDINGS = [Binding("escape", "cancel", "Cancel")]
+
+  def action_cancel(self) -> None:
+    self.dismiss(None)
@@ -0,0 +1,841 @@
+# json_navigator_tui.py
+# The Textual app of the JSON navigator. json_navigator.main imports it once
+# the input is parsed; modal screens load from json_navigator_screens on first use.
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Tuple, Union
+
+from textual.app import App, ComposeResult
+from textual.binding import Binding
+from textual.containers import Container
+from textual.widgets import Header, Footer, Tree
+
+from json_navigator import (
+  B64, BRANCH_KINDS, _MISSING, Edit, EditBatch, EditHistory, JSONType, KeyOrder, LoadOp, NodeKind,
+  NodeMeta, Path, Pending, SearchIndex, StreamingLoader, apply_load_op, classify_base64, get_by_path,
+  is_leaf, iter_pretty, kind_of, open_in_editor, path_to_str, promote_decoded, set_by_path, walk_leaves,
+)
+
+if TYPE_CHECKING:
+  from json_navigator_screens import Base64Result, BulkDecodeResult
+
+
+def _screens() -> ModuleType:
+  """json_navigator_screens, imported the first time a screen is opened."""
+  import json_navigator_screens
+  return json_navigator_screens
+
+
+# ---------- Main App ----------
+
+class _ExpandJob:
+  """Background population of one node; cancelled when the node collapses or is rebuilt."""
+
+  def __init__(self, node: Tree.Node, label: str) -> None:
+    self.node = node
+    self.label = label   # label to restore when done
+    self.cancelled = threading.Event()
+
+
+
+class JSONTreeApp(App):
+  CSS = """
+  Screen { align: center middle; }
+  .title { padding: 0 1; text-style: bold; }
+  .modal {
+    width: 90%;
+    height: 80%;
+    border: round $accent;
+    padding: 1 2;
+    background: $panel;
+  }
+  .viewer { height: 1fr; margin-top: 1; border: round $surface; }
+  .buttons { height: auto; padding-top: 1; }
+  .ml2 { margin-left: 2; }
+  #body { width: 100%; height: 100%; padding: 0 1; }
+  """
+
+  BINDINGS = [
+    Binding("q", "quit", "Quit"),
+    Binding("e", "edit_selected", "Edit leaf"),
+    Binding("o", "ops_selected", "Leaf ops"),
+    Binding("d", "display_selected", "Display leaf"),
+    Binding("slash", "search", "Search"),
+    Binding("f", "scan", "Find in values"),
+    Binding("b", "base64_scan", "Find base64"),
+    Binding("B", "bulk_decode", "Bulk decode"),
+    Binding("p", "query", "Query"),
+    Binding("w", "save", "Save"),
+    Binding("u", "undo", "Undo"),
+    Binding("ctrl+r", "redo", "Redo"),
+  ]
+
+  # Containers with at least this many members are expanded on a worker thread.
+  BACKGROUND_THRESHOLD = 20_000
+  EXPAND_BATCH = 250   # nodes inserted per UI-thread hop
+  RANGE_KEY_CHARS = 24   # longest first/last key shown in a range node's label
+
+  def __init__(self, data: JSONType, root_label: str = "JSON", loader: StreamingLoader | None = None,
+               page_size: int = 1000, key_order: str = "lexicographic", build_index: bool = False,
+               save_path: str | None = None, indent: int | None = 2, undo_limit: int = 1000,
+               display_budget: Tuple[int, int] = (1 << 20, 20_000), ndjson: bool = False) -> None:
+    super().__init__()
+    self.data: JSONType = data
+    self.root_label = root_label
+    self.page_size = max(1, page_size)
+    self.key_order = KeyOrder(key_order)
+    self._expand_jobs: Dict[int, _ExpandJob] = {}   # id(NodeMeta) -> running job
+    self._loader = loader
+    self._loading: set[Path] = set()   # streamed containers still receiving members
+    # (container path, key) -> populated value node; siblings share the
+    # container path tuple. The root is stored under ().
+    self._node_index: Dict[Tuple[Any, ...], Tree.Node] = {}
+    self._generation = 0   # bumped whenever a value may have been replaced; invalidates NodeMeta.parent
+    self._search: SearchIndex | None = None   # built on first search (or at startup with build_index)
+    self._search_build: threading.Event | None = None   # cancel flag of the running build
+    self._build_index_on_mount = build_index
+    self.save_path = save_path
+    self.indent = indent
+    self.ndjson = ndjson   # the root is a JSON Lines record array; saves write JSON Lines
+    self.history = EditHistory(undo_limit)
+    self.display_budget = display_budget   # (characters, lines) rendered per step in the value viewer
+    self._b64: Dict[Path, B64] | None = None   # non-plain string leaves by path, once scanned
+
+  def compose(self) -> ComposeResult:
+    yield Header()
+    with Container(id="body"):
+      yield Tree(self.root_label, id="tree")
+    yield Footer()
+
+  def on_mount(self) -> None:
+    tree = self.query_one(Tree)
+    tree.show_root = True
+    root_meta = NodeMeta(kind_of(self.data), False)
+    tree.root.data = root_meta
+    self._node_index[()] = tree.root
+    tree.root.allow_expand = root_meta.kind in BRANCH_KINDS
+    tree.root.collapse()
+    self.set_focus(tree)
+    if self._loader is not None and not self._loader.done:
+      self._loading.add(())
+      tree.root.set_label(self._label_for((), self.data))
+      self._loader.start(self._on_load_ops)
+    elif self._build_index_on_mount:
+      self._start_search_build()
+
+  def on_unmount(self) -> None:
+    if self._loader is not None:
+      self._loader.cancel()
+    if self._search_build is not None:
+      self._search_build.set()
+
+  # --- labels ---
+  def _label_for(self, path: Path, value: Any) -> str:
+    if not path:
+      return f"{self.root_label} (loading…)" if () in self._loading else self.root_label
+    return self._child_label(path[:-1], path[-1], value)
+
+  def _child_label(self, base: Path, key: Union[str, int], value: Any) -> str:
+    name = f"[{key}]" if isinstance(key, int) else str(key)
+    if isinstance(value, Pending) or self._loading and (*base, key) in self._loading:
+      return f"{name}: (loading…)"
+    if is_leaf(value):
+      kind = self._b64.get((*base, key)) if self._b64 else None
+      return f"{name}: (...)  ⟨{kind.label}⟩" if kind else f"{name}: (...)"
+    return f"{name}:"
+
+  def _range_label(self, keys: Any, start: int, stop: int, is_dict: bool) -> str:
+    label = f"[{start}–{stop - 1}] …"
+    if is_dict:
+      label += f" {self._key_excerpt(keys[start])} … {self._key_excerpt(keys[stop - 1])}"
+    return label
+
+  def _key_excerpt(self, key: str) -> str:
+    n = self.RANGE_KEY_CHARS
+    return (key if len(key) <= n else key[:n - 1] + "…").replace("\n", " ")
+
+  # --- value access ---
+  def _value_of(self, meta: NodeMeta) -> Any:
+    """Value at ``meta.path``, in O(1) while the cached parent container is current."""
+    meta = meta.owner
+    if meta.up is None:
+      return self.data
+    if meta.gen == self._generation:
+      try:
+        return meta.parent[meta.key]
+      except (KeyError, IndexError, TypeError):
+        pass
+    meta.parent = self._value_of(meta.up)
+    meta.gen = self._generation
+    return meta.parent[meta.key]
+
+  def _set_value(self, path: Path, value: Any, record: bool = True) -> bool:
+    """Set a value through set_by_path; returns True if the key is new to its object.
+
+    The edit goes on the undo history unless ``record`` is False.
+    """
+    parent = get_by_path(self.data, path[:-1]) if path else None
+    added = kind_of(parent) is NodeKind.DICT and path[-1] not in parent
+    old = None if added or not path else parent[path[-1]]
+    set_by_path(self.data, path, value)
+    self._generation += 1
+    if added:
+      self.key_order.invalidate(parent)
+    if self._search is not None:
+      self._search.update(path, old, value, added)
+    self._update_base64_marks(path, old, value)
+    if record:
+      self.history.record(Edit(path, _MISSING if added else old, value))
+    return added
+
+  def _delete_value(self, path: Path) -> None:
+    """Remove an object member (undoing an edit that added it)."""
+    parent = get_by_path(self.data, path[:-1])
+    old = parent[path[-1]]
+    del parent[path[-1]]
+    self._generation += 1
+    self.key_order.invalidate(parent)
+    if self._search is not None:
+      self._search.remove(path, old)
+    self._update_base64_marks(path, old, None)
+
+  def _update_base64_marks(self, path: Path, old: Any, new: Any) -> None:
+    """Keep the base64 classifications in step with an edit at ``path``."""
+    marks = self._b64
+    if marks is None:
+      return
+    if path and is_leaf(old):
+      marks.pop(path, None)
+    else:
+      for p in [p for p in marks if p[:len(path)] == path]:
+        del marks[p]
+    for p, v in walk_leaves(new):
+      if isinstance(v, str):
+        kind = classify_base64(v)
+        if kind:
+          marks[(*path, *p)] = kind
+
+  # --- lazy children population ---
+  def _add_child_node(self, node: Tree.Node, base: Path, key: Union[str, int], value: Any, parent: Any = None) -> Tree.Node:
+    """Add the member ``key`` of the container at path ``base`` under ``node``."""
+    kind = kind_of(value)
+    meta = NodeMeta(kind, kind is NodeKind.LEAF, key, node.data.owner)
+    if parent is not None:
+      meta.parent, meta.gen = parent, self._generation
+    child = node.add(self._child_label(base, key, value), data=meta)
+    child.allow_expand = kind is not NodeKind.LEAF
+    self._node_index[(base, key)] = child
+    return child
+
+  def _remove_children(self, node: Tree.Node) -> None:
+    """Remove a node's children and drop them (and their subtrees) from the path index."""
+    self._cancel_expand_job(node)
+    stack: List[Tuple[Tree.Node, Path]] = [(node, node.data.path)]
+    while stack:
+      parent, base = stack.pop()
+      for child in parent.children:
+        meta: NodeMeta = child.data
+        if self._expand_jobs:
+          self._cancel_expand_job(child)
+        if meta.owner is meta:
+          if self._node_index.get((base, meta.key)) is child:
+            del self._node_index[(base, meta.key)]
+          if child.children:
+            stack.append((child, (*base, meta.key)))
+        elif child.children:
+          stack.append((child, base))
+    node.remove_children()
+
+  def _add_range_node(self, node: Tree.Node, start: int, stop: int, label: str) -> Tree.Node:
+    meta = NodeMeta(NodeKind.RANGE, False, up=node.data.owner, span=(start, stop))
+    child = node.add(label, data=meta)
+    child.allow_expand = True
+    return child
+
+  def _child_keys(self, value: Any, background: bool = False) -> Any:
+    """Display order of a container's members: sorted keys or list indices."""
+    if kind_of(value) is NodeKind.DICT:
+      return self.key_order.keys(value, background)
+    return range(len(value))
+
+  def _window_specs(self, meta: NodeMeta, value: Any, background: bool = False) -> List[Tuple[Any, ...]]:
+    """Children to show under a container or range node, without touching the tree.
+
+    Up to ``page_size`` real children (the first page of a container) become
+    ("child", key, value) specs; the remaining positions are covered by
+    ("range", start, stop, label) specs, nested so that no node ever gets more
+    than ``page_size`` range children. Safe to call off the UI thread.
+    """
+    keys = self._child_keys(value, background)
+    is_dict = kind_of(value) is NodeKind.DICT
+    if meta.kind is NodeKind.RANGE:
+      start, stop = meta.span[0], min(meta.span[1], len(keys))
+      head = False
+    else:
+      start, stop, head = 0, len(keys), True
+    page = self.page_size
+    specs: List[Tuple[Any, ...]] = []
+    if head or stop - start <= page:
+      first = min(stop, start + page)
+      for pos in range(start, first):
+        k = keys[pos]
+        specs.append(("child", k, value[k]))
+      start = first
+    if start < stop:
+      block = page
+      while (stop - start + block - 1) // block > page:
+        block *= page
+      for a in range(start, stop, block):
+        b = min(stop, a + block)
+        specs.append(("range", a, b, self._range_label(keys, a, b, is_dict)))
+    return specs
+
+  def _add_specs(self, node: Tree.Node, base: Path, value: Any, specs: List[Tuple[Any, ...]]) -> None:
+    for spec in specs:
+      if spec[0] == "child":
+        self._add_child_node(node, base, spec[1], spec[2], value)
+      else:
+        self._add_range_node(node, spec[1], spec[2], spec[3])
+
+  def _populate_children(self, node: Tree.Node) -> None:
+    meta: NodeMeta = node.data
+    value = self._value_of(meta)
+    self._remove_children(node)
+    kind = kind_of(value)
+    if kind in BRANCH_KINDS:
+      self._add_specs(node, meta.path, value, self._window_specs(meta, value))
+    elif kind is NodeKind.PENDING:
+      marker = node.add("(loading…)", data=NodeMeta(NodeKind.LOADING, True, up=meta))
+      marker.allow_expand = False
+    meta.loaded = True
+
+  # --- background expansion ---
+  def _wants_background(self, node: Tree.Node) -> bool:
+    meta: NodeMeta = node.data
+    if meta.owner.path in self._loading:
+      return False
+    value = self._value_of(meta)
+    return kind_of(value) in BRANCH_KINDS and len(value) >= self.BACKGROUND_THRESHOLD
+
+  def _run_in_thread(self, work: Callable[[], None], name: str, group: str = "expand") -> None:
+    if hasattr(self, "run_worker"):
+      self.run_worker(work, name=name, group=group, thread=True)
+    else:
+      threading.Thread(target=work, name=name, daemon=True).start()
+
+  def _populate_in_background(self, node: Tree.Node) -> None:
+    """Populate a large container off the UI thread, inserting children in batches.
+
+    Collapsing the node cancels the job and discards what was inserted.
+    """
+    meta: NodeMeta = node.data
+    value = self._value_of(meta)
+    base = meta.path
+    self._remove_children(node)
+    job = _ExpandJob(node, str(node.label))
+    self._expand_jobs[id(meta)] = job
+    meta.loaded = True
+    node.set_label(f"{job.label} (sorting…)" if kind_of(value) is NodeKind.DICT else f"{job.label} (loading…)")
+
+    def work() -> None:
+      try:
+        specs = self._window_specs(meta, value, background=True)
+        total = len(specs)
+        for i in range(0, total, self.EXPAND_BATCH):
+          if job.cancelled.is_set():
+            return
+          self.call_from_thread(self._insert_job_batch, job, base, value, specs[i:i + self.EXPAND_BATCH],
+                                min(total, i + self.EXPAND_BATCH), total)
+        if not job.cancelled.is_set():
+          self.call_from_thread(self._finish_expand_job, job, None)
+      except Exception as e:
+        if not job.cancelled.is_set():
+          try:
+            self.call_from_thread(self._finish_expand_job, job, e)
+          except Exception:
+            pass
+
+    self._run_in_thread(work, f"expand {path_to_str(base)}")
+
+  def _insert_job_batch(self, job: _ExpandJob, base: Path, value: Any, specs: List[Tuple[Any, ...]],
+                        done: int, total: int) -> None:
+    if job.cancelled.is_set():
+      return
+    self._add_specs(job.node, base, value, specs)
+    job.node.set_label(f"{job.label} (loading {done * 100 // max(total, 1)}%)")
+
+  def _finish_expand_job(self, job: _ExpandJob, error: Exception | None) -> None:
+    if job.cancelled.is_set():
+      return
+    meta: NodeMeta = job.node.data
+    self._expand_jobs.pop(id(meta), None)
+    job.node.set_label(job.label)
+    if error is not None:
+      self._remove_children(job.node)
+      meta.loaded = False
+      self.push_screen(_screens().ValueViewer("Error", f"Failed to expand {path_to_str(meta.path)}: {error!r}"))
+
+  def _cancel_expand_job(self, node: Tree.Node) -> bool:
+    job = self._expand_jobs.pop(id(node.data), None)
+    if job is None:
+      return False
+    job.cancelled.set()
+    node.set_label(job.label)
+    return True
+
+  def _append_child_node(self, node: Tree.Node, base: Path, key: Union[str, int], value: Any, pos: int,
+                         parent: Any) -> Tree.Node | None:
+    """Show a member appended at position ``pos`` under an already populated node."""
+    children = node.children
+    last = children[-1] if children else None
+    if last is None or (last.data.kind is not NodeKind.RANGE and len(children) < self.page_size):
+      return self._add_child_node(node, base, key, value, parent)
+    # Positions follow arrival order here; the node is repopulated once the
+    # container is complete.
+    span = last.data.span
+    if span is not None and span[1] == pos and span[1] - span[0] < self.page_size and not last.data.loaded:
+      last.data.span = (span[0], pos + 1)
+      last.set_label(self._range_label(None, span[0], pos + 1, False))
+    else:
+      self._add_range_node(node, pos, pos + 1, self._range_label(None, pos, pos + 1, False))
+    return None
+
+  def _refresh_node(self, node: Tree.Node) -> None:
+    """Re-read a node's value, updating its label/kind and any shown children."""
+    meta: NodeMeta = node.data
+    value = self._value_of(meta)
+    meta.kind = kind_of(value)
+    node.set_label(self._label_for(meta.path, value))
+    node.allow_expand = meta.kind is not NodeKind.LEAF
+    if meta.kind is NodeKind.LEAF:
+      self._remove_children(node)
+      meta.loaded = True
+    elif meta.loaded:
+      self._remove_children(node)
+      meta.loaded = False
+      if node.is_expanded:
+        self._populate_children(node)
+
+  def _expanded_nodes(self, node: Tree.Node) -> List[Tuple[Path, Tuple[int, int] | None]]:
+    expanded: List[Tuple[Path, Tuple[int, int] | None]] = []
+    stack: List[Tree.Node] = list(node.children)
+    while stack:
+      child = stack.pop()
+      if child.is_expanded:
+        expanded.append((child.data.path, child.data.span))
+        stack.extend(child.children)
+    return expanded
+
+  def _find_range_node(self, node: Tree.Node, span: Tuple[int, int]) -> Tree.Node | None:
+    stack: List[Tree.Node] = [c for c in node.children if c.data.kind is NodeKind.RANGE]
+    while stack:
+      child = stack.pop()
+      if child.data.span == span:
+        return child
+      stack.extend(c for c in child.children if c.data.kind is NodeKind.RANGE)
+    return None
+
+  def _repopulate(self, node: Tree.Node) -> None:
+    """Rebuild a node's children, keeping expanded descendants expanded."""
+    expanded = self._expanded_nodes(node)
+    self._populate_children(node)
+    # Containers before the ranges inside them, outer ranges before inner ones.
+    expanded.sort(key=lambda e: (len(e[0]), e[1] is not None, -(e[1][1] - e[1][0]) if e[1] else 0))
+    for path, span in expanded:
+      child = self._find_node_by_path(path)
+      if child is not None and span is not None:
+        child = self._find_range_node(child, span)
+      if child is not None and (child.data.kind in BRANCH_KINDS or child.data.kind is NodeKind.RANGE):
+        if not child.data.loaded:
+          self._populate_children(child)
+        child.expand()
+
+  # --- streaming ---
+  def _on_load_ops(self, ops: List[LoadOp]) -> None:
+    # Called on the loader thread; blocks until the batch is applied, which
+    # keeps the loader from racing ahead of the UI.
+    try:
+      self.call_from_thread(self._apply_load_ops, ops)
+    except Exception:
+      if self._loader is not None:
+        self._loader.cancel()
+
+  def _apply_load_ops(self, ops: List[LoadOp]) -> None:
+    find = self._find_node_by_path
+    self._generation += 1   # PENDING placeholders get replaced
+    for op in ops:
+      tag = op[0]
+      if tag == "open" or tag == "set":
+        _, parent_path, key, value = op
+        parent = get_by_path(self.data, parent_path)
+        existed = key in parent if isinstance(parent, dict) else key < len(parent)
+        apply_load_op(self.data, op)
+        if not existed and isinstance(parent, dict):
+          self.key_order.invalidate(parent)
+        path = (*parent_path, key)
+        if tag == "open":
+          self._loading.add(path)
+        parent_node = find(parent_path)
+        if parent_node is None or not parent_node.data.loaded:
+          continue
+        if existed:
+          child = find(path)
+          if child is not None:
+            self._refresh_node(child)
+          continue
+        self._append_child_node(parent_node, parent_path, key, value, len(parent) - 1, parent)
+      elif tag == "done":
+        path = op[1]
+        self._loading.discard(path)
+        if not path and self._build_index_on_mount:
+          self._start_search_build()
+        node = find(path)
+        if node is None:
+          continue
+        value = get_by_path(self.data, path) if path else self.data
+        node.set_label(self._label_for(path, value))
+        if node.data.loaded and (kind_of(value) is NodeKind.DICT or len(value) > self.page_size):
+          # Members were appended in document order and in flat pages;
+          # restore the configured order and nested ranges.
+          self._repopulate(node)
+      elif tag == "error":
+        self._loading.clear()
+        self.query_one(Tree).root.set_label(self.root_label)
+        self.push_screen(_screens().ValueViewer("Load error", f"Streaming load failed: {op[1]}"))
+
+  # --- events ---
+  def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+    node = event.node
+    meta: NodeMeta = node.data
+    if meta.kind is not NodeKind.LEAF and meta.kind is not NodeKind.LOADING and not meta.loaded:
+      if self._wants_background(node):
+        self._populate_in_background(node)
+      else:
+        self._populate_children(node)
+
+  def on_tree_node_collapsed(self, event: Tree.NodeCollapsed) -> None:
+    node = event.node
+    if self._cancel_expand_job(node):
+      self._remove_children(node)
+      node.data.loaded = False
+
+  def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+    node = event.node
+    meta: NodeMeta = node.data
+    if meta.kind is NodeKind.LEAF:
+      self.call_after_refresh(self._open_ops_for_node, node)
+      event.stop()
+    else:
+      node.toggle()
+
+  # --- actions ---
+  def _value_as_text(self, node: Tree.Node) -> Iterator[str]:
+    meta: NodeMeta = node.data
+    value = self._value_of(meta)
+    return iter_pretty(value)
+
+  def _open_ops_for_node(self, node: Tree.Node) -> None:
+    meta: NodeMeta = node.data
+    screen = _screens().OpsMenuScreen(meta.path)
+
+    def handle_choice(choice: str | None) -> None:
+      if choice == "display":
+        self._display_leaf(node)
+      elif choice == "b64":
+        self._b64_leaf(node)
+      elif choice == "edit":
+        self._edit_leaf(node)
+
+    self.push_screen(screen, callback=handle_choice)
+
+  def _display_leaf(self, node: Tree.Node) -> None:
+    meta: NodeMeta = node.data
+    val_text = self._value_as_text(node)
+    self.push_screen(_screens().ValueViewer(f"Display {path_to_str(meta.path)}", val_text, *self.display_budget))
+
+  def _b64_leaf(self, node: Tree.Node) -> None:
+    meta: NodeMeta = node.data
+    val = self._value_of(meta)
+    if not isinstance(val, str):
+      self.push_screen(_screens().ValueViewer("Base64 decode", "Leaf value is not a string."))
+      return
+    screen = _screens().Base64DecodeScreen(f"Base64 decode of {path_to_str(meta.path)}", val)
+
+    def handle_base64(result: Base64Result | None) -> None:
+      if result and result.replacement_value is not None:
+        replacement: Any = result.replacement_value
+        if result.decoded_text is not None:
+          replacement = promote_decoded(result.decoded_text)
+        try:
+          added = self._set_value(meta.path, replacement)
+        except Exception as e:
+          self.push_screen(_screens().ValueViewer("Error", f"Failed to replace value: {e!r}"))
+          return
+        self._refresh_tree_after_value_change(meta.path, added)
+
+    self.push_screen(screen, callback=handle_base64)
+
+  def _find_node_by_path(self, path: Path) -> Tree.Node | None:
+    return self._node_index.get((path[:-1], path[-1]) if path else ())
+
+  def _refresh_tree_after_value_change(self, path: Path, added: bool = False, removed: bool = False) -> None:
+    """Patch the tree after the value at ``path`` changed.
+
+    Only the node for ``path`` is touched: its label and kind are updated and,
+    if it was populated, its own children are rebuilt. Siblings and their
+    expansion state are left alone. ``added``/``removed`` mean the key was
+    added to or removed from its parent object, which then needs its children
+    re-laid out.
+    """
+    node = None if removed else self._find_node_by_path(path)
+    if node is None:
+      # Not materialized (collapsed parent or inside an unexpanded range).
+      parent_node = self._find_node_by_path(path[:-1]) if path and (added or removed) else None
+      if parent_node is not None and parent_node.data.loaded:
+        self._repopulate(parent_node)
+      return
+    self._refresh_node(node)
+    meta: NodeMeta = node.data
+    if meta.kind in BRANCH_KINDS:
+      if not meta.loaded:
+        self._populate_children(node)
+      node.expand()
+
+  def _refresh_tree_after_bulk_change(self, paths: List[Path]) -> None:
+    """Patch the tree once after many values were replaced in place.
+
+    Only nodes already in the tree are touched, found through the path index;
+    nothing gets expanded.
+    """
+    for path in paths:
+      node = self._find_node_by_path(path)
+      if node is not None:
+        self._refresh_node(node)
+
+  def _edit_leaf(self, node: Tree.Node) -> None:
+    meta: NodeMeta = node.data
+    old = self._value_of(meta)
+    initial = old if isinstance(old, str) else json.dumps(old, indent=2, ensure_ascii=False)
+    edited = open_in_editor(initial)
+    if edited is None:
+      return
+    if isinstance(old, str):
+      new_value: Any = edited
+    else:
+      try:
+        new_value = json.loads(edited)
+      except json.JSONDecodeError:
+        new_value = edited
+    try:
+      added = self._set_value(meta.path, new_value)
+    except Exception as e:
+      self.push_screen(_screens().ValueViewer("Error", f"Failed to set value: {e!r}"))
+      return
+    self._refresh_tree_after_value_change(meta.path, added)
+
+  # --- search ---
+  def _start_search_build(self) -> None:
+    """Build the search index on a worker thread; edits made meanwhile restart it."""
+    cancelled = threading.Event()
+    self._search_build = cancelled
+    gen = self._generation
+
+    def work() -> None:
+      try:
+        index = SearchIndex.build(self.data, cancelled)
+      except RuntimeError:   # a container changed size under the walk
+        index = None
+      if not cancelled.is_set():
+        try:
+          self.call_from_thread(self._finish_search_build, cancelled, index, gen)
+        except Exception:
+          pass
+
+    self._run_in_thread(work, "search-index", group="search")
+
+  def _finish_search_build(self, cancelled: threading.Event, index: SearchIndex | None, gen: int) -> None:
+    if cancelled is not self._search_build:
+      return
+    if index is None or gen != self._generation:
+      self._start_search_build()
+      return
+    self._search, self._search_build = index, None
+    screens = sys.modules.get("json_navigator_screens")   # no SearchScreen can be open before it loads
+    if screens is not None and isinstance(self.screen, screens.SearchScreen):
+      self.screen.run_query()
+
+  def _query_search(self, text: str, limit: int) -> Tuple[List[Path], int] | None:
+    return None if self._search is None else self._search.query(text, limit)
+
+  def _reveal_path(self, path: Path) -> Tree.Node | None:
+    """Expand the ancestors of ``path`` (through range nodes as needed) and return its node."""
+    node = self.query_one(Tree).root
+    for depth, key in enumerate(path):
+      meta: NodeMeta = node.data
+      if meta.kind not in BRANCH_KINDS:
+        return None
+      if not meta.loaded:
+        self._populate_children(node)
+      node.expand()
+      base = path[:depth]
+      child = self._node_index.get((base, key))
+      if child is None:
+        value = self._value_of(meta)
+        keys = self._child_keys(value)
+        try:
+          pos = key if isinstance(key, int) else keys.index(key)
+        except ValueError:
+          return None
+        holder = node
+        while child is None:
+          ranges = [c for c in holder.children
+                    if c.data.kind is NodeKind.RANGE and c.data.span[0] <= pos < c.data.span[1]]
+          if not ranges:
+            return None
+          holder = ranges[0]
+          if not holder.data.loaded:
+            self._populate_children(holder)
+          holder.expand()
+          child = self._node_index.get((base, key))
+      node = child
+    return node
+
+  def _jump_to_path(self, path: Path | None) -> None:
+    if path is None:
+      return
+    node = self._reveal_path(path)
+    if node is None:
+      return
+    tree = self.query_one(Tree)
+
+    def move() -> None:
+      if hasattr(tree, "move_cursor"):
+        tree.move_cursor(node)
+      else:
+        tree.cursor_line = getattr(node, "line", getattr(node, "_line", -1))
+        tree.scroll_to_node(node)
+
+    self.call_after_refresh(move)
+
+  def action_search(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Search", "Search is available once loading has finished."))
+      return
+    if self._search is None and self._search_build is None:
+      self._start_search_build()
+    self.push_screen(_screens().SearchScreen(self._query_search), callback=self._jump_to_path)
+
+  def action_scan(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Find in values", "Scanning is available once loading has finished."))
+      return
+    self.push_screen(_screens().ScanScreen(self.data), callback=self._jump_to_path)
+
+  def action_base64_scan(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Find base64", "Scanning is available once loading has finished."))
+      return
+    self.push_screen(_screens().Base64ScanScreen(self.data), callback=self._apply_base64_scan)
+
+  def _apply_base64_scan(self, found: Dict[Path, B64] | None) -> None:
+    """Adopt a finished scan and relabel the leaf nodes already in the tree."""
+    if found is None:
+      return
+    self._b64 = found
+    for at, node in list(self._node_index.items()):
+      meta: NodeMeta = node.data
+      if at and meta.kind is NodeKind.LEAF:   # the root () keeps its title
+        node.set_label(self._child_label(*at, self._value_of(meta)))
+
+  def action_bulk_decode(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Bulk decode", "Bulk decoding is available once loading has finished."))
+      return
+    self.push_screen(_screens().BulkDecodeScreen(self.data), callback=self._apply_bulk_decode)
+
+  def _apply_bulk_decode(self, result: BulkDecodeResult | None) -> None:
+    """Apply decoded replacements as one undoable step, then refresh the tree once."""
+    if result is None:
+      return
+    replacements, skipped = result
+    edits: List[Edit] = []
+    for path, value in replacements:
+      edits.append(Edit(path, get_by_path(self.data, path), value))
+      self._set_value(path, value, record=False)
+    if edits:
+      self.history.record(EditBatch(edits))
+      self._refresh_tree_after_bulk_change([e.path for e in edits])
+    if skipped:
+      lines = [f"Replaced {len(edits):,} leaves; skipped {len(skipped):,}:", ""]
+      lines += [f"{path_to_str(p)}: {reason}" for p, reason in skipped]
+      self.push_screen(_screens().ValueViewer("Bulk decode", "\n".join(lines)))
+
+  def action_query(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Query", "Queries are available once loading has finished."))
+      return
+    self.push_screen(_screens().QueryScreen(self.data), callback=self._jump_to_path)
+
+  def action_save(self) -> None:
+    if self._loader is not None and not self._loader.done:
+      self.push_screen(_screens().ValueViewer("Save", "Saving is available once loading has finished."))
+      return
+    if not self.save_path:
+      self.push_screen(_screens().ValueViewer("Save", "Nowhere to save: the input came from stdin or a compressed file. Start with --out PATH."))
+      return
+    self.push_screen(_screens().SaveScreen(self.data, self.save_path, self.indent, self.ndjson))
+
+  def action_undo(self) -> None:
+    edit = self.history.undo()
+    if edit is None:
+      self.bell()
+      return
+    if isinstance(edit, EditBatch):
+      for e in reversed(edit.edits):
+        self._set_value(e.path, e.old, record=False)
+      self._refresh_tree_after_bulk_change([e.path for e in edit.edits])
+    elif edit.old is _MISSING:
+      self._delete_value(edit.path)
+      self._refresh_tree_after_value_change(edit.path, removed=True)
+    else:
+      added = self._set_value(edit.path, edit.old, record=False)
+      self._refresh_tree_after_value_change(edit.path, added)
+
+  def action_redo(self) -> None:
+    edit = self.history.redo()
+    if edit is None:
+      self.bell()
+      return
+    if isinstance(edit, EditBatch):
+      for e in edit.edits:
+        self._set_value(e.path, e.new, record=False)
+      self._refresh_tree_after_bulk_change([e.path for e in edit.edits])
+      return
+    added = self._set_value(edit.path, edit.new, record=False)
+    self._refresh_tree_after_value_change(edit.path, added)
+
+  # shortcuts
+  def action_edit_selected(self) -> None:
+    tree = self.query_one(Tree)
+    node = tree.cursor_node or tree.root
+    meta: NodeMeta = node.data
+    if meta.kind is NodeKind.LEAF:
+      self._edit_leaf(node)
+
+  def action_display_selected(self) -> None:
+    tree = self.query_one(Tree)
+    node = tree.cursor_node or tree.root
+    meta: NodeMeta = node.data
+    if meta.kind is NodeKind.LEAF:
+      self._display_leaf(node)
+
+  def action_ops_selected(self) -> None:
+    tree = self.query_one(Tree)
+    node = tree.cursor_node or tree.root
+    meta: NodeMeta = node.data
+    if meta.kind is NodeKind.LEAF:
+      self._open_ops_for_node(node)
@@ -0,0 +1,43 @@
+# conftest.py
+# The modules live in src/ and aren't installed; make them importable, and
+# share the random document generator the round-trip tests compare against
+# the standard library with.
+from __future__ import annotations
+
+import os
+import random
+import sys
+from typing import Any, Callable
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Strings that trip up hand-written scanners and encoders.
+AWKWARD_STRINGS = ["", "a\"]}{[\\", "é ", "tab\there", "line\nbreak", " ", "😀", "\x00", "it's"]
+
+
+def random_json(rng: random.Random, depth: int = 0, max_depth: int = 5) -> Any:
+  r = rng.random()
+  if depth >= max_depth or r < 0.35:
+    return rng.choice([0, 1, -7, 2.5, -2.5e3, 1e300, True, False, None,
+                       "x" * rng.randint(0, 40), *AWKWARD_STRINGS])
+  if r < 0.65:
+    return [random_json(rng, depth + 1, max_depth) for _ in range(rng.randint(0, 6))]
+  return {f"k{rng.randint(0, 99)}{rng.choice(AWKWARD_STRINGS)}": random_json(rng, depth + 1, max_depth)
+          for _ in range(rng.randint(0, 6))}
+
+
+@pytest.fixture
+def make_doc() -> Callable[[int], Any]:
+  """Seeded random JSON documents, so a failure reproduces."""
+  return lambda seed: random_json(random.Random(seed))
+
+
+def plain(value: Any) -> Any:
+  """Lazy containers (and anything dict/list-like) as plain dicts and lists."""
+  if isinstance(value, (str, int, float)) or value is None:
+    return value
+  if hasattr(value, "keys"):
+    return {k: plain(value[k]) for k in value}
+  return [plain(v) for v in value]
@@ -0,0 +1,130 @@
+import base64
+import json
+import random
+import threading
+
+import pytest
+
+import json_navigator as jn
+from json_navigator import B64
+
+
+@pytest.mark.parametrize("s", [
+  "2024-01-01", "123e4567-e89b-12d3-a456-426614174000", "payment_method_type", "created_at",
+  "application_name", "foo-bar-baz", "my-service-name", "us-east-1a", "user_id_12",
+  "abcdefgh", "password", "deadbeefcafebabe", "0123456789abcdef0123456789abcdef", "short", "not base64!",
+  "abcdefghi",   # a length no encoder produces
+])
+def test_identifiers_and_words_are_plain(s):
+  assert jn.classify_base64(s) == B64(0)
+
+
+def b64(data: bytes, urlsafe: bool = False) -> str:
+  return (base64.urlsafe_b64encode if urlsafe else base64.b64encode)(data).decode("ascii")
+
+
+@pytest.mark.parametrize("s, kind", [
+  (b64(b"hello, world"), B64.BASE64 | B64.TEXT),
+  (b64(json.dumps({"a": [1, 2]}).encode()), B64.BASE64 | B64.TEXT | B64.JSON),
+  (b64(bytes(range(256))), B64.BASE64),
+  (b64(b"<<???>>>", urlsafe=True).rstrip("="), B64.BASE64 | B64.URLSAFE | B64.TEXT),
+  (b64(b"\xab\xed\xff\xc5\x9fK\x98\xfd\x1a\x07\xbc\x13", urlsafe=True), B64.BASE64 | B64.URLSAFE),
+])
+def test_payloads_are_detected(s, kind):
+  assert jn.classify_base64(s) == kind
+
+
+def test_random_bytes_are_detected():
+  rng = random.Random(0)
+  for _ in range(200):
+    data = rng.randbytes(rng.randrange(24, 300))
+    assert jn.classify_base64(b64(data)) & B64.BASE64
+    assert jn.classify_base64(b64(data, urlsafe=True).rstrip("=")) & B64.BASE64
+
+
+def test_long_strings_are_judged_by_their_prefix():
+  text = b64(b'{"rows": [' + b"1, " * 10_000 + b"2]}")
+  assert len(text) > jn.B64_PROBE
+  assert jn.classify_base64(text) == B64.BASE64 | B64.TEXT | B64.JSON
+
+
+def test_scan_reports_payloads_by_path(tmp_path):
+  data = {
+    "id": "123e4567-e89b-12d3-a456-426614174000",
+    "files": [{"name": "a.json", "body": b64(b'{"k": 1}')}, {"name": "b.bin", "body": b64(bytes(range(128, 192)))}],
+    "n": 7,
+  }
+  expected = {("files", 0, "body"): B64.BASE64 | B64.TEXT | B64.JSON, ("files", 1, "body"): B64.BASE64}
+  assert jn.scan_base64(data) == (expected, 5)
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(data))
+  lazy = jn.LazyDocument.open(str(path), min_span=1)
+  try:
+    assert jn.scan_base64(lazy.root) == (expected, 5)
+  finally:
+    lazy.close()
+
+
+def test_scan_progress_and_cancel():
+  data = ["x"] * 70_000
+  seen = []
+  assert jn.scan_base64(data, progress=seen.append) == ({}, 70_000)
+  assert seen == [65_536]
+  cancelled = threading.Event()
+  cancelled.set()
+  assert jn.scan_base64(data, cancelled) is None
+
+
+def test_decode_round_trip():
+  payload = {"a": "é", "b": [1, 2]}
+  assert jn.decode_base64_leaf(b64(json.dumps(payload).encode())) == payload
+  assert jn.decode_base64_leaf(b64("plain text".encode())) == "plain text"
+
+
+@pytest.mark.parametrize("urlsafe", [False, True])
+def test_base64_bytes_slices_match_full_decode(urlsafe):
+  rng = random.Random(1)
+  for n in (0, 1, 2, 3, 4, 5, 100, 1001):
+    data = rng.randbytes(n)
+    view = jn.Base64Bytes(b64(data, urlsafe).rstrip("=") if urlsafe else b64(data), urlsafe)
+    assert len(view) == n
+    for _ in range(40):
+      lo, hi = rng.randrange(n + 1), rng.randrange(n + 2)
+      assert view[lo:hi] == data[lo:hi]
+
+
+def bulk_values():
+  return [b64(json.dumps({"i": i}).encode()) for i in range(40)] + ["not base64!", b64(b"\xff\xfe")]
+
+
+def expected_bulk():
+  return [(True, {"i": i}) for i in range(40)] + [(False, None), (True, "\xff\xfe")]
+
+
+def check_bulk(out):
+  assert len(out) == 42
+  for (ok, value), (want_ok, want) in zip(out, expected_bulk()):
+    assert ok == want_ok
+    if ok:
+      assert value == want
+    else:
+      assert isinstance(value, str) and value
+
+
+def test_bulk_decode_in_process(monkeypatch):
+  monkeypatch.setattr(jn, "BULK_BATCH_CHARS", 100)
+  done = []
+  check_bulk(jn.bulk_decode_base64(bulk_values(), progress=done.append))
+  assert done == sorted(done) and done[-1] == 42 and len(done) > 1
+
+
+def test_bulk_decode_in_a_process_pool(monkeypatch):
+  monkeypatch.setattr(jn, "BULK_BATCH_CHARS", 200)
+  monkeypatch.setattr(jn, "BULK_PROCESS_MIN_CHARS", 0)
+  check_bulk(jn.bulk_decode_base64(bulk_values(), workers=2))
+
+
+def test_bulk_decode_cancelled():
+  cancelled = threading.Event()
+  cancelled.set()
+  assert jn.bulk_decode_base64(bulk_values(), cancelled) is None
@@ -0,0 +1,122 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", "json_navigator.py")
+
+DOC = {
+  "items": [{"name": "a", "n": 1}, {"name": "b c", "n": 2}],
+  "s": "line\nnext",
+  "z": {},
+  "a": {"x": 1},
+}
+
+
+def run(*args, stdin=b""):
+  """Run the script headless; returns (exit status, stdout, stderr)."""
+  proc = subprocess.run([sys.executable, SCRIPT, *args], input=stdin, capture_output=True, timeout=60)
+  return proc.returncode, proc.stdout.decode("utf-8"), proc.stderr.decode("utf-8")
+
+
+@pytest.fixture(params=["plain", "lazy"])
+def doc_args(request, tmp_path):
+  """--in arguments for DOC, read whole or through the lazy index."""
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(DOC, indent=1))
+  return ["--in", str(path)] + (["--lazy"] if request.param == "lazy" else [])
+
+
+def test_get(doc_args):
+  assert run("get", *doc_args, "items") == (0, json.dumps(DOC["items"], indent=2) + "\n", "")
+  assert run("get", *doc_args, "$.items[-1].name", "--raw") == (0, "b c\n", "")
+  assert run("get", *doc_args, "s", "--raw")[1] == "line\nnext\n"
+  assert run("get", *doc_args, "items.[1]", "--indent", "0")[1] == '{"name":"b c","n":2}\n'
+  assert json.loads(run("get", *doc_args)[1]) == DOC
+
+
+def test_options_may_come_before_the_command(doc_args):
+  assert run(*doc_args, "get", "a.x") == (0, "1\n", "")
+
+
+def test_stdin():
+  assert run("get", "[1]", stdin=b"[1, 2, 3]") == (0, "2\n", "")
+
+
+def test_keys(doc_args):
+  assert run("keys", *doc_args)[1] == "a\nitems\ns\nz\n"
+  assert run("keys", *doc_args, "--sort", "insertion")[1] == "items\ns\nz\na\n"
+  assert run("keys", *doc_args, "items")[1] == "0\n1\n"
+  assert run("keys", *doc_args, "z") == (0, "", "")
+
+
+def test_query(doc_args):
+  assert run("query", *doc_args, "$..name") == (0, '"a"\n"b c"\n', "")
+  assert run("query", *doc_args, "$..name", "--paths", "--limit", "1")[1] == 'items.[0].name\t"a"\n'
+  assert run("query", *doc_args, "items[?(@.n > 1)]")[1] == '{"name":"b c","n":2}\n'
+
+
+def test_set(doc_args):
+  status, out, _ = run("set", *doc_args, "items[0].n", "5")
+  assert status == 0
+  assert json.loads(out)["items"][0] == {"name": "a", "n": 5}
+  out = run("set", *doc_args, "z.new", "[1, {\"k\": null}]", "--indent", "0")[1]
+  assert json.loads(out)["z"] == {"new": [1, {"k": None}]}
+  assert json.loads(run("set", *doc_args, "a.x", "not json", "--string")[1])["a"] == {"x": "not json"}
+
+
+def test_set_out_rewrites_the_input(doc_args):
+  path = doc_args[1]
+  assert run("set", *doc_args, "a.x", "2", "--out", path) == (0, "", "")
+  with open(path) as f:
+    assert json.load(f) == {**DOC, "a": {"x": 2}}
+
+
+def test_ndjson(tmp_path):
+  path = tmp_path / "rows.jsonl"
+  path.write_text('{"id": 1}\n{"id": 2}\n')
+  assert run("get", "--in", str(path), "[1].id") == (0, "2\n", "")
+  assert run("query", "--in", str(path), "$[*].id")[1] == "1\n2\n"
+  assert run("set", "--in", str(path), "[0].id", "7")[1] == '{"id":7}\n{"id": 2}\n'
+
+
+@pytest.mark.parametrize("args, message", [
+  (["get", "nope"], "no value at nope"),
+  (["get", "items[0][0]"], "no value at items.[0].[0]"),
+  (["get", "items[*]"], "bad path"),
+  (["keys", "s"], "s is not an object or array"),
+  (["query", "$["], "bad query"),
+  (["set", "items[5]", "1"], "no value at items.[5]"),
+  (["set", "$", "1"], "refusing to overwrite the root"),
+  (["set", "a.x", "not json"], "VALUE is not JSON"),
+])
+def test_errors(doc_args, args, message):
+  status, out, err = run(args[0], *doc_args, *args[1:])
+  assert (status, out) == (1, "")
+  assert err.startswith("Error: ") and message in err
+
+
+def test_malformed_input():
+  status, _, err = run("get", stdin=b'{"a": tru}')
+  assert status == 1 and err.startswith("Error: ")
+
+
+def test_textual_is_not_imported(doc_args):
+  proc = subprocess.run([sys.executable, "-X", "importtime", SCRIPT, "get", *doc_args, "a"],
+                        capture_output=True, timeout=60)
+  assert proc.returncode == 0
+  assert b"textual" not in proc.stderr
+
+
+def test_closed_pipe_exits_quietly(tmp_path):
+  # Like ``| head -c 1``: the reader goes away after the first bytes.
+  path = tmp_path / "big.json"
+  path.write_text(json.dumps(list(range(500_000))))
+  proc = subprocess.Popen([sys.executable, SCRIPT, "query", "--in", str(path), "$[*]"],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+  assert proc.stdout.read(1) == b"0"
+  proc.stdout.close()
+  assert proc.wait(timeout=60) == 0
+  assert proc.stderr.read() == b""
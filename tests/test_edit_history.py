@@ -0,0 +1,90 @@
+import copy
+import random
+
+import json_navigator as jn
+
+
+def edit(path, old, new):
+  return jn.Edit(path, old, new)
+
+
+def test_undo_and_redo_walk_the_stacks():
+  history = jn.EditHistory()
+  first, second = edit(("a",), 1, 2), edit(("a",), 2, 3)
+  history.record(first)
+  history.record(second)
+  assert history.undo() is second
+  assert history.undo() is first
+  assert history.undo() is None
+  assert history.redo() is first
+  assert history.redo() is second
+  assert history.redo() is None
+
+
+def test_recording_clears_redo():
+  history = jn.EditHistory()
+  history.record(edit(("a",), 1, 2))
+  history.undo()
+  history.record(edit(("b",), 1, 2))
+  assert history.redo() is None
+
+
+def test_limit_drops_the_oldest_edits():
+  history = jn.EditHistory(limit=3)
+  edits = [edit(("k",), i, i + 1) for i in range(5)]
+  for e in edits:
+    history.record(e)
+  assert [history.undo() for _ in range(4)] == [edits[4], edits[3], edits[2], None]
+
+
+def test_batches_come_back_whole():
+  history = jn.EditHistory()
+  batch = jn.EditBatch([edit(("a",), 1, 2), edit(("b",), 3, 4)])
+  history.record(batch)
+  assert history.undo() is batch
+  assert history.redo() is batch
+
+
+def apply(data, e, undo):
+  """Replay an edit the way the app does, with set_by_path and del."""
+  value = e.old if undo else e.new
+  if value is jn._MISSING:
+    del jn.get_by_path(data, e.path[:-1])[e.path[-1]]
+  else:
+    jn.set_by_path(data, e.path, value)
+
+
+def test_random_edits_undo_and_redo_exactly():
+  rng = random.Random(14)
+  data = {"list": [{"n": i} for i in range(5)], "obj": {}}
+  history = jn.EditHistory()
+  states = [copy.deepcopy(data)]
+  for step in range(60):
+    if rng.random() < 0.5:
+      path = ("list", rng.randrange(5), "n")
+    else:
+      path = ("obj", f"k{rng.randrange(4)}")
+    parent = jn.get_by_path(data, path[:-1])
+    old = parent.get(path[-1], jn._MISSING)
+    e = edit(path, old, {"step": step})
+    apply(data, e, undo=False)
+    history.record(e)
+    states.append(copy.deepcopy(data))
+
+  for state in reversed(states[:-1]):
+    apply(data, history.undo(), undo=True)
+    assert data == state
+  for state in states[1:]:
+    apply(data, history.redo(), undo=False)
+    assert data == state
+
+
+def test_history_shares_values_instead_of_copying():
+  big = {"payload": list(range(1000))}
+  data = {"x": big}
+  e = edit(("x",), big, {"small": True})
+  apply(data, e, undo=False)
+  history = jn.EditHistory()
+  history.record(e)
+  apply(data, history.undo(), undo=True)
+  assert data["x"] is big
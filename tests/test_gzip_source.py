@@ -0,0 +1,64 @@
+import gzip
+import json
+import random
+
+import pytest
+
+import json_navigator as jn
+from conftest import plain
+
+# Small checkpoint spacing so even a test-sized file gets several seek points.
+SPACING = 64 << 10
+
+
+@pytest.fixture
+def files(tmp_path, make_doc):
+  # Hex blobs compress poorly, so the index gets checkpoints past the first input chunk.
+  rng = random.Random(0)
+  doc = {"items": [{"id": i, "blob": rng.randbytes(i * 37 % 900).hex(), "doc": make_doc(i)} for i in range(600)],
+         "tail": "end"}
+  raw = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+  plain_path = tmp_path / "doc.json"
+  plain_path.write_bytes(raw)
+  gz_path = tmp_path / "doc.json.gz"
+  gz_path.write_bytes(gzip.compress(raw))
+  multi_path = tmp_path / "multi.json.gz"   # concatenated members, then padding
+  multi_path.write_bytes(gzip.compress(raw[:len(raw) // 3]) + gzip.compress(raw[len(raw) // 3:]) + b"\0" * 10)
+  return doc, raw, plain_path, gz_path, multi_path
+
+
+def test_random_reads_match_plain_bytes(files):
+  _, raw, _, gz_path, multi_path = files
+  rng = random.Random(0)
+  for path in (gz_path, multi_path):
+    src = jn.GzipSource(str(path), spacing=SPACING)
+    try:
+      assert b"".join(src.chunks(1 << 16)) == raw
+      assert src.size == len(raw)
+      assert len(src._offsets) > 3
+      for _ in range(300):
+        start = rng.randrange(len(raw))
+        stop = start + rng.randrange(4 * SPACING if rng.random() < 0.1 else 3000)
+        assert src.read(start, stop) == raw[start:stop]
+    finally:
+      src.close()
+
+
+def test_compressed_document_matches_plain(files):
+  doc, _, plain_path, gz_path, multi_path = files
+  expected = plain_path.read_text(encoding="utf-8")
+  for path in (gz_path, multi_path):
+    lazy = jn.LazyDocument(jn.GzipSource(str(path), spacing=SPACING), min_span=256)
+    try:
+      assert plain(lazy.root) == doc
+      assert b"".join(jn.iter_json_bytes(lazy.root, indent=None)).decode("utf-8") == expected + "\n"
+    finally:
+      lazy.close()
+
+
+def test_truncated_file_is_rejected(files, tmp_path):
+  gz_path = files[3]
+  cut = tmp_path / "cut.json.gz"
+  cut.write_bytes(gz_path.read_bytes()[:-200])
+  with pytest.raises(ValueError):
+    jn.LazyDocument.open(str(cut))
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+import json_navigator as jn
+
+KEYS = ["item10", "Item2", "item1", "b", "A", "item02"]
+
+
+def test_modes():
+  d = dict.fromkeys(KEYS)
+  assert jn.KeyOrder("insertion").keys(d) == KEYS
+  assert jn.KeyOrder("lexicographic").keys(d) == sorted(KEYS)
+  assert jn.KeyOrder("natural").keys(d) == ["A", "b", "item1", "Item2", "item02", "item10"]
+
+
+def test_unknown_mode():
+  with pytest.raises(ValueError, match="Unknown key order"):
+    jn.KeyOrder("random")
+
+
+def test_natural_key_compares_digit_runs_as_numbers():
+  assert jn.natural_key("v9.10") > jn.natural_key("v9.9")
+  assert jn.natural_key("x") == jn.natural_key("X")
+
+
+def test_large_containers_are_cached_until_invalidated():
+  order = jn.KeyOrder(min_size=4)
+  d = {f"k{i}": i for i in range(10)}
+  first = order.keys(d)
+  assert order.keys(d) is first
+  d["k99"] = None
+  assert "k99" in order.keys(d)   # length changed: treated as a miss
+  d["k99x"] = d.pop("k99")
+  stale = order.keys(d)
+  assert "k99x" not in stale      # same length: callers must invalidate
+  order.invalidate(d)
+  assert "k99x" in order.keys(d)
+
+
+def test_small_containers_are_not_cached():
+  order = jn.KeyOrder(min_size=4)
+  d = {"b": 1, "a": 2}
+  assert order.keys(d) is not order.keys(d)
+
+
+def test_cache_is_bounded():
+  order = jn.KeyOrder(min_size=1, max_entries=3)
+  dicts = [{f"k{i}": i} for i in range(5)]
+  firsts = [order.keys(d) for d in dicts]
+  assert order.keys(dicts[-1]) is firsts[-1]
+  assert order.keys(dicts[0]) is not firsts[0]
+
+
+def test_sorted_in_runs_matches_sorted():
+  rng = random.Random(8)
+  items = [rng.randrange(1000) for _ in range(2500)]
+  assert jn.sorted_in_runs(items, key=str, run=100) == sorted(items, key=str)
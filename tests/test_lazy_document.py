@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+import json_navigator as jn
+from conftest import plain
+
+
+def open_lazy(tmp_path, doc, **kwargs):
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(doc, ensure_ascii=False, indent=1), encoding="utf-8")
+  return jn.LazyDocument.open(str(path), **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_json_loads(tmp_path, make_doc, seed):
+  doc = {"root": make_doc(seed), "more": [make_doc(seed + 1000), make_doc(seed + 2000)]}
+  lazy = open_lazy(tmp_path, doc, min_span=1, chunk_size=64)
+  try:
+    assert plain(lazy.root) == doc
+  finally:
+    lazy.close()
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '[1, 2] x', '{"a": tru}', '{"a": [1,, 2]}'])
+def test_rejects_invalid_input(tmp_path, text):
+  path = tmp_path / "bad.json"
+  path.write_text(text)
+  with pytest.raises(ValueError):
+    lazy = jn.LazyDocument.open(str(path), min_span=1)
+    plain(lazy.root)
+
+
+def cached(value):
+  """Members held by lazy containers' caches, counted through the tree."""
+  if not isinstance(value, (jn.LazyObject, jn.LazyArray)):
+    return 0
+  return len(value._values) + sum(cached(v) for v in value._values.values())
+
+
+def test_whole_document_walks_keep_nothing(tmp_path):
+  doc = {"items": [{"id": i, "tags": ["t", str(i)], "nested": {"n": [i] * 3}} for i in range(300)]}
+  lazy = open_lazy(tmp_path, doc, min_span=1)
+  try:
+    root = lazy.root
+    leaves = list(jn.walk_leaves(root))
+    assert leaves == list(jn.walk_leaves(doc))
+    index = jn.SearchIndex.build(root)
+    assert index.query("t") == jn.SearchIndex.build(doc).query("t")
+    plan = jn.compile_query("$.items[?(@.id > 10)].tags[1]")
+    assert [m[1] for m in plan.run(root)] == [m[1] for m in plan.run(doc)]
+    assert cached(root) == 0
+    root["items"][5]["id"]   # explicit access still caches, one member per step
+    assert cached(root) == 3
+  finally:
+    lazy.close()
+
+
+BAD_SCALARS = '{"a": [1, 2, tru], "b": 1, "c": {"x": nope}}'
+
+
+@pytest.mark.parametrize("min_span", [1, 64 * 1024])
+def test_unopened_bad_scalars_are_reported_on_write(tmp_path, min_span):
+  # The indexer checks structure only; a malformed token in a member that was
+  # never opened must still fail the write instead of being copied out.
+  path = tmp_path / "bad.json"
+  path.write_text(BAD_SCALARS)
+  lazy = jn.LazyDocument.open(str(path), min_span=min_span)
+  try:
+    assert lazy.root["b"] == 1
+    lazy.root["b"] = 5
+    with pytest.raises(ValueError, match="offset 13"):
+      b"".join(jn.iter_json_bytes(lazy.root))
+    out = tmp_path / "out.json"
+    with pytest.raises(ValueError):
+      jn.save_json(lazy.root, str(out))
+    assert not out.exists()
+  finally:
+    lazy.close()
@@ -0,0 +1,78 @@
+import gzip
+import json
+
+import pytest
+
+import json_navigator as jn
+from conftest import plain
+
+
+def open_ndjson(tmp_path, data: bytes, name="doc.ndjson", **kwargs):
+  path = tmp_path / name
+  path.write_bytes(gzip.compress(data) if name.endswith(".gz") else data)
+  return jn.NdjsonDocument.open(str(path), **kwargs)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+@pytest.mark.parametrize("name", ["doc.ndjson", "doc.jsonl.gz"])
+def test_records_are_indexed_by_line(tmp_path, make_doc, chunk_size, name):
+  records = [make_doc(seed) for seed in range(30)]
+  text = "\n".join(json.dumps(r, ensure_ascii=False) for r in records).encode("utf-8")
+  doc = open_ndjson(tmp_path, text, name, chunk_size=chunk_size)
+  try:
+    assert len(doc.root) == len(records)
+    assert plain(doc.root) == records
+    assert plain(doc.root[-1]) == records[-1]
+  finally:
+    doc.close()
+
+
+def test_blank_lines_crlf_and_indentation(tmp_path):
+  doc = open_ndjson(tmp_path, b'\n  {"a": 1}\r\n\r\n\t[2]  \n   \n"three"')
+  try:
+    assert plain(doc.root) == [{"a": 1}, [2], "three"]
+    assert [doc.source.read(*doc.child_span(0, i)) for i in range(3)] == [b'{"a": 1}', b"[2]", b'"three"']
+  finally:
+    doc.close()
+
+
+def test_invalid_lines_are_kept_as_text(tmp_path):
+  doc = open_ndjson(tmp_path, b'{"ok": true}\n{"broken": \n[1]\n')
+  try:
+    values = plain(doc.root)
+    assert values == [{"ok": True}, '{"broken":', [1]]
+    assert isinstance(doc.root[1], jn.InvalidLine)
+  finally:
+    doc.close()
+
+
+def test_records_are_parsed_on_access(tmp_path):
+  doc = open_ndjson(tmp_path, b"\n".join(b'{"i": %d}' % i for i in range(1000)))
+  try:
+    assert doc.root[500] == {"i": 500}
+    assert len(doc.root._values) <= 1
+  finally:
+    doc.close()
+
+
+def test_progress_reports_bytes_read(tmp_path):
+  data = b'{"a": 1}\n' * 100
+  seen = []
+  doc = open_ndjson(tmp_path, data, chunk_size=100, progress=lambda done, total: seen.append((done, total)))
+  try:
+    assert seen[-1] == (len(data), len(data))
+    assert len(seen) == 9
+  finally:
+    doc.close()
+
+
+def test_save_round_trip(tmp_path):
+  data = b'{"a": 1}\n{"b": [1, 2]}\nnot json\n[3]\n'
+  doc = open_ndjson(tmp_path, data)
+  try:
+    doc.root[3].append(4)
+    out = b"".join(jn.iter_ndjson_bytes(doc.root))
+  finally:
+    doc.close()
+  # Unopened records are copied as is; changed ones are written compact.
+  assert out == b'{"a": 1}\n{"b": [1, 2]}\nnot json\n[3,4]\n'
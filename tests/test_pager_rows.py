@@ -0,0 +1,52 @@
+import base64
+
+import pytest
+
+import json_navigator as jn
+
+
+def test_full_width_line_has_no_blank_row():
+  assert jn.LineIndex("abcd\nef\nabcdefgh\nx", 4).rows(0, 10) == ["abcd", "ef", "abcd", "efgh", "x"]
+
+
+def test_blank_lines_are_kept():
+  assert jn.LineIndex("abcd\n\nx\n", 4).rows(0, 10) == ["abcd", "", "x"]
+
+
+@pytest.mark.parametrize("text, rows", [
+  ("漢字漢字\nab", ["漢", "字", "漢", "字", "ab"]),   # two cells per character
+  ("a😀b😀cd", ["a😀", "b😀", "cd"]),
+  ("e\u0301" * 5, ["e\u0301" * 3, "e\u0301" * 2]),   # combining marks take none
+])
+def test_rows_wrap_by_cells(text, rows):
+  assert jn.LineIndex(text, 3).rows(0, 10) == rows
+
+
+def test_offsets_and_rows_agree():
+  text = "".join(f"line {i}\n" if i % 7 else "x" * 50 + "\n" for i in range(500))
+  index = jn.LineIndex(text, 8)
+  last = index.last_row()
+  assert "".join(index.rows(0, last + 1)).replace("\n", "") == text.replace("\n", "")
+  for row in range(0, last, 37):
+    assert index.row_of(index.offset_of(row)) == row
+  assert text[index.line_offset(11):].startswith("line 10\n")
+
+
+def test_hex_rows():
+  rows = jn.HexRows(bytes(range(256)) * 3)
+  assert rows.last_row() == 47
+  assert rows.rows(4, 5) == ["00000040  40 41 42 43 44 45 46 47 48 49 4a 4b 4c 4d 4e 4f   @ABCDEFGHIJKLMNO"]
+  assert rows.row_of(0x41) == 4
+
+
+@pytest.mark.parametrize("width", [1, 7, 80])
+def test_utf8_rows_match_line_index(width):
+  text = "".join(f"hé 漢字 😀 {i}\n" for i in range(3000)) + "x" * 100_000 + "\nend"
+  data = text.encode("utf-8")
+  rows, lines = jn.Utf8Rows(jn.Base64Bytes(base64.b64encode(data).decode("ascii")), width), jn.LineIndex(text, width)
+  last = lines.last_row()
+  assert rows.last_row() == last
+  assert rows.rows(0, last + 1) == lines.rows(0, last + 1)
+  for row in range(0, last, 997):
+    assert rows.offset_of(row) == len(text[:lines.offset_of(row)].encode("utf-8"))
+  assert rows.line_offset(7) == len(text[:lines.line_offset(7)].encode("utf-8"))
@@ -0,0 +1,49 @@
+import gc
+import json
+
+import pytest
+
+import json_navigator as jn
+
+# Input some fast parsers reject or read differently from json.loads.
+AWKWARD = [b'{"a": NaN}', b"[18446744073709551616, -9223372036854775809]", b'"\\ud800"', b"[1e400]", b'{"a": 1, "a": 2}']
+
+
+@pytest.mark.parametrize("name", jn.available_parsers())
+@pytest.mark.parametrize("data", AWKWARD)
+def test_backends_agree_with_stdlib(name, data):
+  expected = json.loads(data)
+  got = jn.get_parser(name).loads(data)
+  assert json.dumps(got) == json.dumps(expected)
+
+
+@pytest.mark.parametrize("name", jn.available_parsers())
+def test_errors_come_from_stdlib(name):
+  with pytest.raises(json.JSONDecodeError) as caught:
+    jn.get_parser(name).loads(b'{"a": [1, 2}')
+  with pytest.raises(json.JSONDecodeError) as expected:
+    json.loads(b'{"a": [1, 2}')
+  assert str(caught.value) == str(expected.value)
+
+
+def test_auto_and_unknown_backends():
+  assert jn.get_parser("auto").name == jn.available_parsers()[0]
+  assert jn.available_parsers()[-1] == "stdlib"
+  with pytest.raises(ValueError):
+    jn.get_parser("nope")
+
+
+def test_whole_loads_restore_the_collector():
+  backend = jn.get_parser("stdlib")
+  assert gc.isenabled()
+  assert backend.loads_whole(b'{"a": [1, 2]}') == {"a": [1, 2]}
+  assert gc.isenabled()
+  with pytest.raises(ValueError):
+    backend.loads_whole(b"[1,")
+  assert gc.isenabled()
+  gc.disable()
+  try:
+    backend.loads_whole(b"[]")
+    assert not gc.isenabled()   # left as the caller had it
+  finally:
+    gc.enable()
@@ -0,0 +1,29 @@
+import pytest
+
+import json_navigator as jn
+
+rich_pretty = pytest.importorskip("rich.pretty")
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_matches_rich_pretty_repr(make_doc, seed):
+  doc = make_doc(seed)
+  assert "".join(jn.iter_pretty(doc)) == rich_pretty.pretty_repr(doc)
+
+
+@pytest.mark.parametrize("width", [20, 40, 120])
+def test_matches_at_other_widths(make_doc, width):
+  for seed in range(50):
+    doc = make_doc(seed)
+    assert "".join(jn.iter_pretty(doc, width)) == rich_pretty.pretty_repr(doc, max_width=width)
+
+
+@pytest.mark.parametrize("s", ["ab'c\"" * 20000 + "é'" * 10000, "it's" * 50000, "z" * 300000])
+def test_long_strings_round_trip(s):
+  assert eval("".join(jn.iter_pretty(s))) == s
+
+
+def test_output_is_incremental():
+  it = jn.iter_pretty({"rows": [{"id": i} for i in range(1_000_000)]})
+  head = "".join(next(it) for _ in range(50))
+  assert head.startswith("{\n    'rows': [\n        {'id': 0},")
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+import json_navigator as jn
+
+STORE = {
+  "store": {
+    "book": [
+      {"title": "A", "price": 8.95, "isbn": "1"},
+      {"title": "B", "price": 12.99},
+      {"title": "C", "price": 8.99, "isbn": "2", "tags": ["x"]},
+      {"title": "D", "price": 22.99, "available": True},
+    ],
+    "bicycle": {"color": "red", "price": 19.95},
+  },
+  "odd key": {"x y": 1},
+  "n": [0, 1, 2, 3, 4, 5],
+}
+
+
+def run(expr, data=STORE):
+  return list(jn.compile_query(expr).run(data))
+
+
+def values(expr, data=STORE):
+  return [v for _, v in run(expr, data)]
+
+
+@pytest.mark.parametrize("expr, expected", [
+  ("$", [STORE]),
+  ("$.store.book[*].title", ["A", "B", "C", "D"]),
+  ("store.book[-1].title", ["D"]),
+  ("$['odd key']['x y']", [1]),
+  ('$["odd key"].*', [1]),
+  ("$.n[1:5:2]", [1, 3]),
+  ("$.n[::-1]", [5, 4, 3, 2, 1, 0]),
+  ("$.n[-2:]", [4, 5]),
+  ("$.store.book[0,2].title", ["A", "C"]),
+  ("$.store.book[10]", []),
+  ("$.nothere.deeper", []),
+  ("$..price", [8.95, 12.99, 8.99, 22.99, 19.95]),
+  ("$..tags[0]", ["x"]),
+])
+def test_selectors(expr, expected):
+  assert values(expr) == expected
+
+
+@pytest.mark.parametrize("expr, titles", [
+  ("$.store.book[?(@.price < 10)].title", ["A", "C"]),
+  ("$.store.book[?(@.isbn)].title", ["A", "C"]),
+  ("$.store.book[?(!@.isbn && @.price > 20)].title", ["D"]),
+  ("$.store.book[?(@.isbn == '2' || @.title == \"B\")].title", ["B", "C"]),
+  ("$.store.book[?(@.title =~ '^[AB]')].title", ["A", "B"]),
+  ("$.store.book[?(@.price > $.store.bicycle.price)].title", ["D"]),
+  ("$.store.book[?(@.available == true)].title", ["D"]),
+  ("$.store.book[?(@.available == 1)].title", []),   # booleans are never numbers
+  ("$.store.book[?(@.price > '1')].title", []),      # no number/string ordering
+])
+def test_filters(expr, titles):
+  assert values(expr) == titles
+
+
+def test_matches_carry_normalized_paths():
+  assert run("store.book[-1].title") == [(("store", "book", 3, "title"), "D")]
+  assert [p for p, _ in run("$..[0]")] == [("store", "book", 0), ("store", "book", 2, "tags", 0), ("n", 0)]
+
+
+def test_plans_are_cached_and_lazy():
+  plan = jn.compile_query("$.n[*]")
+  assert jn.compile_query("$.n[*]") is plan
+  matches = plan.run(STORE)
+  assert next(matches) == (("n", 0), 0)
+
+
+@pytest.mark.parametrize("expr", ["$[", "$.a)", "$.a[?(@.x ==)]", "'unterminated", "$.a[?(@.x =~ '(')]"])
+def test_malformed_queries(expr):
+  with pytest.raises(jn.QueryError):
+    jn.compile_query(expr)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_lazy_documents_match_plain_data(tmp_path, make_doc, seed):
+  data = {"root": make_doc(seed)}
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(data))
+  lazy = jn.LazyDocument.open(str(path), min_span=16)
+  try:
+    for expr in ("$..*", "$..[0]", "$..[?(@ == true)]"):
+      assert [p for p, _ in run(expr, lazy.root)] == [p for p, _ in run(expr, data)]
+  finally:
+    lazy.close()
+
+
+@pytest.mark.parametrize("text, path", [
+  ("$", ()),
+  ("$.a.b[0]", ("a", "b", 0)),
+  ("a['b c'][-1]", ("a", "b c", -1)),
+  ("a.[0].b", ("a", 0, "b")),
+])
+def test_parse_path(text, path):
+  assert jn.parse_path(text) == path
+
+
+def test_parse_path_reads_path_to_str_output():
+  path = ("store", "book", 2, "tags", 0)
+  assert jn.parse_path(jn.path_to_str(path)) == path
+
+
+@pytest.mark.parametrize("text", ["$.a[*]", "$..a", "$.a[1:2]", "$[?(@.x)]", "$.a[0,1]"])
+def test_parse_path_rejects_multiple_values(text):
+  with pytest.raises(jn.QueryError, match="not a single path"):
+    jn.parse_path(text)
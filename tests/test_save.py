@@ -0,0 +1,83 @@
+import json
+import stat
+
+import pytest
+
+import json_navigator as jn
+
+
+@pytest.mark.parametrize("seed", range(60))
+@pytest.mark.parametrize("indent", [None, 0, 2, 4])
+def test_encoding_matches_json_dumps(make_doc, seed, indent):
+  doc = make_doc(seed)
+  if indent:
+    expected = json.dumps(doc, ensure_ascii=False, indent=indent) + "\n"
+  else:   # None and 0 both mean compact
+    expected = json.dumps(doc, ensure_ascii=False, separators=(",", ":")) + "\n"
+  assert b"".join(jn.iter_json_bytes(doc, indent, chunk_size=16)).decode("utf-8") == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_lazy_members_round_trip(tmp_path, make_doc, seed):
+  doc = {"a": make_doc(seed), "b": [make_doc(seed + 1), {"c": make_doc(seed + 2)}]}
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(doc, ensure_ascii=seed % 2 == 0, indent=seed % 3 or None), encoding="utf-8")
+  lazy = jn.LazyDocument.open(str(path), min_span=1 if seed % 2 else 64 * 1024)
+  try:
+    lazy.root["b"][1]["c"] = "edited"   # mixes opened members with unopened ones
+    doc["b"][1]["c"] = "edited"
+    out = b"".join(jn.iter_json_bytes(lazy.root, 2)).decode("utf-8")
+  finally:
+    lazy.close()
+  assert out == json.dumps(doc, ensure_ascii=False, indent=2) + "\n"
+
+
+def test_save_writes_what_it_reports(tmp_path, make_doc):
+  doc = make_doc(7)
+  path = tmp_path / "out.json"
+  written, _ = jn.save_json(doc, str(path), indent=2)
+  data = path.read_bytes()
+  assert written == len(data)
+  assert json.loads(data) == doc
+  assert [p.name for p in tmp_path.iterdir()] == ["out.json"]   # no temporary left behind
+
+
+def test_new_file_gets_umask_mode(tmp_path):
+  # Not mkstemp's 0600: the mode a plain open() would give, from the umask read at import.
+  path = tmp_path / "new.json"
+  jn.save_json({"a": 1}, str(path))
+  assert stat.S_IMODE(path.stat().st_mode) == 0o666 & ~jn._UMASK
+
+
+def test_existing_file_keeps_mode(tmp_path):
+  path = tmp_path / "shared.json"
+  path.write_text("{}")
+  path.chmod(0o644)
+  jn.save_json({"a": 1}, str(path))
+  assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_symlink_is_followed(tmp_path):
+  target = tmp_path / "real.json"
+  target.write_text("{}")
+  link = tmp_path / "link.json"
+  link.symlink_to(target)
+  jn.save_json({"a": 1}, str(link))
+  assert link.is_symlink()
+  assert json.loads(target.read_text()) == {"a": 1}
+
+
+@pytest.mark.parametrize("indent", [None, 0, 2])
+def test_unopened_members_follow_indent(tmp_path, indent):
+  doc = {"z": 1, "a": {"b": [1, 2], "c": "d"}, "big": [{"id": i} for i in range(50)]}
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(doc, indent=3))   # spacing the output must not inherit
+  lazy = jn.LazyDocument.open(str(path), min_span=64)
+  try:
+    lazy.root["z"] = 2
+    doc["z"] = 2
+    out = b"".join(jn.iter_json_bytes(lazy.root, indent)).decode("utf-8")
+  finally:
+    lazy.close()
+  separators = None if indent else (",", ":")
+  assert out == json.dumps(doc, ensure_ascii=False, indent=indent or None, separators=separators) + "\n"
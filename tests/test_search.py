@@ -0,0 +1,30 @@
+import re
+
+import pytest
+
+import json_navigator as jn
+
+
+@pytest.mark.parametrize("query, text, found", [
+  ("ll", "HELLO", "LL"),
+  ("HeLLo", "say hello", "hello"),
+  ("x", "İİx", "x"),                  # "İ".lower() is two characters
+  ("café", "İstanbul CAFÉ", "CAFÉ"),
+  ("straße", "STRASSE straße", "straße"),
+  ("i", "İ", "İ"),
+  ("/a+b/", "İ aaab", "aaab"),
+  ("/[0-9]{3}/", "ab 1234", "123"),
+])
+def test_span_slices_the_original_text(query, text, found):
+  start, end = jn.leaf_matcher(query)(text)
+  assert text[start:end] == found
+
+
+@pytest.mark.parametrize("query, text", [("abc", "ab c"), ("é", "e"), ("/^b/", "ab")])
+def test_no_match(query, text):
+  assert jn.leaf_matcher(query)(text) is None
+
+
+def test_bad_regex_raises():
+  with pytest.raises(re.error):
+    jn.leaf_matcher("/(/")
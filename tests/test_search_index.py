@@ -0,0 +1,85 @@
+import json
+import threading
+
+import pytest
+
+import json_navigator as jn
+
+DOC = {
+  "users": [
+    {"name": "Ada Lovelace", "role": "admin", "active": True},
+    {"name": "Alan Turing", "role": "user", "email": "alan@example.org"},
+  ],
+  "admin_note": None,
+  "blob": "x" * 100,
+}
+
+
+def postings(index: jn.SearchIndex) -> dict:
+  return {t: set(paths) for t, paths in index._postings.items()}
+
+
+def test_words_keys_and_values():
+  index = jn.SearchIndex.build(DOC)
+  assert index.query("lovelace") == ([("users", 0, "name")], 1)
+  assert index.query("ALAN example") == ([("users", 1, "email")], 1)
+  assert index.query("true") == ([("users", 0, "active")], 1)
+  assert index.query("null") == ([("admin_note",)], 1)
+  assert index.query("missing") == ([], 0)
+  assert index.query("  ") == ([], 0)
+
+
+def test_last_word_is_a_prefix():
+  index = jn.SearchIndex.build(DOC)
+  paths, total = index.query("adm")
+  assert total == 2
+  assert paths == [("admin_note",), ("users", 0, "role")]
+  assert index.query("adm xyz") == ([], 0)   # only the last word is a prefix
+
+
+def test_limit_keeps_document_order_and_total():
+  data = {"items": [{"tag": "same"} for _ in range(30)]}
+  paths, total = jn.SearchIndex.build(data).query("same", limit=5)
+  assert total == 30
+  assert paths == [("items", i, "tag") for i in range(5)]
+
+
+def test_long_tokens_are_skipped():
+  index = jn.SearchIndex.build(DOC, max_token=50)
+  assert index.query("xxx") == ([], 0)
+  assert index.query("blob") == ([("blob",)], 1)
+
+
+def test_cancelled_build():
+  cancelled = threading.Event()
+  cancelled.set()
+  assert jn.SearchIndex.build(DOC, cancelled) is None
+
+
+def test_updates_match_a_rebuild():
+  data = json.loads(json.dumps(DOC))
+  index = jn.SearchIndex.build(data)
+  index.query("a")   # builds the prefix vocabulary, which updates must maintain
+
+  old = data["users"][1]
+  data["users"][1] = new = {"name": "Grace Hopper", "tags": ["navy", "cobol"]}
+  index.update(("users", 1), old, new)
+  data["added"] = "fresh words"
+  index.update(("added",), None, data["added"], added=True)
+
+  assert postings(index) == postings(jn.SearchIndex.build(data))
+  assert index.query("turing") == ([], 0)
+  assert index.query("cob") == ([("users", 1, "tags", 1)], 1)
+  assert index.query("fres") == ([("added",)], 1)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_lazy_document_indexes_like_plain_data(tmp_path, make_doc, seed):
+  data = {"root": make_doc(seed)}
+  path = tmp_path / "doc.json"
+  path.write_text(json.dumps(data))
+  lazy = jn.LazyDocument.open(str(path), min_span=16)
+  try:
+    assert postings(jn.SearchIndex.build(lazy.root)) == postings(jn.SearchIndex.build(data))
+  finally:
+    lazy.close()
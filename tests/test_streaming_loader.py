@@ -0,0 +1,30 @@
+import io
+import json
+
+import pytest
+
+import json_navigator as jn
+
+
+def load(text: str, **kwargs):
+  loader = jn.StreamingLoader(io.StringIO(text), flush_interval=0, **kwargs)
+  root = loader.read_root()
+  loader.load_into(root)
+  return root
+
+
+@pytest.mark.parametrize("seed", range(60))
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+@pytest.mark.parametrize("eager_depth", [1, 2, 3])
+def test_matches_json_loads(make_doc, seed, chunk_size, eager_depth):
+  doc = make_doc(seed)
+  text = json.dumps(doc, ensure_ascii=seed % 2 == 0, indent=2 if seed % 3 == 0 else None)
+  assert load(text, chunk_size=chunk_size, eager_depth=eager_depth) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ['{"a":1,}', "[1 2]", '{"a" 1}', "[1,2", '{"a":1} x', ""])
+def test_rejects_what_json_loads_rejects(text):
+  with pytest.raises(ValueError):
+    json.loads(text)
+  with pytest.raises(ValueError):
+    load(text, chunk_size=2)
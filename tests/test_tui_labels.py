@@ -0,0 +1,13 @@
+import json_navigator_tui as tui
+
+
+def test_range_label_clips_long_keys():
+  app = tui.JSONTreeApp({})
+  keys = ["k" * 10_000, "b", "line\nbreak" + "z" * 100]
+  label = app._range_label(keys, 0, 3, True)
+  first, last = label.split(" … ")[1:]
+  assert first == "k" * (app.RANGE_KEY_CHARS - 1) + "…"
+  assert last.startswith("line break") and last.endswith("…")
+  assert len(last) == app.RANGE_KEY_CHARS
+  assert app._range_label(keys, 1, 2, True) == "[1–1] … b … b"
+  assert app._range_label(None, 0, 1000, False) == "[0–999] …"